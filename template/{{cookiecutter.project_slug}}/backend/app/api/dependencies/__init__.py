@@ -10,11 +10,13 @@ from app.api.dependencies.tenant import (
     get_optional_tenant_db,
     get_superuser_db,
     get_tenant_db,
+    get_tenant_read_db,
 )
 
 __all__ = [
     "get_db",
     "get_tenant_db",
+    "get_tenant_read_db",
     "get_optional_tenant_db",
     "get_superuser_db",
 ]
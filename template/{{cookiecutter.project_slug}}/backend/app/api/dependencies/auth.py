@@ -11,14 +11,14 @@ from jwt.exceptions import (
     InvalidSignatureError,
     InvalidTokenError,
 )
-from pydantic import ValidationError
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from app.core.config import settings
 from app.core.security import get_unverified_jwt_header
+from app.core.timing import record_timing
 from app.core.rate_limit import get_rate_limiter, RateLimiter, RateLimitExceeded
-from app.schemas.auth import AuthenticatedUser, TokenPayload
+from app.schemas.auth import InvalidClaimsError, Principal
 from app.services.jwks_client import get_jwks_client, JWKSClient
 from app.services.token_revocation import (
     get_token_revocation_service,
@@ -44,7 +44,7 @@ async def get_current_user(
     token_revocation_service: Annotated[
         TokenRevocationService, Depends(get_token_revocation_service)
     ],
-) -> AuthenticatedUser:
+) -> Principal:
     """
     FastAPI dependency to validate OAuth token and extract user context.
 
@@ -55,7 +55,7 @@ async def get_current_user(
     4. Validates standard JWT claims (exp, iss, aud, jti)
     5. Checks if token has been revoked (supports logout and security incidents)
     6. Extracts user context (user_id, tenant_id, scopes)
-    7. Returns AuthenticatedUser for use in route handlers
+    7. Stores the user on request.state.user and returns it for use in route handlers
 
     The dependency handles key rotation by attempting to refresh JWKS when a
     signing key is not found in the cache. It also enforces multi-tenant
@@ -72,14 +72,15 @@ async def get_current_user(
     - Forced logout for security incidents
 
     Args:
-        request: FastAPI Request object (for extracting client IP)
+        request: FastAPI Request object (for client IP and request.state.user)
         credentials: HTTP Bearer credentials from Authorization header
         jwks_client: JWKS client for fetching OAuth provider public keys
         rate_limiter: Rate limiter for distributed rate limiting
         token_revocation_service: Token revocation service for blacklist checking
 
     Returns:
-        AuthenticatedUser: Authenticated user context with user_id, tenant_id, and scopes
+        Principal: Immutable user context with user_id, tenant_id, and scopes
+            (convert with to_schema() to serialize it as AuthenticatedUser)
 
     Raises:
         HTTPException: 401 Unauthorized if token is invalid, expired, revoked, or missing
@@ -90,7 +91,7 @@ async def get_current_user(
         >>> from app.api.dependencies.auth import get_current_user
         >>>
         >>> @router.get("/protected")
-        >>> async def protected_route(user: Annotated[AuthenticatedUser, Depends(get_current_user)]):
+        >>> async def protected_route(user: Annotated[Principal, Depends(get_current_user)]):
         ...     return {"user_id": user.user_id, "tenant_id": user.tenant_id}
     """
     # Extract client IP for rate limiting
@@ -99,7 +100,8 @@ async def get_current_user(
     # SECURITY: Rate limiting - Check general auth rate limit
     # This prevents brute force attacks and DoS by limiting requests per IP
     try:
-        await rate_limiter.check_rate_limit(client_ip, is_failed_auth=False)
+        with record_timing("ratelimit"):
+            await rate_limiter.check_rate_limit(client_ip, is_failed_auth=False)
     except RateLimitExceeded as e:
         logger.warning(
             "Rate limit exceeded for authentication",
@@ -154,7 +156,11 @@ async def get_current_user(
     # Wrap entire validation in try-except to track failed auth attempts
     try:
         # Extract header to get key ID (kid) before validation
-        return await _validate_token_and_get_user(token, jwks_client, token_revocation_service)
+        with record_timing("auth"):
+            user = await _validate_token_and_get_user(token, jwks_client, token_revocation_service)
+        # Expose the user to middleware and request-scoped dependencies
+        request.state.user = user
+        return user
     except HTTPException as e:
         # Check if this is an auth failure (401) that should count toward failed auth rate limit
         if e.status_code == status.HTTP_401_UNAUTHORIZED:
@@ -185,7 +191,7 @@ async def _validate_token_and_get_user(
     token: str,
     jwks_client: JWKSClient,
     token_revocation_service: TokenRevocationService,
-) -> AuthenticatedUser:
+) -> Principal:
     """
     Internal helper to validate token and extract user context.
 
@@ -198,7 +204,7 @@ async def _validate_token_and_get_user(
         token_revocation_service: Token revocation service for blacklist checking
 
     Returns:
-        AuthenticatedUser: Authenticated user context
+        Principal: Authenticated user context
 
     Raises:
         HTTPException: 401 Unauthorized if token is invalid or revoked
@@ -323,8 +329,9 @@ async def _validate_token_and_get_user(
             },
         )
 
-        # Parse payload into TokenPayload model (validates structure)
-        token_payload = TokenPayload(**payload)
+        # Build the principal straight from the claims, checking the required
+        # ones (sub, iss, aud, exp, iat, jti) and the types of those used
+        principal = Principal.from_claims(payload)
 
     except ExpiredSignatureError:
         logger.warning("JWT token expired")
@@ -368,13 +375,13 @@ async def _validate_token_and_get_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    except ValidationError as e:
+    except InvalidClaimsError as e:
         # SECURITY: Token payload validation failed (e.g., missing required claims like jti)
         # Log detailed error server-side only, return generic message to client
         logger.warning(
             "JWT payload validation failed",
             extra={
-                "error_type": "ValidationError",
+                "error_type": "InvalidClaimsError",
                 "error_details": str(e),
                 "token_header": header,
             }
@@ -391,13 +398,13 @@ async def _validate_token_and_get_user(
     # SECURITY: Check if token has been revoked (blacklist check)
     # This enables secure logout, compromised token invalidation, and forced logout
     try:
-        is_revoked = await token_revocation_service.is_token_revoked(token_payload.jti)
+        is_revoked = await token_revocation_service.is_token_revoked(principal.jti)
         if is_revoked:
             logger.warning(
                 "Token has been revoked",
                 extra={
-                    "jti": token_payload.jti,
-                    "sub": token_payload.sub,
+                    "jti": principal.jti,
+                    "sub": principal.user_id,
                 },
             )
             raise HTTPException(
@@ -417,7 +424,7 @@ async def _validate_token_and_get_user(
         logger.error(
             "Token revocation check failed - rejecting token (fail closed)",
             extra={
-                "jti": token_payload.jti,
+                "jti": principal.jti,
                 "error_type": type(e).__name__,
                 "error_details": str(e),
             },
@@ -431,11 +438,11 @@ async def _validate_token_and_get_user(
         )
 
     # Extract tenant_id from custom claim (required for multi-tenancy)
-    tenant_id = token_payload.tenant_id
+    tenant_id = principal.tenant_id
     if not tenant_id:
         logger.error(
             "JWT missing required 'tenant_id' claim",
-            extra={"sub": token_payload.sub},
+            extra={"sub": principal.user_id},
         )
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -458,7 +465,7 @@ async def _validate_token_and_get_user(
             "Invalid tenant_id format in JWT token",
             extra={
                 "tenant_id": tenant_id,
-                "user_id": token_payload.sub,
+                "user_id": principal.user_id,
                 "error": str(e)
             }
         )
@@ -471,20 +478,13 @@ async def _validate_token_and_get_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Parse scopes from space-separated string
-    scopes = token_payload.scope.split() if token_payload.scope else []
-
-    # Add Keycloak realm roles to scopes (roles are used as scopes in this system)
-    if token_payload.realm_access and token_payload.realm_access.roles:
-        scopes.extend(token_payload.realm_access.roles)
-
     # Log successful authentication
     logger.info(
         "User authenticated successfully",
         extra={
-            "user_id": token_payload.sub,
+            "user_id": principal.user_id,
             "tenant_id": tenant_id,
-            "scopes": scopes,
+            "scopes": principal.scopes,
         },
     )
 
@@ -492,25 +492,17 @@ async def _validate_token_and_get_user(
     # Set Sentry user context for error correlation
     # This attaches user and tenant info to all Sentry events in this request
     set_user_context(
-        user_id=token_payload.sub,
+        user_id=principal.user_id,
         tenant_id=tenant_id,
-        email=token_payload.email,
-        username=token_payload.name,
+        email=principal.email,
+        username=principal.name,
     )
     {% endif %}
 
-    # Return authenticated user context
-    return AuthenticatedUser(
-        user_id=token_payload.sub,
-        tenant_id=tenant_id,
-        jti=token_payload.jti,
-        exp=token_payload.exp,
-        email=token_payload.email,
-        name=token_payload.name,
-        scopes=scopes,
-        issuer=token_payload.iss,
-    )
+    # Return authenticated user context, with the normalized tenant_id
+    if tenant_id != principal.tenant_id:
+        principal = principal.replace(tenant_id=tenant_id)
+    return principal
 
 
-# Type alias for dependency injection
-CurrentUser = Annotated[AuthenticatedUser, Depends(get_current_user)]
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
@@ -4,31 +4,91 @@ Database dependencies for FastAPI dependency injection.
 This module provides dependency injection functions for database sessions
 in FastAPI routes. It handles session lifecycle management including
 automatic commit on success, rollback on exception, and cleanup.
+
+Sessions are lazy: no connection is checked out until the route handler
+issues its first statement, and the COMMIT is skipped for sessions that
+never touched the database. Requests with safe HTTP methods (GET, HEAD,
+OPTIONS) run in READ ONLY transactions when DATABASE_READ_ONLY_SAFE_METHODS
+is enabled.
 """
 
 import logging
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict, Optional
 
+from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import AsyncSessionLocal
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, read_only_engine, session_was_used
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# HTTP methods that must not modify state (RFC 9110 section 9.2.1)
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def session_options(request: Optional[Request]) -> Dict[str, Any]:
+    """
+    Build AsyncSessionLocal() keyword arguments for a request.
+
+    Safe-method requests are bound to the read-only engine, which opens
+    transactions with BEGIN READ ONLY at no extra round-trip cost.
+
+    Args:
+        request: Current request, or None outside of a request
+
+    Returns:
+        Keyword arguments to pass to AsyncSessionLocal()
+
+    Example:
+        async with AsyncSessionLocal(**session_options(request)) as session:
+            ...
+    """
+    if (
+        request is not None
+        and settings.DATABASE_READ_ONLY_SAFE_METHODS
+        and request.method in SAFE_METHODS
+    ):
+        return {"bind": read_only_engine}
+    return {}
+
+
+async def commit_if_used(session: AsyncSession) -> bool:
+    """
+    Commit the session only if it did database work.
+
+    Args:
+        session: Request-scoped session
+
+    Returns:
+        True if a commit was issued, False if the session was never used
+    """
+    if not session_was_used(session):
+        return False
+
+    await session.commit()
+    return True
+
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+async def get_db(
+    request: Request = None,  # type: ignore[assignment]
+) -> AsyncGenerator[AsyncSession, None]:
     """
     FastAPI dependency that provides a database session.
 
     The session is automatically managed with proper lifecycle:
-    - Created at the start of the request
-    - Committed on successful completion
+    - Created at the start of the request (connection checked out lazily)
+    - Committed on successful completion, if the session was used
     - Rolled back on exception
     - Closed after the request completes
 
     This ensures proper transaction boundaries and prevents connection leaks.
 
+    Args:
+        request: FastAPI request object (automatically injected; optional so
+            the dependency can also be driven directly)
+
     Yields:
         AsyncSession: Database session for the current request
 
@@ -55,13 +115,16 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         If you need manual transaction control, you can skip the automatic
         commit by raising an exception or by managing the transaction yourself
         within the route handler.
+
+        GET/HEAD/OPTIONS handlers get a READ ONLY transaction; writes from
+        those handlers fail unless DATABASE_READ_ONLY_SAFE_METHODS is disabled.
     """
-    async with AsyncSessionLocal() as session:
+    async with AsyncSessionLocal(**session_options(request)) as session:
         try:
             logger.debug("Database session created for request")
             yield session
-            await session.commit()
-            logger.debug("Database session committed successfully")
+            if await commit_if_used(session):
+                logger.debug("Database session committed successfully")
         except Exception as e:
             await session.rollback()
             logger.warning(
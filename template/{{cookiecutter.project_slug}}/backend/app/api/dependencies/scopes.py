@@ -1,15 +1,39 @@
-"""OAuth scope enforcement dependencies."""
+"""
+OAuth scope enforcement dependencies.
+
+require_scopes() and require_any_scope() compile their scopes once, when the
+dependency is created: into a bitmask over ALL_SCOPES when every scope is
+defined there, otherwise into a frozenset. Each request then costs one integer
+operation (or one set operation) against the user's compiled scopes.
+"""
 import logging
-from typing import Callable
+from typing import Callable, FrozenSet, Iterable, Optional, Tuple
 
 from fastapi import HTTPException, status, Depends
 
 from app.api.dependencies.auth import get_current_user
-from app.schemas.auth import AuthenticatedUser
+from app.schemas.auth import SCOPE_BITS, Principal, scopes_to_mask
 
 logger = logging.getLogger(__name__)
 
 
+def _compile_scopes(scopes: Iterable[str]) -> Tuple[FrozenSet[str], Optional[int]]:
+    """
+    Compile scopes for repeated checks.
+
+    Args:
+        scopes: Scope strings
+
+    Returns:
+        The scopes as a frozenset, and their bitmask - or None when a scope is
+        not in ALL_SCOPES, so the bitmask cannot represent them
+    """
+    scope_set = frozenset(scopes)
+    if scope_set.issubset(SCOPE_BITS):
+        return scope_set, scopes_to_mask(scope_set)
+    return scope_set, None
+
+
 def require_scopes(*required_scopes: str) -> Callable:
     """
     Create a FastAPI dependency that requires ALL specified scopes.
@@ -48,8 +72,10 @@ def require_scopes(*required_scopes: str) -> Callable:
         ...     # User must have BOTH admin AND tenant/admin scopes
         ...     return {"status": "deleted"}
     """
+    required_set, required_mask = _compile_scopes(required_scopes)
+
     async def scope_checker(
-        current_user: AuthenticatedUser = Depends(get_current_user)
+        current_user: Principal = Depends(get_current_user)
     ) -> None:
         """
         Check if user has all required scopes.
@@ -60,17 +86,20 @@ def require_scopes(*required_scopes: str) -> Callable:
         Raises:
             HTTPException: 403 Forbidden if user lacks required scopes
         """
-        user_scopes = set(current_user.scopes)
-        missing_scopes = set(required_scopes) - user_scopes
+        if required_mask is not None:
+            allowed = current_user.scope_mask & required_mask == required_mask
+        else:
+            allowed = required_set <= current_user.scope_set
 
-        if missing_scopes:
+        if not allowed:
+            missing_scopes = required_set - current_user.scope_set
             logger.warning(
                 "Scope enforcement failed: missing required scopes",
                 extra={
                     "user_id": current_user.user_id,
                     "tenant_id": current_user.tenant_id,
                     "required_scopes": list(required_scopes),
-                    "user_scopes": list(user_scopes),
+                    "user_scopes": list(current_user.scopes),
                     "missing_scopes": sorted(missing_scopes),
                 },
             )
@@ -128,8 +157,10 @@ def require_any_scope(*allowed_scopes: str) -> Callable:
         ...     else:
         ...         return user_statements
     """
+    allowed_set, allowed_mask = _compile_scopes(allowed_scopes)
+
     async def scope_checker(
-        current_user: AuthenticatedUser = Depends(get_current_user)
+        current_user: Principal = Depends(get_current_user)
     ) -> None:
         """
         Check if user has at least one of the allowed scopes.
@@ -140,8 +171,10 @@ def require_any_scope(*allowed_scopes: str) -> Callable:
         Raises:
             HTTPException: 403 Forbidden if user has none of the allowed scopes
         """
-        user_scopes = set(current_user.scopes)
-        has_any_scope = bool(user_scopes & set(allowed_scopes))
+        if allowed_mask is not None:
+            has_any_scope = bool(current_user.scope_mask & allowed_mask)
+        else:
+            has_any_scope = not allowed_set.isdisjoint(current_user.scope_set)
 
         if not has_any_scope:
             logger.warning(
@@ -150,7 +183,7 @@ def require_any_scope(*allowed_scopes: str) -> Callable:
                     "user_id": current_user.user_id,
                     "tenant_id": current_user.tenant_id,
                     "allowed_scopes": list(allowed_scopes),
-                    "user_scopes": list(user_scopes),
+                    "user_scopes": list(current_user.scopes),
                 },
             )
 
@@ -163,26 +196,27 @@ def require_any_scope(*allowed_scopes: str) -> Callable:
                 },
             )
 
-        logger.debug(
-            "Scope enforcement passed (any scope)",
-            extra={
-                "user_id": current_user.user_id,
-                "allowed_scopes": list(allowed_scopes),
-                "matched_scopes": sorted(user_scopes & set(allowed_scopes)),
-            },
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Scope enforcement passed (any scope)",
+                extra={
+                    "user_id": current_user.user_id,
+                    "allowed_scopes": list(allowed_scopes),
+                    "matched_scopes": sorted(current_user.scope_set & allowed_set),
+                },
+            )
 
     return scope_checker
 
 
-def has_scope(user: AuthenticatedUser, scope: str) -> bool:
+def has_scope(user: Principal, scope: str) -> bool:
     """
     Helper function to check if user has a specific scope.
 
     Useful for conditional logic within route handlers where you need to
     differentiate behavior based on scope level (e.g., read-only vs read-write).
 
-    This is a convenience wrapper around AuthenticatedUser.has_scope() for
+    This is a convenience wrapper around Principal.has_scope() for
     better discoverability and consistency with other scope utilities.
 
     Args:
@@ -209,10 +243,10 @@ def has_scope(user: AuthenticatedUser, scope: str) -> bool:
         ...         # Read-only
         ...         return {"statement": statement, "editable": False}
     """
-    return scope in user.scopes
+    return user.has_scope(scope)
 
 
-def has_any_scope(user: AuthenticatedUser, *scopes: str) -> bool:
+def has_any_scope(user: Principal, *scopes: str) -> bool:
     """
     Helper function to check if user has any of the specified scopes.
 
@@ -233,10 +267,10 @@ def has_any_scope(user: AuthenticatedUser, *scopes: str) -> bool:
         ...     # User has admin privileges
         ...     show_admin_controls = True
     """
-    return bool(set(user.scopes) & set(scopes))
+    return not user.scope_set.isdisjoint(scopes)
 
 
-def has_all_scopes(user: AuthenticatedUser, *scopes: str) -> bool:
+def has_all_scopes(user: Principal, *scopes: str) -> bool:
     """
     Helper function to check if user has all specified scopes.
 
@@ -258,4 +292,4 @@ def has_all_scopes(user: AuthenticatedUser, *scopes: str) -> bool:
         ...     # User can write both statements and state
         ...     enable_full_edit = True
     """
-    return set(scopes).issubset(set(user.scopes))
+    return user.scope_set.issuperset(scopes)
@@ -12,7 +12,9 @@ These dependencies integrate with:
 
 Key Features:
 - Automatic RLS enforcement via session variable
-- Multiple variants for different use cases (required, optional, superuser)
+- Lazy setup: tenant context is applied with the first query, so handlers
+  that never touch the database cost no connection checkout or round trips
+- Multiple variants for different use cases (required, optional, read replica, superuser)
 - Request state as primary source, contextvars as fallback
 - Clear error messages when tenant context is missing
 - Comprehensive logging for debugging and security auditing
@@ -25,6 +27,12 @@ Usage Examples:
         result = await db.execute(select(Statement))
         return result.scalars().all()
 
+    # Read-heavy endpoint (served by a read replica when configured)
+    @router.get("/reports")
+    async def get_reports(db: AsyncSession = Depends(get_tenant_read_db)):
+        result = await db.execute(select(Report))
+        return result.scalars().all()
+
     # Flexible endpoint (optional tenant context)
     @router.get("/public-data")
     async def get_public_data(db: AsyncSession = Depends(get_optional_tenant_db)):
@@ -48,18 +56,28 @@ from typing import AsyncGenerator, Optional
 from uuid import UUID
 
 from fastapi import HTTPException, Request, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
+from app.api.dependencies.database import SAFE_METHODS, commit_if_used, session_options
 from app.core.context import get_current_tenant
-from app.core.database import AsyncSessionLocal
+from app.core.database import AsyncSessionLocal, read_only_engine, replica_engines, replica_router
+{% if cookiecutter.include_observability == "yes" %}
+from app.observability import db_session_round_trips_saved_total
+{% endif %}
+from app.services.read_your_writes import has_recent_write, mark_recent_write
 from app.services.tenant_context import (
     TenantContextError,
     bypass_rls,
-    set_tenant_context,
+    defer_tenant_context,
 )
 
 logger = logging.getLogger(__name__)
 
+# Statements the eager setup sent for every request: BEGIN, tenant
+# validation SELECT, set_config and COMMIT. Sessions that never run a
+# query now skip all of them.
+DEFERRED_SETUP_ROUND_TRIPS = 4
+
 
 async def get_tenant_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """
@@ -126,13 +144,14 @@ async def get_tenant_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
         )
 
     # Create database session and set tenant context
-    async with AsyncSessionLocal() as session:
+    async with AsyncSessionLocal(**session_options(request)) as session:
         try:
-            # Set PostgreSQL session variable for RLS enforcement
-            await set_tenant_context(session, tenant_id, validate=True)
+            # Register PostgreSQL session variable for RLS enforcement; it is
+            # validated and applied when the session runs its first query
+            defer_tenant_context(session, tenant_id, validate=True)
 
-            logger.info(
-                "Tenant context set for database session",
+            logger.debug(
+                "Tenant context registered for database session",
                 extra={
                     "tenant_id": str(tenant_id),
                     "endpoint": request.url.path,
@@ -144,12 +163,15 @@ async def get_tenant_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
             # Yield session with tenant context set
             yield session
 
-            # Commit on success
-            await session.commit()
-            logger.debug(
-                "Tenant-aware database session committed",
-                extra={"tenant_id": str(tenant_id)},
-            )
+            # Commit on success (skipped if the handler never queried)
+            if await commit_if_used(session):
+                logger.debug(
+                    "Tenant-aware database session committed",
+                    extra={"tenant_id": str(tenant_id)},
+                )
+                await _record_write(request, tenant_id)
+            else:
+                _record_unused_session("get_tenant_db")
 
         except TenantContextError as e:
             # Tenant validation failed (tenant doesn't exist or is inactive)
@@ -192,6 +214,125 @@ async def get_tenant_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
             logger.debug("Tenant-aware database session closed")
 
 
+async def get_tenant_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency that provides a tenant-aware read-only database session.
+
+    Same contract as get_tenant_db(), but the session is bound to a read
+    replica when DATABASE_REPLICA_URLS is configured. Replicas are picked
+    round-robin; a replica that fails with a connection error is ejected from
+    rotation for DATABASE_REPLICA_EJECT_SECONDS. Reads fall back to the
+    primary (in a READ ONLY transaction) when:
+    - No replicas are configured or all are ejected
+    - The current user committed a write within DATABASE_READ_YOUR_WRITES_SECONDS
+      (read-your-writes consistency)
+
+    RLS is enforced exactly as in get_tenant_db(): the tenant is validated and
+    `app.current_tenant_id` is set on the replica connection before the first
+    query runs.
+
+    Use this dependency for read-only endpoints that tolerate replica lag for
+    other users' writes. Writes through this session fail.
+
+    Args:
+        request: FastAPI request object (automatically injected)
+
+    Yields:
+        AsyncSession: Read-only database session with tenant context set
+
+    Raises:
+        HTTPException: 500 if tenant context is missing, 403 if the tenant is
+            not active or does not exist
+
+    Example:
+        @router.get("/reports")
+        async def get_reports(db: AsyncSession = Depends(get_tenant_read_db)):
+            result = await db.execute(select(Report))
+            return result.scalars().all()
+    """
+    tenant_id = _extract_tenant_id(request)
+
+    if tenant_id is None:
+        logger.error(
+            "Tenant context required but missing",
+            extra={
+                "endpoint": request.url.path,
+                "method": request.method,
+                "has_user": hasattr(request.state, "user"),
+            },
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "error": {
+                    "code": 500,
+                    "message": "Tenant context is required but not available",
+                    "type": "tenant_context_missing",
+                }
+            },
+        )
+
+    replica = await _choose_replica(request, tenant_id)
+
+    async with AsyncSessionLocal(bind=replica or read_only_engine) as session:
+        try:
+            defer_tenant_context(session, tenant_id, validate=True)
+
+            logger.debug(
+                "Tenant read session created",
+                extra={
+                    "tenant_id": str(tenant_id),
+                    "endpoint": request.url.path,
+                    "target": "replica" if replica is not None else "primary",
+                },
+            )
+
+            yield session
+
+            if not await commit_if_used(session):
+                _record_unused_session("get_tenant_read_db")
+
+        except TenantContextError as e:
+            await session.rollback()
+            logger.error(
+                "Tenant context validation failed",
+                extra={
+                    "tenant_id": str(tenant_id),
+                    "endpoint": request.url.path,
+                    "error": str(e),
+                },
+            )
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail={
+                    "error": {
+                        "code": 403,
+                        "message": "Tenant is not active or does not exist",
+                        "type": "tenant_validation_failed",
+                    }
+                },
+            ) from e
+
+        except Exception as e:
+            await session.rollback()
+            if replica is not None:
+                replica_router.report_error(replica, e)
+            logger.warning(
+                "Tenant read session rolled back",
+                extra={
+                    "tenant_id": str(tenant_id),
+                    "error": str(e),
+                    "error_type": type(e).__name__,
+                },
+                exc_info=True,
+            )
+            raise
+
+        finally:
+            await session.close()
+            logger.debug("Tenant read session closed")
+
+
 async def get_optional_tenant_db(
     request: Request,
 ) -> AsyncGenerator[AsyncSession, None]:
@@ -229,29 +370,19 @@ async def get_optional_tenant_db(
     # Extract tenant_id (may be None for unauthenticated requests)
     tenant_id = _extract_tenant_id(request)
 
-    async with AsyncSessionLocal() as session:
+    async with AsyncSessionLocal(**session_options(request)) as session:
         try:
             if tenant_id is not None:
-                # Set tenant context if available
-                try:
-                    await set_tenant_context(session, tenant_id, validate=True)
-                    logger.info(
-                        "Optional tenant context set",
-                        extra={
-                            "tenant_id": str(tenant_id),
-                            "endpoint": request.url.path,
-                        },
-                    )
-                except TenantContextError as e:
-                    # Tenant validation failed - continue without context
-                    logger.warning(
-                        "Optional tenant context validation failed, continuing without tenant",
-                        extra={
-                            "tenant_id": str(tenant_id),
-                            "endpoint": request.url.path,
-                            "error": str(e),
-                        },
-                    )
+                # Set tenant context if available; if validation fails on the
+                # first query, the session continues without tenant context
+                defer_tenant_context(session, tenant_id, validate=True, required=False)
+                logger.debug(
+                    "Optional tenant context registered",
+                    extra={
+                        "tenant_id": str(tenant_id),
+                        "endpoint": request.url.path,
+                    },
+                )
             else:
                 logger.debug(
                     "Optional tenant context not available",
@@ -261,9 +392,13 @@ async def get_optional_tenant_db(
             # Yield session (with or without tenant context)
             yield session
 
-            # Commit on success
-            await session.commit()
-            logger.debug("Optional tenant-aware database session committed")
+            # Commit on success (skipped if the handler never queried)
+            if await commit_if_used(session):
+                logger.debug("Optional tenant-aware database session committed")
+                if tenant_id is not None:
+                    await _record_write(request, tenant_id)
+            elif tenant_id is not None:
+                _record_unused_session("get_optional_tenant_db")
 
         except Exception as e:
             await session.rollback()
@@ -374,6 +509,82 @@ async def get_superuser_db(request: Request) -> AsyncGenerator[AsyncSession, Non
             logger.debug("Superuser database session closed")
 
 
+async def _choose_replica(request: Request, tenant_id: UUID) -> Optional[AsyncEngine]:
+    """
+    Pick a replica for a read session, or None to read from the primary.
+
+    Args:
+        request: FastAPI request object
+        tenant_id: Tenant of the current request
+
+    Returns:
+        Healthy replica engine, or None if reads must go to the primary
+    """
+    if not replica_engines:
+        return None
+
+    user_id = _extract_user_id(request)
+    if user_id is not None and await has_recent_write(tenant_id, user_id):
+        logger.debug(
+            "Recent write by user, reading from primary",
+            extra={"tenant_id": str(tenant_id), "user_id": user_id},
+        )
+        return None
+
+    return replica_router.choose()
+
+
+async def _record_write(request: Request, tenant_id: UUID) -> None:
+    """
+    Mark the current user as a recent writer after an unsafe-method commit.
+
+    Subsequent get_tenant_read_db() sessions for this user read from the
+    primary until the marker expires. No-op when no replicas are configured.
+
+    Args:
+        request: FastAPI request object
+        tenant_id: Tenant the write belongs to
+    """
+    if not replica_engines or request.method in SAFE_METHODS:
+        return
+
+    user_id = _extract_user_id(request)
+    if user_id is not None:
+        await mark_recent_write(tenant_id, user_id)
+
+
+def _extract_user_id(request: Request) -> Optional[str]:
+    """
+    Extract the authenticated user's ID from request state.
+
+    Args:
+        request: FastAPI request object
+
+    Returns:
+        User ID (OAuth subject) or None if the request is not authenticated
+    """
+    user = getattr(request.state, "user", None)
+    return getattr(user, "user_id", None)
+
+
+def _record_unused_session(dependency: str) -> None:
+    """
+    Record the round trips saved by a session that never touched the database.
+
+    Args:
+        dependency: Name of the session dependency, used as the metric label
+    """
+    logger.debug(
+        "Tenant-aware database session unused, skipped setup and commit",
+        extra={"dependency": dependency, "round_trips_saved": DEFERRED_SETUP_ROUND_TRIPS},
+    )
+    {%- if cookiecutter.include_observability == "yes" %}
+    db_session_round_trips_saved_total.labels(dependency=dependency).inc(
+        DEFERRED_SETUP_ROUND_TRIPS
+    )
+    {%- endif %}
+
+
 def _extract_tenant_id(request: Request) -> Optional[UUID]:
     """
     Extract tenant_id from request state or contextvars.
@@ -0,0 +1,130 @@
+"""
+Administrative diagnostics endpoints.
+
+All endpoints require the system-wide 'admin' scope. Diagnostics are opt-in
+and respond with 404 unless enabled in settings.
+"""
+
+import asyncio
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from app.api.dependencies.scopes import require_scopes
+from app.core.config import settings
+from app.schemas.auth import SCOPE_ADMIN
+from app.services.profiler import ProfilerBusyError, get_profiler
+from app.services.slow_requests import SlowRequest, get_slow_request_log
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_scopes(SCOPE_ADMIN))],
+)
+
+
+@router.get(
+    "/profile",
+    response_class=PlainTextResponse,
+    summary="Sample the running process",
+    description=(
+        "Samples every thread's Python stack for the requested duration and "
+        "returns collapsed stacks, rooted at the route being served, for "
+        "flamegraph tools. Requires PROFILER_ENABLED."
+    ),
+)
+async def profile(
+    seconds: float = Query(10.0, gt=0, description="Profile duration in seconds"),
+    interval_ms: float = Query(10.0, ge=1, le=1000, description="Sampling interval"),
+    mode: Literal["wall", "cpu"] = Query("wall", description="Sampling mode"),
+) -> PlainTextResponse:
+    """
+    Run the sampling profiler and return collapsed-stack output.
+
+    The profiler runs in a worker thread, so the event loop keeps serving
+    the requests being profiled.
+
+    Args:
+        seconds: Profile duration, capped at PROFILER_MAX_SECONDS
+        interval_ms: Time between samples in milliseconds
+        mode: "wall" for all samples, "cpu" to drop samples of idle threads
+
+    Returns:
+        PlainTextResponse: One "frame;frame;... count" line per distinct stack
+
+    Raises:
+        HTTPException: 404 if the profiler is disabled, 409 if a profile is
+            already running, 422 if seconds exceeds PROFILER_MAX_SECONDS
+    """
+    if not settings.PROFILER_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if seconds > settings.PROFILER_MAX_SECONDS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"seconds must not exceed {settings.PROFILER_MAX_SECONDS}",
+        )
+
+    profiler = get_profiler()
+    try:
+        samples = await asyncio.to_thread(
+            profiler.profile, seconds, interval_ms / 1000, mode
+        )
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e)) from e
+
+    return PlainTextResponse(profiler.collapse(samples))
+
+
+def _require_slow_request_capture() -> None:
+    """Respond with 404 when slow request capture is disabled."""
+    if settings.SLOW_REQUEST_THRESHOLD_MS <= 0:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+
+@router.get(
+    "/slow-requests",
+    response_model=List[SlowRequest],
+    summary="List recent slow requests",
+    description=(
+        "Returns the requests of this worker that took at least "
+        "SLOW_REQUEST_THRESHOLD_MS, newest first, with per-phase timings, SQL "
+        "statements, Redis call count and the stack they were waiting in."
+    ),
+)
+async def list_slow_requests(
+    route: Optional[str] = Query(None, description="Only requests to this route template"),
+) -> List[SlowRequest]:
+    """
+    List the slow requests recorded by this worker.
+
+    Args:
+        route: Optional route template filter, e.g. "/api/v1/todos/{todo_id}"
+
+    Returns:
+        List[SlowRequest]: Recorded slow requests, newest first
+
+    Raises:
+        HTTPException: 404 if slow request capture is disabled
+    """
+    _require_slow_request_capture()
+    records = get_slow_request_log().entries()
+    if route is not None:
+        records = [record for record in records if record.route == route]
+    return records
+
+
+@router.delete(
+    "/slow-requests",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Clear recorded slow requests",
+)
+async def clear_slow_requests() -> None:
+    """
+    Discard the slow requests recorded by this worker.
+
+    Raises:
+        HTTPException: 404 if slow request capture is disabled
+    """
+    _require_slow_request_capture()
+    get_slow_request_log().clear()
@@ -2,13 +2,17 @@
 Health check endpoints for monitoring and orchestration.
 
 Provides basic health status and readiness checks for the application.
+Readiness is answered from dependency checks run in the background.
 """
 
 from datetime import datetime
-from fastapi import APIRouter, status
+from typing import Dict, Optional
+
+from fastapi import APIRouter, Response, status
 from pydantic import BaseModel
 
 from app.core.config import settings
+from app.services.health_monitor import get_health_monitor
 
 
 class HealthResponse(BaseModel):
@@ -20,6 +24,21 @@ class HealthResponse(BaseModel):
     timestamp: datetime
 
 
+class DependencyCheck(BaseModel):
+    """Latest result of a background dependency check."""
+
+    healthy: bool
+    latency_ms: float
+    checked_at: datetime
+    error: Optional[str] = None
+
+
+class ReadinessResponse(HealthResponse):
+    """Readiness check response model."""
+
+    checks: Dict[str, DependencyCheck] = {}
+
+
 router = APIRouter(tags=["health"])
 
 
@@ -47,24 +66,48 @@ async def health_check() -> HealthResponse:
 
 @router.get(
     "/ready",
-    response_model=HealthResponse,
+    response_model=ReadinessResponse,
     status_code=status.HTTP_200_OK,
     summary="Readiness check endpoint",
-    description="Returns readiness status indicating if the service can accept requests."
+    description=(
+        "Returns readiness status indicating if the service can accept requests, "
+        "from dependency checks run in the background. Responds with 503 when "
+        "not ready."
+    ),
+    responses={503: {"model": ReadinessResponse, "description": "Service not ready"}},
 )
-async def readiness_check() -> HealthResponse:
+async def readiness_check(response: Response) -> ReadinessResponse:
     """
     Perform a readiness check.
 
-    In a full implementation, this would check database connectivity,
-    external service availability, etc.
+    Answers from the results of the background health monitor (see
+    app.services.health_monitor), so probes cost no database, Redis or
+    network round trips.
+
+    Args:
+        response: Response used to set the 503 status when not ready
 
     Returns:
-        HealthResponse: Current readiness status of the service
+        ReadinessResponse: Readiness status ("ready", "degraded", "not_ready",
+            "stale", "starting" or "warming_up") with the latest result of
+            each check
     """
-    return HealthResponse(
-        status="ready",
+    readiness = get_health_monitor().readiness()
+    if not readiness.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return ReadinessResponse(
+        status=readiness.status,
         service=settings.APP_NAME,
         version=settings.APP_VERSION,
-        timestamp=datetime.utcnow()
+        timestamp=datetime.utcnow(),
+        checks={
+            name: DependencyCheck(
+                healthy=result.healthy,
+                latency_ms=result.latency_ms,
+                checked_at=result.checked_at,
+                error=result.error,
+            )
+            for name, result in readiness.checks.items()
+        },
     )
@@ -9,7 +9,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
 from app.api.dependencies.auth import CurrentUser
-from app.schemas.auth import AuthenticatedUser
+from app.schemas.auth import Principal
 
 router = APIRouter(tags=["test"], prefix="/test")
 
@@ -38,7 +38,7 @@ class TestAdminResponse(BaseModel):
     user: TestUserInfo
 
 
-def require_admin(user: CurrentUser) -> AuthenticatedUser:
+def require_admin(user: CurrentUser) -> Principal:
     """
     Dependency that requires the user to have the 'admin' role/scope.
 
@@ -52,12 +52,12 @@ def require_admin(user: CurrentUser) -> AuthenticatedUser:
         user: The authenticated user from the CurrentUser dependency
 
     Returns:
-        AuthenticatedUser: The validated user if they have admin role
+        Principal: The validated user if they have admin role
 
     Raises:
         HTTPException: 403 Forbidden if user lacks admin role
     """
-    if "admin" not in user.scopes:
+    if not user.has_scope("admin"):
         raise HTTPException(
             status_code=403,
             detail="Role 'admin' required. User roles: " + ", ".join(user.scopes),
@@ -101,7 +101,7 @@ async def protected_endpoint(user: CurrentUser) -> TestAuthResponse:
     description="Requires 'admin' role. Used for testing role-based access control.",
 )
 async def admin_endpoint(
-    user: AuthenticatedUser = Depends(require_admin),
+    user: Principal = Depends(require_admin),
 ) -> TestAdminResponse:
     """
     Admin-only endpoint for testing RBAC.
@@ -126,7 +126,7 @@ async def admin_endpoint(
         message="This is an admin route",
         user=TestUserInfo(
             username=username,
-            roles=user.scopes,  # Scopes serve as roles in this system
+            roles=list(user.scopes),  # Scopes serve as roles in this system
             tenant_id=user.tenant_id,
         ),
     )
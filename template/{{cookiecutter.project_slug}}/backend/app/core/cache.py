@@ -7,14 +7,33 @@ Redis is unavailable - services will fall back to database queries.
 """
 
 import logging
-from typing import Optional
+from typing import Any, Optional
 
 import redis.asyncio as redis
 
 from app.core.config import settings
+from app.core.timing import record_timing
 
 logger = logging.getLogger(__name__)
 
+
+class TimedRedis(redis.Redis):
+    """
+    Redis client that reports each command as the request's redis phase.
+
+    The time and number of commands show up in the Server-Timing header and
+    in slow request records (see app.core.timing). Pipelines are sent through
+    a separate class and are not counted.
+
+    Example:
+        client = TimedRedis.from_url(settings.REDIS_URL, decode_responses=True)
+    """
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        """Execute a command, timing it when a request is being timed."""
+        with record_timing("redis"):
+            return await super().execute_command(*args, **options)
+
 # Global Redis client instance (singleton)
 _redis_client: Optional[redis.Redis] = None
 
@@ -56,7 +75,7 @@ async def get_redis_client() -> Optional[redis.Redis]:
 
     # Initialize Redis client
     try:
-        _redis_client = redis.from_url(
+        _redis_client = TimedRedis.from_url(
             settings.REDIS_URL,
             encoding="utf-8",
             decode_responses=True,
@@ -95,6 +114,6 @@ async def close_redis_client():
     global _redis_client
 
     if _redis_client:
-        await _redis_client.close()
+        await _redis_client.aclose()
         _redis_client = None
         logger.info("redis_connection_closed")
@@ -5,9 +5,9 @@ Uses pydantic-settings to load configuration from environment variables
 with sensible defaults for development.
 """
 
-from typing import List, Union
+from typing import Annotated, Dict, List, Union
 from pydantic import field_validator
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -34,6 +34,21 @@ class Settings(BaseSettings):
     # Migration database URL uses {{ cookiecutter.postgres_migration_user }} (with BYPASSRLS for schema management)
     MIGRATION_DATABASE_URL: str = "postgresql+asyncpg://{{ cookiecutter.postgres_migration_user }}:{{ cookiecutter.postgres_migration_password }}@postgres:{{ cookiecutter.postgres_port }}/{{ cookiecutter.postgres_db }}"
 
+    # Connection pool (per process; multiply by worker count for the total)
+    DATABASE_POOL_SIZE: int = 20  # 0 selects NullPool when DATABASE_PGBOUNCER is enabled
+    DATABASE_MAX_OVERFLOW: int = 10
+
+    # PgBouncer transaction pooling: disables prepared statement caching
+    DATABASE_PGBOUNCER: bool = False
+
+    # Request sessions for GET/HEAD/OPTIONS run in READ ONLY transactions
+    DATABASE_READ_ONLY_SAFE_METHODS: bool = True
+
+    # Read replicas (comma-separated URLs; empty disables replica routing)
+    DATABASE_REPLICA_URLS: Annotated[List[str], NoDecode] = []
+    DATABASE_REPLICA_EJECT_SECONDS: int = 30  # Keep a failed replica out of rotation this long
+    DATABASE_READ_YOUR_WRITES_SECONDS: int = 5  # Route a user's reads to the primary after a write
+
     # Server
     HOST: str = "0.0.0.0"
     PORT: int = {{ cookiecutter.backend_port }}
@@ -47,6 +62,19 @@ class Settings(BaseSettings):
     # JWKS Configuration
     JWKS_CACHE_TTL: int = 3600  # Cache JWKS for 1 hour (seconds)
     JWKS_HTTP_TIMEOUT: int = 10  # HTTP timeout for JWKS/OIDC requests (seconds)
+    OIDC_DISCOVERY_CACHE_TTL: int = 3600  # Refetch discovery documents after 1 hour (seconds)
+    TOKEN_REFRESH_LOCK_SECONDS: float = 10.0  # Longest wait for a concurrent refresh
+    TOKEN_REFRESH_RESULT_TTL_SECONDS: int = 30  # Refresh result kept for concurrent callers
+    USERINFO_CACHE_TTL_SECONDS: int = 300  # Userinfo cached per access token (bounded by exp)
+    USERINFO_CACHE_MAX_ENTRIES: int = 10000  # Per process; least recently used evicted
+
+    # Outbound HTTP clients (shared identity provider client, see app.core.http_client)
+    HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST: int = 20
+    HTTP_CLIENT_MAX_KEEPALIVE_PER_HOST: int = 10
+    HTTP_CLIENT_KEEPALIVE_EXPIRY: float = 30.0  # Seconds an idle connection is kept open
+    HTTP_CLIENT_HTTP2: bool = False  # Requires the h2 package (httpx[http2])
+    HTTP_CLIENT_RETRIES: int = 2  # Retries of GET/HEAD/OPTIONS on connection errors and 502/503/504
+    HTTP_CLIENT_RETRY_BACKOFF: float = 0.1  # Base of the jittered exponential backoff (seconds)
 
     # OAuth Client Configuration (TASK-011)
     OAUTH_CLIENT_ID: str = "{{ cookiecutter.keycloak_backend_client_id }}"
@@ -55,6 +83,11 @@ class Settings(BaseSettings):
     OAUTH_SCOPES: List[str] = ["openid", "profile", "email"]
     OAUTH_USE_PKCE: bool = True  # Enable PKCE for enhanced security
 
+    # Per-tenant OAuth clients from OAuthProvider rows (see app.services.oauth_client_registry)
+    OAUTH_CLIENT_REGISTRY_MAX_CLIENTS: int = 256  # Least recently used tenants evicted beyond
+    OAUTH_CLIENT_REGISTRY_IDLE_SECONDS: float = 3600.0  # Unused tenant clients dropped after
+    OAUTH_CLIENT_REGISTRY_MAX_AGE_SECONDS: float = 300.0  # Provider rows reloaded after
+
     # Redis Configuration
     REDIS_URL: str = "redis://default:{{ cookiecutter.redis_password }}@redis:{{ cookiecutter.redis_port }}/0"
 
@@ -76,6 +109,32 @@ class Settings(BaseSettings):
     # Tenant Resolver Configuration (TASK-016)
     TENANT_CACHE_TTL: int = 3600  # Tenant cache TTL in seconds (1 hour)
 
+    # Readiness (background dependency checks behind {API_V1_PREFIX}/ready)
+    READINESS_CHECK_INTERVAL_SECONDS: float = 5.0  # 0 disables the checks; /ready then always passes
+    READINESS_CHECK_TIMEOUT_SECONDS: float = 2.0  # Per-check timeout
+    READINESS_MAX_STALENESS_SECONDS: float = 30.0  # Not ready if the last check run is older
+    # Comma-separated checks that must pass; others (redis, jwks) only report "degraded"
+    READINESS_REQUIRED_CHECKS: Annotated[List[str], NoDecode] = ["database"]
+
+    # Warm-up: pre-connect pools and prefetch OIDC discovery and JWKS before /ready passes
+    WARMUP_ENABLED: bool = True
+    WARMUP_DB_CONNECTIONS: int = 5  # Pool connections opened at startup (capped at DATABASE_POOL_SIZE)
+    WARMUP_TIMEOUT_SECONDS: float = 15.0  # Per-step limit; failed steps are logged, not fatal
+
+    # Graceful shutdown: wait this long for in-flight requests before closing pools
+    SHUTDOWN_DRAIN_TIMEOUT_SECONDS: float = 20.0
+
+    # Diagnostics
+    # Admin-only sampling profiler at {API_V1_PREFIX}/admin/profile (off by default)
+    PROFILER_ENABLED: bool = False
+    PROFILER_MAX_SECONDS: int = 60  # Longest profile a single request may run
+    # Report per-phase durations (auth, tenant, db, ...) in a Server-Timing response header.
+    # Off by default: the durations are a timing oracle on token validation
+    SERVER_TIMING_ENABLED: bool = False
+    # Record requests at least this slow at {API_V1_PREFIX}/admin/slow-requests (0 disables)
+    SLOW_REQUEST_THRESHOLD_MS: int = 1000
+    SLOW_REQUEST_BUFFER_SIZE: int = 100  # Slow requests kept per worker (oldest dropped)
+
 {%- if cookiecutter.include_sentry == "yes" %}
     # Sentry Configuration (Optional - P3-03)
     # Error tracking is enabled when SENTRY_DSN is set
@@ -86,6 +145,31 @@ class Settings(BaseSettings):
     SENTRY_PROFILES_SAMPLE_RATE: float = 0.1  # 10% of traces profiled
 {%- endif %}
 
+{%- if cookiecutter.include_observability == "yes" %}
+    # Observability Configuration
+    # Warn when one statement shape runs more than this many times in a request (N+1)
+    SQL_N_PLUS_ONE_THRESHOLD: int = 10
+    # Maximum distinct endpoint label values on HTTP metrics; extra routes report as "overflow"
+    METRICS_MAX_ENDPOINTS: int = 500
+    # Fraction of new traces sampled at the start (callers' traceparent decisions are followed)
+    TRACE_SAMPLE_RATIO: float = 1.0
+    # Also export unsampled traces that contain an error or whose request took
+    # at least TRACE_SLOW_THRESHOLD_MS (spans are recorded, buffered, then kept or dropped)
+    TRACE_TAIL_SAMPLING_ENABLED: bool = True
+    TRACE_SLOW_THRESHOLD_MS: int = 1000
+    # Interval of the event loop lag probe (event_loop_lag_seconds)
+    EVENT_LOOP_LAG_INTERVAL_MS: int = 500
+    # With DEBUG, log asyncio callbacks that block the event loop longer than this
+    EVENT_LOOP_SLOW_CALLBACK_MS: int = 100
+    # Log output: "json" (one object per line) or "text"
+    LOG_FORMAT: str = "json"
+    # Records waiting for the log writer thread; beyond this they are dropped and counted
+    LOG_QUEUE_SIZE: int = 10000
+    # Fraction of INFO records to keep per logger (and its children), e.g.
+    # {"app.middleware.tenant": 0.1}; WARNING and above are always kept
+    LOG_INFO_SAMPLE_RATES: Dict[str, float] = {}
+{%- endif %}
+
     # ==========================================================================
     # Security Headers Configuration (P2-02)
     # These settings control the SecurityHeadersMiddleware behavior
@@ -130,6 +214,26 @@ class Settings(BaseSettings):
         extra="ignore"
     )
 
+    @field_validator("READINESS_REQUIRED_CHECKS", mode="before")
+    @classmethod
+    def parse_required_checks(cls, v: Union[str, List[str]]) -> List[str]:
+        """Parse comma-separated readiness check names into a list."""
+        if isinstance(v, str):
+            return [name.strip() for name in v.split(",") if name.strip()]
+        elif isinstance(v, list):
+            return v
+        return []
+
+    @field_validator("DATABASE_REPLICA_URLS", mode="before")
+    @classmethod
+    def parse_replica_urls(cls, v: Union[str, List[str]]) -> List[str]:
+        """Parse comma-separated replica URLs into a list."""
+        if isinstance(v, str):
+            return [url.strip() for url in v.split(",") if url.strip()]
+        elif isinstance(v, list):
+            return v
+        return []
+
     @field_validator("CORS_ORIGINS", mode="before")
     @classmethod
     def parse_cors_origins(cls, v: Union[str, List[str]]) -> List[str]:
@@ -7,39 +7,140 @@ pooling configuration optimized for multi-tenant workloads.
 """
 
 import logging
-from typing import Any
+import time
+from typing import Any, Callable, List, Optional, Sequence
 from datetime import datetime, timezone
+from uuid import uuid4
 
 from sqlalchemy import DateTime, event, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError, DisconnectionError, InterfaceError, OperationalError
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy.pool import Pool
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, SessionTransaction, mapped_column
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, NullPool
 
 from app.core.config import settings
+from app.core.timing import add_timing, get_request_timings
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+
+def _asyncpg_url(url: str) -> str:
+    """Convert a postgresql:// URL to use the asyncpg driver if needed."""
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
 # Convert DATABASE_URL to use asyncpg driver if needed
-database_url = settings.DATABASE_URL
-if database_url.startswith("postgresql://"):
-    database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+database_url = _asyncpg_url(settings.DATABASE_URL)
+
+# ConnectionPoolEntry.info key holding the last checkout's wait time in seconds
+POOL_CHECKOUT_WAIT = "checkout_wait"
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool that records how long each checkout waited.
+
+    The wait covers queueing for a free connection and, when the pool grows,
+    opening a new one. It is stored on the connection record under
+    POOL_CHECKOUT_WAIT for "checkout" event listeners (see the pool metrics
+    in app.observability) and costs two clock reads per checkout. The wait is
+    also reported as the request's db_pool timing phase.
+    """
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        record = super()._do_get()
+        wait = time.perf_counter() - start
+        record.info[POOL_CHECKOUT_WAIT] = wait
+        add_timing("db_pool", wait)
+        return record
+
+
+# Connection pooling optimized for multi-tenant load (shared by replica engines)
+ENGINE_OPTIONS: dict[str, Any] = {
+    "pool_pre_ping": False,  # Disabled to avoid event loop issues in tests (safe in production with pool_recycle)
+    "pool_recycle": 3600,  # Recycle connections after 1 hour to prevent long-lived issues
+    "echo": settings.DEBUG,  # Log SQL queries in debug mode
+    "future": True,  # Use SQLAlchemy 2.0 API style
+    "pool_reset_on_return": "rollback",  # Reset connections on return to pool
+}
+
+
+def create_database_engine(
+    url: str,
+    pgbouncer: Optional[bool] = None,
+    pool_size: Optional[int] = None,
+) -> AsyncEngine:
+    """
+    Create an async engine with the application's pooling configuration.
+
+    In PgBouncer mode (DATABASE_PGBOUNCER), the engine is made safe for
+    transaction pooling, where consecutive transactions from one client may
+    run on different server connections:
+    - asyncpg's statement cache and SQLAlchemy's prepared statement cache are
+      disabled, so no statement prepared on one server connection is reused
+      on another
+    - Prepared statements get unique names, avoiding "prepared statement
+      already exists" collisions between clients sharing a server connection
+    - DATABASE_POOL_SIZE=0 selects NullPool, leaving pooling to PgBouncer
+
+    Tenant context needs no changes: set_config(..., TRUE) and SET LOCAL are
+    transaction-scoped and never outlive the transaction that set them.
+
+    Args:
+        url: Database URL (postgresql:// is converted to postgresql+asyncpg://)
+        pgbouncer: Override DATABASE_PGBOUNCER (default: use the setting)
+        pool_size: Fixed pool size without overflow, overriding
+            DATABASE_POOL_SIZE and DATABASE_MAX_OVERFLOW
+
+    Returns:
+        Configured AsyncEngine
+
+    Example:
+        replica = create_database_engine("postgresql://app@replica:5432/app")
+    """
+    if pgbouncer is None:
+        pgbouncer = settings.DATABASE_PGBOUNCER
+
+    options = dict(ENGINE_OPTIONS)
+
+    if pool_size is not None:
+        options["poolclass"] = TimedQueuePool
+        options["pool_size"] = pool_size
+        options["max_overflow"] = 0
+    elif pgbouncer and settings.DATABASE_POOL_SIZE == 0:
+        options["poolclass"] = NullPool
+    else:
+        options["poolclass"] = TimedQueuePool
+        options["pool_size"] = settings.DATABASE_POOL_SIZE
+        options["max_overflow"] = settings.DATABASE_MAX_OVERFLOW
+
+    if pgbouncer:
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+
+    return create_async_engine(_asyncpg_url(url), **options)
+
 
 # Create async engine with connection pooling optimized for multi-tenant load
-engine: AsyncEngine = create_async_engine(
-    database_url,
-    pool_size=20,  # Support 20 concurrent database operations
-    max_overflow=10,  # Allow bursts up to 30 total connections
-    pool_pre_ping=False,  # Disabled to avoid event loop issues in tests (safe in production with pool_recycle)
-    pool_recycle=3600,  # Recycle connections after 1 hour to prevent long-lived issues
-    echo=settings.DEBUG,  # Log SQL queries in debug mode
-    future=True,  # Use SQLAlchemy 2.0 API style
-    pool_reset_on_return="rollback",  # Reset connections on return to pool
+engine: AsyncEngine = create_database_engine(database_url)
+
+# One autocommit connection of its own for health checks, so they never wait
+# for (or take) a request connection and run without BEGIN/ROLLBACK
+health_engine: AsyncEngine = create_database_engine(database_url, pool_size=1).execution_options(
+    isolation_level="AUTOCOMMIT"
 )
 
 # Create async session factory with explicit transaction control
@@ -51,6 +152,20 @@ AsyncSessionLocal: async_sessionmaker[AsyncSession] = async_sessionmaker(
     autoflush=False,  # Explicit flush control to optimize batch operations
 )
 
+# Engine variant whose transactions start with BEGIN READ ONLY.
+# Shares the pool with `engine`; asyncpg applies the flag when it opens the
+# transaction, so read-only sessions cost no extra round trip.
+read_only_engine: AsyncEngine = engine.execution_options(postgresql_readonly=True)
+
+# One engine (and pool) per read replica; empty when no replicas are configured
+replica_engines: List[AsyncEngine] = [
+    create_database_engine(url) for url in settings.DATABASE_REPLICA_URLS
+]
+
+# Session.info keys used by request-scoped sessions (see app.api.dependencies)
+SESSION_CONNECTED = "connected"  # Set once the session has checked out a connection
+SESSION_ON_BEGIN = "on_begin"  # Callbacks run on the connection when a transaction begins
+
 
 class Base(DeclarativeBase):
     """
@@ -79,52 +194,177 @@ class Base(DeclarativeBase):
     )
 
 
-# Connection pool event listeners for observability
-@event.listens_for(Pool, "connect")
-def receive_connect(dbapi_conn: Any, connection_record: Any) -> None:
+# Connection.info key holding statement start times for request timings
+_TIMING_STARTS = "timing_starts"
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement_timing(
+    conn: Connection, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    """Note the statement start time when the current request is being timed."""
+    if get_request_timings() is not None:
+        conn.info.setdefault(_TIMING_STARTS, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _end_statement_timing(
+    conn: Connection, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    """Add the statement's duration to the request's db phase and statements."""
+    starts = conn.info.get(_TIMING_STARTS)
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    timings = get_request_timings()
+    if timings is not None:
+        timings.add("db", elapsed)
+        timings.add_statement(statement, elapsed)
+
+
+@event.listens_for(Session, "after_begin")
+def receive_after_begin(
+    session: Session, transaction: SessionTransaction, connection: Connection
+) -> None:
     """
-    Event listener for new database connections.
+    Event listener for a session transaction acquiring its connection.
 
-    Logs when a new connection is established to the database.
-    Useful for monitoring connection creation rate and debugging
-    connection issues.
+    Fires on the first statement of each session transaction, which is also
+    the moment the connection is checked out of the pool. Deferred setup
+    registered with run_on_begin() runs here, so request sessions that never
+    touch the database never check out a connection at all. Savepoints reuse
+    the outer transaction's setup and are skipped.
 
     Args:
-        dbapi_conn: The DBAPI connection object
-        connection_record: The connection record
+        session: The ORM session beginning a transaction
+        transaction: The session transaction being started
+        connection: The connection the transaction will use
     """
-    logger.debug("Database connection established")
+    if transaction.nested:
+        return
 
+    session.info[SESSION_CONNECTED] = True
+    for callback in session.info.get(SESSION_ON_BEGIN, ()):
+        callback(connection)
 
-@event.listens_for(Pool, "checkout")
-def receive_checkout(dbapi_conn: Any, connection_record: Any, connection_proxy: Any) -> None:
+
+def run_on_begin(session: AsyncSession, callback: Callable[[Connection], None]) -> None:
     """
-    Event listener for connection checkout from pool.
+    Defer setup SQL until the session first talks to the database.
 
-    Logs when a connection is checked out from the pool.
-    Useful for monitoring pool usage patterns.
+    The callback receives the synchronous Connection and runs at the start of
+    every transaction the session opens, including transactions started after
+    a commit. This makes it suitable for transaction-scoped settings such as
+    `set_config(..., TRUE)`.
 
     Args:
-        dbapi_conn: The DBAPI connection object
-        connection_record: The connection record
-        connection_proxy: The connection proxy
+        session: Session to attach the callback to
+        callback: Function executing setup statements on the connection
+
+    Example:
+        run_on_begin(session, lambda conn: conn.execute(text("SET LOCAL ...")))
     """
-    logger.debug("Database connection checked out from pool")
+    session.info.setdefault(SESSION_ON_BEGIN, []).append(callback)
 
 
-@event.listens_for(Pool, "checkin")
-def receive_checkin(dbapi_conn: Any, connection_record: Any) -> None:
+def session_was_used(session: AsyncSession) -> bool:
     """
-    Event listener for connection checkin to pool.
+    Check whether a session has done, or has pending, database work.
 
-    Logs when a connection is returned to the pool.
-    Useful for detecting connection leaks (if checkouts > checkins).
+    A session that never checked out a connection and holds no pending
+    objects has nothing to commit, so callers can skip the COMMIT entirely.
 
     Args:
-        dbapi_conn: The DBAPI connection object
-        connection_record: The connection record
+        session: Session to inspect
+
+    Returns:
+        True if the session executed statements or has unflushed changes
+    """
+    return bool(
+        session.info.get(SESSION_CONNECTED)
+        or session.new
+        or session.dirty
+        or session.deleted
+    )
+
+
+class ReplicaRouter:
+    """
+    Round-robin selection of read replica engines with health-aware ejection.
+
+    A replica that fails with a connection-level error is ejected for
+    `eject_seconds` and skipped by choose() until the period expires, after
+    which it rejoins the rotation. When every replica is ejected (or none is
+    configured), choose() returns None and callers fall back to the primary.
+
+    Example:
+        replica = replica_router.choose()
+        session = AsyncSessionLocal(bind=replica or engine)
     """
-    logger.debug("Database connection returned to pool")
+
+    def __init__(self, engines: Sequence[AsyncEngine], eject_seconds: float):
+        """
+        Initialize the router.
+
+        Args:
+            engines: Replica engines to rotate through
+            eject_seconds: How long a failed replica is kept out of rotation
+        """
+        self.engines = list(engines)
+        self.eject_seconds = eject_seconds
+        self._ejected_until = [0.0] * len(self.engines)
+        self._next = 0
+
+    def choose(self) -> Optional[AsyncEngine]:
+        """
+        Pick the next healthy replica.
+
+        Returns:
+            Replica engine, or None if no replica is currently available
+        """
+        now = time.monotonic()
+        for _ in range(len(self.engines)):
+            index = self._next % len(self.engines)
+            self._next = index + 1
+            if self._ejected_until[index] <= now:
+                return self.engines[index]
+        return None
+
+    def eject(self, replica: AsyncEngine) -> None:
+        """
+        Take a replica out of rotation for eject_seconds.
+
+        Args:
+            replica: Engine returned by an earlier choose() call
+        """
+        index = self.engines.index(replica)
+        self._ejected_until[index] = time.monotonic() + self.eject_seconds
+        logger.warning(
+            "Database replica ejected from rotation",
+            extra={
+                "replica": replica.url.render_as_string(hide_password=True),
+                "eject_seconds": self.eject_seconds,
+            },
+        )
+
+    def report_error(self, replica: AsyncEngine, error: BaseException) -> None:
+        """
+        Eject a replica if an error indicates it is unreachable.
+
+        Statement errors (constraint violations, bad SQL) leave the replica in
+        rotation; connection failures and invalidated connections eject it.
+
+        Args:
+            replica: Engine the failing session was bound to
+            error: Exception raised while using the replica
+        """
+        if isinstance(error, (OSError, DisconnectionError, OperationalError, InterfaceError)) or (
+            isinstance(error, DBAPIError) and error.connection_invalidated
+        ):
+            self.eject(replica)
+
+
+replica_router = ReplicaRouter(replica_engines, settings.DATABASE_REPLICA_EJECT_SECONDS)
 
 
 async def init_db() -> None:
@@ -153,8 +393,9 @@ async def init_db() -> None:
             "Database connection established successfully",
             extra={
                 "database_url": db_info,  # Log without credentials
-                "pool_size": 20,
-                "max_overflow": 10,
+                "pool_size": settings.DATABASE_POOL_SIZE,
+                "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+                "pgbouncer": settings.DATABASE_PGBOUNCER,
             },
         )
     except Exception as e:
@@ -182,15 +423,31 @@ async def close_db() -> None:
             await close_db()
     """
     await engine.dispose()
+    await health_engine.dispose()
+    for replica in replica_engines:
+        await replica.dispose()
     logger.info("Database connections closed and pool disposed")
 
 
+async def ping_database() -> None:
+    """
+    Verify database connectivity with a single SELECT 1.
+
+    Uses the dedicated health check connection, not the request pool.
+
+    Raises:
+        Exception: If the database cannot be reached
+    """
+    async with health_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
 async def get_db_health() -> dict[str, Any]:
     """
     Check database health status.
 
-    Executes a simple query to verify database connectivity.
-    Used by health check endpoints to monitor database availability.
+    Executes a simple query on the health check connection to verify
+    database connectivity.
 
     Returns:
         dict: Health status with 'status' and optional 'error' keys
@@ -201,8 +458,7 @@ async def get_db_health() -> dict[str, Any]:
             print("Database is accessible")
     """
     try:
-        async with engine.begin() as conn:
-            await conn.execute(text("SELECT 1"))
+        await ping_database()
         return {"status": "healthy", "database": "connected"}
     except Exception as e:
         logger.error("Database health check failed", extra={"error": str(e)}, exc_info=True)
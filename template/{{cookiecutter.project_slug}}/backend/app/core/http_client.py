@@ -0,0 +1,269 @@
+"""
+Shared outbound HTTP clients.
+
+Services calling other services (the identity provider for OIDC discovery,
+JWKS, token and userinfo requests) share one httpx.AsyncClient per upstream
+from a registry instead of each building its own, so connections are reused
+across services and the client is tuned in one place:
+
+- Connection pools per host, with HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST and
+  HTTP_CLIENT_MAX_KEEPALIVE_PER_HOST limits and HTTP_CLIENT_KEEPALIVE_EXPIRY
+- Optional HTTP/2 (HTTP_CLIENT_HTTP2; requires the h2 package, installed
+  with httpx[http2])
+- Retries of idempotent requests (GET, HEAD, OPTIONS) after connection
+  failures and 502/503/504 responses, with jittered exponential backoff
+{%- if cookiecutter.include_observability == "yes" %}
+- Metrics per attempt: latency and status, pool wait and retries (see the
+  http_client_* metrics in app.observability)
+{%- endif %}
+
+Example:
+    from app.core.http_client import get_http_client
+
+    client = get_http_client("idp")
+    response = await client.get(discovery_url)
+"""
+
+import asyncio
+import importlib.util
+import logging
+import random
+{%- if cookiecutter.include_observability == "yes" %}
+import time
+{%- endif %}
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+{%- if cookiecutter.include_observability == "yes" %}
+from app.observability import (
+    http_client_pool_wait_seconds,
+    http_client_request_duration_seconds,
+    http_client_retries_total,
+)
+{%- endif %}
+
+logger = logging.getLogger(__name__)
+
+# Methods that may be sent again without side effects
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Responses meaning the upstream did not process the request
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+# Transport failures after which a new attempt can succeed (timeouts waiting
+# for a response are not retried: the attempt already used the full timeout)
+RETRY_ERRORS = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.ReadError,
+    httpx.RemoteProtocolError,
+)
+
+
+class OutboundTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport with a connection pool per host and retries.
+
+    Example:
+        transport = OutboundTransport("idp", httpx.Limits(max_connections=20), retries=2)
+        client = httpx.AsyncClient(transport=transport, timeout=10)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limits: httpx.Limits,
+        http2: bool = False,
+        retries: int = 0,
+        backoff: float = 0.1,
+        max_backoff: float = 2.0,
+    ):
+        """
+        Initialize the transport.
+
+        Args:
+            name: Client name used in metrics and logs
+            limits: Connection limits of each per-host pool
+            http2: Negotiate HTTP/2 where the server supports it
+            retries: Retries of idempotent requests
+            backoff: Base delay in seconds of the exponential backoff
+            max_backoff: Upper bound of a single backoff delay in seconds
+        """
+        self.name = name
+        self.limits = limits
+        self.http2 = http2
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._pools: Dict[Tuple[bytes, bytes, Optional[int]], httpx.AsyncHTTPTransport] = {}
+
+    def _pool(self, url: httpx.URL) -> httpx.AsyncHTTPTransport:
+        """Get the connection pool of the URL's host, creating it on first use."""
+        key = (url.raw_scheme, url.raw_host, url.port)
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = httpx.AsyncHTTPTransport(limits=self.limits, http2=self.http2)
+            self._pools[key] = pool
+        return pool
+
+    def _backoff_delay(self, retry: int) -> float:
+        """Full-jitter exponential backoff before the given retry (1-based)."""
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (retry - 1)))
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send the request, retrying idempotent requests on transient failures."""
+        pool = self._pool(request.url)
+        retries = self.retries if request.method in IDEMPOTENT_METHODS else 0
+
+        attempt = 0
+        while True:
+            try:
+                response = await self._send(pool, request)
+            except RETRY_ERRORS as e:
+                if attempt >= retries:
+                    raise
+                reason = type(e).__name__
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= retries:
+                    return response
+                await response.aclose()
+                reason = str(response.status_code)
+
+            attempt += 1
+            logger.debug(
+                "Retrying outbound request",
+                extra={"client": self.name, "url": str(request.url), "reason": reason},
+            )
+{%- if cookiecutter.include_observability == "yes" %}
+            http_client_retries_total.labels(client=self.name, host=request.url.host).inc()
+{%- endif %}
+            await asyncio.sleep(self._backoff_delay(attempt))
+{%- if cookiecutter.include_observability == "yes" %}
+
+    async def _send(self, pool: httpx.AsyncHTTPTransport, request: httpx.Request) -> httpx.Response:
+        """Send one attempt, recording its latency, status and pool wait."""
+        host = request.url.host
+        start = time.perf_counter()
+        acquired: Optional[float] = None
+        outer_trace = request.extensions.get("trace")
+
+        # httpcore reports no event while waiting in the pool, so the first
+        # trace event (connecting, or sending on a reused connection) marks
+        # the end of the wait
+        async def trace(event_name: str, info: Dict[str, object]) -> None:
+            nonlocal acquired
+            if acquired is None:
+                acquired = time.perf_counter()
+            if outer_trace is not None:
+                await outer_trace(event_name, info)
+
+        request.extensions["trace"] = trace
+        status = "error"
+        try:
+            response = await pool.handle_async_request(request)
+            status = str(response.status_code)
+            return response
+        except Exception as e:
+            status = type(e).__name__
+            raise
+        finally:
+            if outer_trace is None:
+                request.extensions.pop("trace", None)
+            else:
+                request.extensions["trace"] = outer_trace
+            http_client_request_duration_seconds.labels(
+                client=self.name, host=host, method=request.method, status=status
+            ).observe(time.perf_counter() - start)
+            if acquired is not None:
+                http_client_pool_wait_seconds.labels(client=self.name, host=host).observe(
+                    acquired - start
+                )
+{%- else %}
+
+    async def _send(self, pool: httpx.AsyncHTTPTransport, request: httpx.Request) -> httpx.Response:
+        """Send one attempt."""
+        return await pool.handle_async_request(request)
+{%- endif %}
+
+    async def aclose(self) -> None:
+        """Close every per-host connection pool."""
+        pools = list(self._pools.values())
+        self._pools.clear()
+        for pool in pools:
+            await pool.aclose()
+
+
+def create_http_client(name: str, timeout: float) -> httpx.AsyncClient:
+    """
+    Create an HTTP client with the tuned outbound transport.
+
+    Args:
+        name: Client name used in metrics and logs
+        timeout: Timeout in seconds for connecting, reading and writing
+
+    Returns:
+        New AsyncClient; the caller is responsible for closing it
+    """
+    http2 = settings.HTTP_CLIENT_HTTP2
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning(
+            "HTTP/2 requested but the h2 package is not installed, using HTTP/1.1",
+            extra={"client": name},
+        )
+        http2 = False
+
+    transport = OutboundTransport(
+        name,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST,
+            max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE_PER_HOST,
+            keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY,
+        ),
+        http2=http2,
+        retries=settings.HTTP_CLIENT_RETRIES,
+        backoff=settings.HTTP_CLIENT_RETRY_BACKOFF,
+    )
+    return httpx.AsyncClient(transport=transport, timeout=timeout)
+
+
+# Shared clients by name (registry)
+_http_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def get_http_client(name: str = "idp", timeout: Optional[float] = None) -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client registered under a name.
+
+    The client is created on first use; later calls return it regardless of
+    timeout. Do not close it: close_http_clients() does at shutdown.
+
+    Args:
+        name: Client name, one per upstream service (default: identity provider)
+        timeout: Timeout in seconds when creating the client
+            (default: JWKS_HTTP_TIMEOUT)
+
+    Returns:
+        Shared AsyncClient
+    """
+    client = _http_clients.get(name)
+    if client is None or client.is_closed:
+        client = create_http_client(
+            name, timeout if timeout is not None else settings.JWKS_HTTP_TIMEOUT
+        )
+        _http_clients[name] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    """
+    Close every shared HTTP client.
+
+    Should be called when the application shuts down. After calling this,
+    get_http_client() creates new clients on next call.
+    """
+    clients = list(_http_clients.values())
+    _http_clients.clear()
+    for client in clients:
+        await client.aclose()
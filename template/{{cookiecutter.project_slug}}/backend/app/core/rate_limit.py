@@ -20,6 +20,7 @@ from typing import Optional, Tuple
 
 import redis.asyncio as redis
 
+from app.core.cache import TimedRedis
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -254,7 +255,7 @@ async def get_rate_limiter() -> RateLimiter:
 
     if _rate_limiter is None:
         # Initialize Redis client
-        redis_client = redis.from_url(
+        redis_client = TimedRedis.from_url(
             settings.REDIS_URL,
             encoding="utf-8",
             decode_responses=True,
@@ -277,3 +278,18 @@ async def get_rate_limiter() -> RateLimiter:
         )
 
     return _rate_limiter
+
+
+async def close_rate_limiter() -> None:
+    """
+    Close the rate limiter's Redis connection pool.
+
+    Should be called when the application shuts down. After calling this,
+    get_rate_limiter() creates a new instance on next call.
+    """
+    global _rate_limiter
+
+    if _rate_limiter is not None:
+        await _rate_limiter.redis_client.aclose()
+        _rate_limiter = None
+        logger.debug("Rate limiter closed")
@@ -0,0 +1,200 @@
+"""
+Per-request phase timings.
+
+Code on the request path records how long its phase took (authentication,
+JWKS lookup, tenant resolution, database work) into a RequestTimings object
+held in a context variable. ServerTimingMiddleware creates that object for
+each request and reports it as a Server-Timing header; outside a request,
+recording is a no-op costing one context variable lookup.
+
+Phases may nest (jwks runs inside auth) and repeat (db accumulates every
+statement), so durations are per-phase totals and need not add up to the
+request time.
+
+Example:
+    from app.core.timing import record_timing, timed
+
+    @timed("tenant")
+    async def resolve(...):
+        ...
+
+    with record_timing("auth"):
+        user = await validate(token)
+"""
+
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class RequestTimings:
+    """
+    Accumulated duration in seconds and call count per phase name.
+
+    Phases are kept in first-seen order. SQL statement texts are only kept
+    when statements is set to a list (slow request capture does this), at
+    most max_statements of them. Every statement is also passed to
+    statement_observer when set (per-request SQL metrics use this), so the
+    database listeners in app.core.database are the only statement timers.
+    """
+
+    __slots__ = ("phases", "counts", "statements", "max_statements", "statement_observer")
+
+    def __init__(self) -> None:
+        """Initialize empty timings."""
+        self.phases: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self.statements: Optional[List[Tuple[str, float]]] = None
+        self.max_statements = 0
+        self.statement_observer: Optional[Callable[[str, float], None]] = None
+
+    def add(self, phase: str, seconds: float) -> None:
+        """
+        Add a duration to a phase.
+
+        Args:
+            phase: Phase name (a Server-Timing metric name: no spaces or commas)
+            seconds: Duration to add
+        """
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+        self.counts[phase] = self.counts.get(phase, 0) + 1
+
+    def capture_statements(self, limit: int) -> None:
+        """
+        Start keeping the text of executed SQL statements.
+
+        Args:
+            limit: Maximum number of statements to keep
+        """
+        self.statements = []
+        self.max_statements = limit
+
+    def add_statement(self, statement: str, seconds: float) -> None:
+        """
+        Record a SQL statement: pass it to statement_observer, and keep it if
+        statement capture is on and not full.
+
+        Args:
+            statement: SQL text (without parameters)
+            seconds: Execution time
+        """
+        if self.statement_observer is not None:
+            self.statement_observer(statement, seconds)
+        if self.statements is not None and len(self.statements) < self.max_statements:
+            self.statements.append((statement, seconds))
+
+    def server_timing(self, total: Optional[float] = None) -> str:
+        """
+        Format the timings as a Server-Timing header value.
+
+        Args:
+            total: Optional overall duration in seconds, reported as "total"
+
+        Returns:
+            Header value such as "auth;dur=3.1, db;dur=12.0"
+        """
+        entries = [f"{phase};dur={seconds * 1000:.1f}" for phase, seconds in self.phases.items()]
+        if total is not None:
+            entries.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(entries)
+
+
+# Timings of the request being handled; None outside of timed requests
+_request_timings: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "request_timings",
+    default=None
+)
+
+
+def start_request_timings() -> Token:
+    """
+    Start collecting timings for the current request.
+
+    Returns:
+        Token to pass to end_request_timings()
+    """
+    return _request_timings.set(RequestTimings())
+
+
+def end_request_timings(token: Token) -> None:
+    """
+    Stop collecting timings for the current request.
+
+    Args:
+        token: Token returned by start_request_timings()
+    """
+    _request_timings.reset(token)
+
+
+def get_request_timings() -> Optional[RequestTimings]:
+    """
+    Get the timings of the current request.
+
+    Returns:
+        RequestTimings, or None outside of a timed request
+    """
+    return _request_timings.get()
+
+
+def add_timing(phase: str, seconds: float) -> None:
+    """
+    Record an already measured duration for the current request.
+
+    Args:
+        phase: Phase name
+        seconds: Duration in seconds
+    """
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.add(phase, seconds)
+
+
+@contextmanager
+def record_timing(phase: str) -> Iterator[None]:
+    """
+    Time a block of code as a phase of the current request.
+
+    Works around awaits; exceptions are timed too and propagate unchanged.
+
+    Args:
+        phase: Phase name
+
+    Example:
+        with record_timing("auth"):
+            user = await validate(token)
+    """
+    timings = _request_timings.get()
+    if timings is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - start)
+
+
+def timed(phase: str) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    Decorate a coroutine function so each call is timed as a request phase.
+
+    Args:
+        phase: Phase name
+
+    Returns:
+        Decorator preserving the function's signature
+    """
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            with record_timing(phase):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
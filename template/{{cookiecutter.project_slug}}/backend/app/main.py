@@ -5,7 +5,8 @@ This module initializes the FastAPI application with middleware,
 routers, and error handlers.
 """
 
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from typing import AsyncGenerator
 
 from fastapi import FastAPI, Request, status
@@ -15,10 +16,17 @@ from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from app.core.config import settings
-from app.api.routers import health, test_auth, auth, oauth, todos
+from app.api.routers import health, test_auth, auth, oauth, todos, admin
+from app.middleware.drain import RequestDrainMiddleware
+from app.middleware.profiling import ProfilerMiddleware
+from app.middleware.server_timing import ServerTimingMiddleware
+from app.middleware.slow_requests import SlowRequestMiddleware
 from app.middleware.tenant import TenantResolutionMiddleware
+from app.services.health_monitor import get_health_monitor
+from app.services.shutdown import close_clients, get_request_tracker
+from app.services.warmup import warm_up
 {% if cookiecutter.include_observability == "yes" %}
-from app.observability import setup_observability
+from app.observability import EventLoopLagMonitor, flush_telemetry, setup_observability
 {% endif %}
 {% if cookiecutter.include_sentry == "yes" %}
 from app.sentry import init_sentry
@@ -43,12 +51,55 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     print(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
     print(f"Debug mode: {settings.DEBUG}")
     print(f"API prefix: {settings.API_V1_PREFIX}")
+{% if cookiecutter.include_observability == "yes" %}
+    # Measure event loop lag; in debug mode also log slow asyncio callbacks
+    lag_monitor = EventLoopLagMonitor(
+        interval=settings.EVENT_LOOP_LAG_INTERVAL_MS / 1000,
+        slow_callback_duration=(
+            settings.EVENT_LOOP_SLOW_CALLBACK_MS / 1000 if settings.DEBUG else None
+        ),
+    )
+    lag_monitor.start()
+{% endif %}
+    # Check dependencies in the background for the readiness probe
+    health_monitor = get_health_monitor()
+    if settings.READINESS_CHECK_INTERVAL_SECONDS > 0:
+        health_monitor.start()
+
+    # Open pools and prefetch OIDC metadata; /ready fails until this finishes
+    warmup_task = None
+    if settings.WARMUP_ENABLED:
+        health_monitor.warming_up = True
+        warmup_task = asyncio.create_task(warm_up(health_monitor), name="warm-up")
 
     yield
 
     # Shutdown
     print(f"Shutting down {settings.APP_NAME}")
 
+    # Refuse new requests and let in-flight ones finish
+    request_tracker = get_request_tracker()
+    await request_tracker.drain(settings.SHUTDOWN_DRAIN_TIMEOUT_SECONDS)
+
+    # Stop background tasks before the pools they use are closed
+    if warmup_task is not None:
+        warmup_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await warmup_task
+    await health_monitor.stop()
+{%- if cookiecutter.include_observability == "yes" %}
+    await lag_monitor.stop()
+
+    # Export the spans of the drained requests while the network is up
+    flush_telemetry()
+{%- endif %}
+
+    await close_clients()
+
+    # The server delivers no more requests; accept them again should the
+    # application be started anew in this process (as test clients do)
+    request_tracker.accept_requests()
+
 
 # Initialize FastAPI application
 app = FastAPI(
@@ -136,6 +187,30 @@ app.add_middleware(
 # Extracts tenant_id from authenticated requests and sets context
 app.add_middleware(TenantResolutionMiddleware)
 
+# Profiler Middleware
+# Attributes sampling profiler samples to routes while a profile is running
+if settings.PROFILER_ENABLED:
+    app.add_middleware(ProfilerMiddleware)
+
+# Slow Request Middleware
+# Records diagnostics of slow requests for GET /admin/slow-requests
+if settings.SLOW_REQUEST_THRESHOLD_MS > 0:
+    app.add_middleware(
+        SlowRequestMiddleware,
+        threshold_ms=settings.SLOW_REQUEST_THRESHOLD_MS,
+    )
+
+# Server-Timing Middleware
+# Added last among the request middleware so its timing context covers
+# tenant resolution and every dependency
+if settings.SERVER_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+
+# Request Drain Middleware
+# Outermost, so in-flight requests are counted until fully sent; refuses new
+# requests once graceful shutdown has started
+app.add_middleware(RequestDrainMiddleware)
+
 
 # Exception handlers
 @app.exception_handler(StarletteHTTPException)
@@ -221,6 +296,7 @@ app.include_router(auth.router, prefix=settings.API_V1_PREFIX)
 app.include_router(oauth.router, prefix=settings.API_V1_PREFIX)
 app.include_router(todos.router, prefix=settings.API_V1_PREFIX)
 app.include_router(test_auth.router, prefix=settings.API_V1_PREFIX)
+app.include_router(admin.router, prefix=settings.API_V1_PREFIX)
 
 
 # Root endpoint
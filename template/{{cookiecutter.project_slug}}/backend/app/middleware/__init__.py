@@ -5,11 +5,19 @@ This package contains middleware components for cross-cutting concerns
 such as tenant resolution, authentication, logging, metrics, and security.
 """
 
+from app.middleware.drain import RequestDrainMiddleware
+from app.middleware.profiling import ProfilerMiddleware
 from app.middleware.security import SecurityHeadersConfig, SecurityHeadersMiddleware
+from app.middleware.server_timing import ServerTimingMiddleware
+from app.middleware.slow_requests import SlowRequestMiddleware
 from app.middleware.tenant import TenantResolutionMiddleware
 
 __all__ = [
+    "ProfilerMiddleware",
+    "RequestDrainMiddleware",
     "SecurityHeadersConfig",
     "SecurityHeadersMiddleware",
+    "ServerTimingMiddleware",
+    "SlowRequestMiddleware",
     "TenantResolutionMiddleware",
 ]
@@ -0,0 +1,67 @@
+"""
+Request Drain Middleware for FastAPI.
+
+Tracks in-flight HTTP requests for the graceful shutdown in the application
+lifespan (see app.services.shutdown). Once shutdown has started, new requests
+are refused with 503 and "Connection: close", so clients and load balancers
+retry on another instance while the requests already running complete.
+"""
+
+from typing import Optional
+
+from fastapi import status
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.services.shutdown import RequestTracker, get_request_tracker
+
+
+class RequestDrainMiddleware:
+    """
+    Pure ASGI middleware that counts in-flight requests.
+
+    Should wrap all other middleware, so a request counts as finished only
+    once its response has been sent completely.
+
+    Example:
+        >>> # In main.py
+        >>> app.add_middleware(RequestDrainMiddleware)
+    """
+
+    def __init__(self, app: ASGIApp, tracker: Optional[RequestTracker] = None) -> None:
+        """
+        Initialize the middleware.
+
+        Args:
+            app: The ASGI application
+            tracker: Request tracker (default: global request tracker)
+        """
+        self.app = app
+        self.tracker = tracker or get_request_tracker()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Count the request, or refuse it while shutting down."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self.tracker.draining:
+            response = JSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={
+                    "error": {
+                        "code": 503,
+                        "message": "Service is shutting down",
+                        "type": "shutting_down",
+                    }
+                },
+                headers={"Connection": "close", "Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+
+        self.tracker.request_started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.tracker.request_finished()
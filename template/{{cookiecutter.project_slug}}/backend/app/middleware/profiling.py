@@ -0,0 +1,54 @@
+"""
+Route attribution middleware for the sampling profiler.
+
+While a profile is running, this middleware registers each request's ASGI
+call frame with the profiler, so samples taken inside the request are
+attributed to its route template (see app.services.profiler). When no
+profile is running it only checks a flag and passes the request through.
+
+Requests that were already in flight when a profile started are not
+attributed; their samples appear under the thread that executed them.
+"""
+
+import sys
+from typing import Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.services.profiler import SamplingProfiler, get_profiler
+
+
+class ProfilerMiddleware:
+    """
+    Pure ASGI middleware that attributes profiler samples to routes.
+
+    Example:
+        >>> # In main.py
+        >>> if settings.PROFILER_ENABLED:
+        ...     app.add_middleware(ProfilerMiddleware)
+    """
+
+    def __init__(self, app: ASGIApp, profiler: Optional[SamplingProfiler] = None) -> None:
+        """
+        Initialize the middleware.
+
+        Args:
+            app: The ASGI application
+            profiler: Profiler to register requests with (default: global profiler)
+        """
+        self.app = app
+        self.profiler = profiler or get_profiler()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Register the request with the profiler while one is running."""
+        if scope["type"] != "http" or not self.profiler.running:
+            await self.app(scope, receive, send)
+            return
+
+        # Sampled stacks of this request pass through this frame
+        frame = sys._getframe()
+        self.profiler.track(frame, scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.profiler.untrack(frame)
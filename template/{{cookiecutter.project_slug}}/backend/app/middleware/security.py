@@ -13,6 +13,12 @@ Key Features:
 - Permissions-Policy for feature restrictions
 - X-XSS-Protection for legacy browser protection
 
+The middleware is implemented as pure ASGI rather than on Starlette's
+BaseHTTPMiddleware: it appends pre-encoded header byte pairs to the
+http.response.start message, so responses (including streaming ones) pass
+through without the extra task and memory stream BaseHTTPMiddleware adds
+to every request.
+
 References:
 - OWASP Secure Headers: https://owasp.org/www-project-secure-headers/
 - MDN Security Headers: https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers
@@ -21,14 +27,15 @@ References:
 
 import logging
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import FrozenSet, List, Optional, Tuple
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
+# ASGI header list: (lowercase name, value) byte pairs
+HeaderList = List[Tuple[bytes, bytes]]
+
 
 @dataclass
 class SecurityHeadersConfig:
@@ -107,7 +114,7 @@ class SecurityHeadersConfig:
     x_xss_protection: Optional[str] = "1; mode=block"
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+class SecurityHeadersMiddleware:
     """
     Middleware to add security headers to all HTTP responses.
 
@@ -115,9 +122,11 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     mitigate common web vulnerabilities including XSS, clickjacking, and
     MIME sniffing attacks.
 
-    The middleware pre-computes static headers at initialization time to
-    minimize per-request overhead. Only HSTS requires per-request evaluation
-    to check if the request is over HTTPS.
+    All header values are built and encoded once at initialization time. Per
+    request, the middleware only wraps ``send`` and extends the header list of
+    the ``http.response.start`` message; the response body is never buffered.
+    Only HSTS requires per-request evaluation to check if the request is over
+    HTTPS.
 
     Example:
         >>> from app.middleware.security import SecurityHeadersMiddleware, SecurityHeadersConfig
@@ -137,11 +146,15 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         HSTS header is only added for HTTPS requests to avoid browser issues
         when accessing the site over HTTP during development.
 
+        Headers of the same name set by the route handler are replaced, so
+        each security header appears exactly once in the response.
+
     Attributes:
+        app: The wrapped ASGI application.
         config: The security headers configuration.
     """
 
-    def __init__(self, app, config: Optional[SecurityHeadersConfig] = None) -> None:
+    def __init__(self, app: ASGIApp, config: Optional[SecurityHeadersConfig] = None) -> None:
         """
         Initialize the security headers middleware.
 
@@ -149,13 +162,29 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
             app: The ASGI application.
             config: Security headers configuration. If None, uses defaults.
         """
-        super().__init__(app)
+        self.app = app
         self.config = config or SecurityHeadersConfig()
 
         # Pre-compute headers at initialization for performance
         self._csp_header = self._build_csp_header()
         self._hsts_header = self._build_hsts_header()
 
+        # Pre-encode the ASGI header pairs sent with every response
+        self._http_headers = self._build_header_list()
+        self._https_headers = list(self._http_headers)
+        if self._hsts_header:
+            self._https_headers.append(
+                (b"strict-transport-security", self._hsts_header.encode("latin-1"))
+            )
+        # Names replaced in handler responses, per scheme: a handler's own
+        # Strict-Transport-Security header is kept on plain HTTP responses
+        self._http_header_names: FrozenSet[bytes] = frozenset(
+            name for name, _ in self._http_headers
+        )
+        self._https_header_names: FrozenSet[bytes] = frozenset(
+            name for name, _ in self._https_headers
+        )
+
         logger.info(
             "SecurityHeadersMiddleware initialized with CSP=%s, HSTS=%s",
             "enabled" if self.config.csp_enabled else "disabled",
@@ -226,61 +255,75 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
 
         return "; ".join(parts)
 
-    async def dispatch(self, request: Request, call_next) -> Response:
+    def _build_header_list(self) -> HeaderList:
         """
-        Process request and add security headers to response.
-
-        This method is called for every request. It processes the request
-        through the application and then adds security headers to the
-        response before returning it.
+        Build the encoded headers added to every response.
 
-        Args:
-            request: Incoming HTTP request.
-            call_next: Next middleware or handler in chain.
+        HSTS is excluded because it depends on the request scheme.
 
         Returns:
-            Response with security headers added.
+            List of (lowercase name, value) byte pairs in ASGI format.
         """
-        # Process the request first
-        response = await call_next(request)
-
-        # Add Content-Security-Policy
-        if self._csp_header:
-            response.headers["Content-Security-Policy"] = self._csp_header
-
-        # Add Strict-Transport-Security (only for HTTPS requests)
-        if self._hsts_header and self._is_https_request(request):
-            response.headers["Strict-Transport-Security"] = self._hsts_header
-
-        # Add X-Frame-Options
-        if self.config.x_frame_options:
-            response.headers["X-Frame-Options"] = self.config.x_frame_options
-
-        # Add X-Content-Type-Options
-        if self.config.x_content_type_options:
-            response.headers["X-Content-Type-Options"] = self.config.x_content_type_options
-
-        # Add Referrer-Policy
-        if self.config.referrer_policy:
-            response.headers["Referrer-Policy"] = self.config.referrer_policy
+        headers = [
+            ("content-security-policy", self._csp_header),
+            ("x-frame-options", self.config.x_frame_options),
+            ("x-content-type-options", self.config.x_content_type_options),
+            ("referrer-policy", self.config.referrer_policy),
+            ("permissions-policy", self.config.permissions_policy),
+            ("x-xss-protection", self.config.x_xss_protection),
+        ]
+        return [
+            (name.encode("latin-1"), value.encode("latin-1"))
+            for name, value in headers
+            if value
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Process request and add security headers to response.
 
-        # Add Permissions-Policy
-        if self.config.permissions_policy:
-            response.headers["Permissions-Policy"] = self.config.permissions_policy
+        This method is called for every ASGI connection. Non-HTTP scopes
+        (websocket, lifespan) are passed through untouched. For HTTP requests,
+        the security headers are appended to the response start message as it
+        is sent.
 
-        # Add X-XSS-Protection (legacy)
-        if self.config.x_xss_protection:
-            response.headers["X-XSS-Protection"] = self.config.x_xss_protection
+        Args:
+            scope: ASGI connection scope.
+            receive: ASGI receive channel.
+            send: ASGI send channel.
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Add Strict-Transport-Security only for HTTPS requests
+        if self._hsts_header and self._is_https_request(scope):
+            security_headers = self._https_headers
+            header_names = self._https_header_names
+        else:
+            security_headers = self._http_headers
+            header_names = self._http_header_names
+
+        async def send_with_security_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = [
+                    (name, value)
+                    for name, value in message.get("headers", ())
+                    if name.lower() not in header_names
+                ]
+                headers.extend(security_headers)
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_security_headers)
 
         logger.debug(
             "Security headers added to response for %s %s",
-            request.method,
-            request.url.path,
+            scope["method"],
+            scope["path"],
         )
 
-        return response
-
-    def _is_https_request(self, request: Request) -> bool:
+    def _is_https_request(self, scope: Scope) -> bool:
         """
         Determine if request was made over HTTPS.
 
@@ -289,23 +332,23 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         for proper HSTS handling behind reverse proxies.
 
         Args:
-            request: HTTP request.
+            scope: ASGI HTTP connection scope.
 
         Returns:
             True if request is HTTPS, False otherwise.
         """
         # Check URL scheme directly
-        if request.url.scheme == "https":
+        if scope.get("scheme") == "https":
             return True
 
-        # Check X-Forwarded-Proto header (set by reverse proxies like nginx, traefik)
-        forwarded_proto = request.headers.get("X-Forwarded-Proto", "")
-        if forwarded_proto.lower() == "https":
-            return True
-
-        # Check Forwarded header (standard RFC 7239)
-        forwarded = request.headers.get("Forwarded", "")
-        if "proto=https" in forwarded.lower():
-            return True
+        for name, value in scope.get("headers", ()):
+            # Check X-Forwarded-Proto header (set by reverse proxies like nginx, traefik)
+            if name == b"x-forwarded-proto":
+                if value.lower() == b"https":
+                    return True
+            # Check Forwarded header (standard RFC 7239)
+            elif name == b"forwarded":
+                if b"proto=https" in value.lower():
+                    return True
 
         return False
@@ -0,0 +1,82 @@
+"""
+Server-Timing Middleware for FastAPI.
+
+Collects per-phase durations recorded through app.core.timing (auth, jwks,
+tenant, tenant_context, db, db_pool, ...) and reports them on every
+response as a Server-Timing header, which browser dev tools display in the
+request's timing tab:
+
+    Server-Timing: auth;dur=4.2, jwks;dur=0.3, tenant;dur=1.1, db;dur=7.9, total;dur=15.0
+
+"total" is the time until the response headers were sent.
+{%- if cookiecutter.include_observability == "yes" %}
+The same values are added to the request's trace span as
+server_timing.<phase>_ms attributes.
+{%- endif %}
+
+The header reveals internal timing, so it is enabled per environment with
+SERVER_TIMING_ENABLED.
+"""
+
+import time
+
+{% if cookiecutter.include_observability == "yes" -%}
+from opentelemetry import trace
+{% endif -%}
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.timing import end_request_timings, get_request_timings, start_request_timings
+
+
+class ServerTimingMiddleware:
+    """
+    Pure ASGI middleware that reports request phase timings.
+
+    The timing context is created before the request reaches the routers, so
+    it must wrap every middleware and dependency whose phases should be
+    reported.
+
+    Example:
+        >>> # In main.py
+        >>> if settings.SERVER_TIMING_ENABLED:
+        ...     app.add_middleware(ServerTimingMiddleware)
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """
+        Initialize the middleware.
+
+        Args:
+            app: The ASGI application
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Collect timings for the request and add the Server-Timing header."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = start_request_timings()
+        timings = get_request_timings()
+        start = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                header = timings.server_timing(total=time.perf_counter() - start)
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"server-timing", header.encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+{%- if cookiecutter.include_observability == "yes" %}
+            span = trace.get_current_span()
+            if span.is_recording():
+                for phase, seconds in timings.phases.items():
+                    span.set_attribute(f"server_timing.{phase}_ms", round(seconds * 1000, 3))
+{%- endif %}
+            end_request_timings(token)
@@ -0,0 +1,167 @@
+"""
+Slow Request Capture Middleware for FastAPI.
+
+Records requests slower than a threshold in the slow request log (see
+app.services.slow_requests), including per-phase timings and SQL statements
+from the request timing context and a snapshot of the request task's stack.
+
+The stack snapshot is taken by a timer that fires when the request crosses
+the threshold, so it shows where the still-running request was waiting
+(a query, a Redis call, an outbound HTTP request) rather than where it
+ended. The timer is cancelled for requests that finish in time; that and
+keeping the statement texts of the current request is the whole per-request
+cost.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.timing import end_request_timings, get_request_timings, start_request_timings
+from app.services.slow_requests import (
+    MAX_STACK_FRAMES,
+    MAX_STATEMENTS,
+    SlowRequest,
+    SlowRequestLog,
+    get_slow_request_log,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _snapshot_stack(task: asyncio.Task, snapshot: Dict[str, List[str]]) -> None:
+    """
+    Store the suspended task's innermost frames, outermost first.
+
+    Task.get_stack() only returns the outermost frame of a suspended task,
+    so the chain of awaited coroutines is followed instead.
+    """
+    frames = []
+    awaitable = task.get_coro()
+    while awaitable is not None:
+        frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None)
+        if frame is None:
+            break
+        frames.append(
+            f"{frame.f_code.co_filename}:{frame.f_lineno} in {frame.f_code.co_qualname}"
+        )
+        awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "gi_yieldfrom", None)
+    snapshot["stack"] = frames[-MAX_STACK_FRAMES:]
+
+
+class SlowRequestMiddleware:
+    """
+    Pure ASGI middleware that captures diagnostics for slow requests.
+
+    Reuses the request timing context when ServerTimingMiddleware has
+    already created one, otherwise creates its own.
+
+    Example:
+        >>> # In main.py
+        >>> if settings.SLOW_REQUEST_THRESHOLD_MS > 0:
+        ...     app.add_middleware(
+        ...         SlowRequestMiddleware,
+        ...         threshold_ms=settings.SLOW_REQUEST_THRESHOLD_MS,
+        ...     )
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        threshold_ms: float,
+        log: Optional[SlowRequestLog] = None,
+    ) -> None:
+        """
+        Initialize the middleware.
+
+        Args:
+            app: The ASGI application
+            threshold_ms: Requests taking at least this long are recorded
+            log: Log to record into (default: global slow request log)
+        """
+        self.app = app
+        self.threshold = threshold_ms / 1000
+        self.log = log or get_slow_request_log()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Time the request and record it if it was slow."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = get_request_timings()
+        token = None
+        if timings is None:
+            token = start_request_timings()
+            timings = get_request_timings()
+        timings.capture_statements(MAX_STATEMENTS)
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        snapshot: Dict[str, List[str]] = {}
+        timer = asyncio.get_running_loop().call_later(
+            self.threshold, _snapshot_stack, asyncio.current_task(), snapshot
+        )
+        started_at = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            timer.cancel()
+            duration = time.perf_counter() - start
+            if duration >= self.threshold:
+                self._record(scope, timings, started_at, duration, status_code, snapshot)
+            if token is not None:
+                end_request_timings(token)
+
+    def _record(
+        self,
+        scope: Scope,
+        timings,
+        started_at: datetime,
+        duration: float,
+        status_code: int,
+        snapshot: Dict[str, List[str]],
+    ) -> None:
+        """Build the slow request record and add it to the log."""
+        route = getattr(scope.get("route"), "path", None) or "unmatched"
+        tenant_id = scope.get("state", {}).get("tenant_id")
+        record = SlowRequest(
+            timestamp=started_at,
+            method=scope["method"],
+            route=route,
+            path=scope["path"],
+            status_code=status_code,
+            duration_ms=round(duration * 1000, 3),
+            tenant_id=str(tenant_id) if tenant_id is not None else None,
+            timings_ms={
+                phase: round(seconds * 1000, 3) for phase, seconds in timings.phases.items()
+            },
+            redis_calls=timings.counts.get("redis", 0),
+            statements=[
+                (statement, round(seconds * 1000, 3))
+                for statement, seconds in timings.statements or ()
+            ],
+            stack=snapshot.get("stack"),
+        )
+        self.log.add(record)
+        logger.warning(
+            "Slow request",
+            extra={
+                "method": record.method,
+                "route": route,
+                "status_code": status_code,
+                "duration_ms": record.duration_ms,
+                "tenant_id": record.tenant_id,
+            },
+        )
@@ -15,6 +15,11 @@ Key Features:
 - Skips public endpoints that don't require tenant context
 - Clears tenant context after request to prevent leakage
 - Handles missing/invalid tenant_id with appropriate error responses
+
+The middleware is pure ASGI rather than a BaseHTTPMiddleware subclass, so
+requests are not wrapped in an extra task and memory stream and streaming
+responses pass straight through. Tenant state is shared with downstream
+handlers via scope["state"], which backs request.state.
 """
 
 import logging
@@ -22,16 +27,16 @@ from typing import Set
 from uuid import UUID
 
 from fastapi import status
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
-from starlette.responses import JSONResponse, Response
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.context import clear_current_tenant, set_current_tenant
 
 logger = logging.getLogger(__name__)
 
 
-class TenantResolutionMiddleware(BaseHTTPMiddleware):
+class TenantResolutionMiddleware:
     """
     Middleware to resolve tenant from authenticated requests.
 
@@ -75,11 +80,24 @@ class TenantResolutionMiddleware(BaseHTTPMiddleware):
         "/api/v1/oauth/logout",
     }
 
-    async def dispatch(self, request: Request, call_next) -> Response:
+    # Path prefixes for static files and framework assets
+    STATIC_PREFIXES = ("/static/", "/_next/")
+
+    def __init__(self, app: ASGIApp) -> None:
+        """
+        Initialize the tenant resolution middleware.
+
+        Args:
+            app: The ASGI application.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Process request and resolve tenant context.
 
-        This method is called for every request. It performs the following steps:
+        This method is called for every ASGI connection. For HTTP requests it
+        performs the following steps:
         1. Check if path is public (skip tenant resolution)
         2. Extract tenant_id from request.state.user (set by OAuth dependency)
         3. Validate tenant_id format
@@ -87,12 +105,12 @@ class TenantResolutionMiddleware(BaseHTTPMiddleware):
         5. Call downstream handlers
         6. Clear tenant context in finally block
 
-        Args:
-            request: Incoming HTTP request
-            call_next: Next middleware or handler in chain
+        Non-HTTP scopes (websocket, lifespan) are passed through untouched.
 
-        Returns:
-            Response from downstream handler or error response
+        Args:
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
 
         Note:
             This middleware runs BEFORE route handlers execute, but AFTER
@@ -100,23 +118,36 @@ class TenantResolutionMiddleware(BaseHTTPMiddleware):
             route handler execution, so request.state.user may not be set yet
             for some requests. We handle this gracefully by checking if the
             user is authenticated.
+
+            Unexpected errors are answered with a 500 JSON response only if the
+            response has not started yet; otherwise they propagate to the server.
         """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+
         # Skip tenant resolution for public paths
-        if request.url.path in self.PUBLIC_PATHS:
-            logger.debug(
-                f"Tenant resolution skipped for public endpoint: {request.url.path}"
-            )
-            return await call_next(request)
+        if path in self.PUBLIC_PATHS:
+            logger.debug("Tenant resolution skipped for public endpoint: %s", path)
+            await self.app(scope, receive, send)
+            return
 
         # Skip for static files and framework paths
-        if (
-            request.url.path.startswith("/static/")
-            or request.url.path.startswith("/_next/")
-        ):
-            logger.debug(
-                f"Tenant resolution skipped for static files: {request.url.path}"
-            )
-            return await call_next(request)
+        if path.startswith(self.STATIC_PREFIXES):
+            logger.debug("Tenant resolution skipped for static files: %s", path)
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        response_started = False
+
+        async def send_tracking_start(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
 
         try:
             # Extract tenant_id from OAuth token
@@ -137,12 +168,15 @@ class TenantResolutionMiddleware(BaseHTTPMiddleware):
                 # return 401. If it doesn't require authentication, no tenant context
                 # is needed.
                 logger.debug(
-                    f"Tenant ID not available for {request.method} {request.url.path} - "
-                    "user not authenticated or missing tenant"
+                    "Tenant ID not available for %s %s - "
+                    "user not authenticated or missing tenant",
+                    scope["method"],
+                    path,
                 )
                 # Continue without setting tenant context
                 # If the endpoint requires it, downstream handlers will fail
-                return await call_next(request)
+                await self.app(scope, receive, send_tracking_start)
+                return
 
             # Store tenant_id in request state for downstream handlers
             request.state.tenant_id = tenant_id
@@ -151,21 +185,25 @@ class TenantResolutionMiddleware(BaseHTTPMiddleware):
             set_current_tenant(tenant_id)
 
             logger.info(
-                f"Tenant resolved: {tenant_id} for {request.method} {request.url.path}"
+                "Tenant resolved: %s for %s %s", tenant_id, scope["method"], path
             )
 
             # Call downstream handlers with tenant context set
-            response = await call_next(request)
-
-            return response
+            await self.app(scope, receive, send_tracking_start)
 
         except Exception as e:
             # Catch any unexpected errors during tenant resolution
             logger.error(
-                f"Tenant resolution failed for {request.method} {request.url.path}: "
-                f"{type(e).__name__}: {e}"
+                "Tenant resolution failed for %s %s: %s: %s",
+                scope["method"],
+                path,
+                type(e).__name__,
+                e,
             )
-            return JSONResponse(
+            if response_started:
+                # Headers are already on the wire; nothing sensible to send
+                raise
+            response = JSONResponse(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 content={
                     "error": {
@@ -175,6 +213,7 @@ class TenantResolutionMiddleware(BaseHTTPMiddleware):
                     }
                 },
             )
+            await response(scope, receive, send)
 
         finally:
             # CRITICAL: Always clear tenant context after request completes
@@ -210,7 +249,8 @@ class TenantResolutionMiddleware(BaseHTTPMiddleware):
             # - Public endpoint (filtered above, but could be new endpoint)
             # - Unauthenticated request to protected endpoint (OAuth dependency will handle)
             logger.debug(
-                f"User not authenticated for {request.url.path} - request.state.user not set"
+                "User not authenticated for %s - request.state.user not set",
+                request.url.path,
             )
             return None
 
@@ -11,10 +11,19 @@ This module configures comprehensive observability for the FastAPI application:
 2. **Prometheus Metrics**
    - HTTP request counters (method, endpoint, status)
    - Request duration histograms
+   - Endpoint labels are route templates with a cardinality guard
    - Active request gauges
-   - Exposed at /metrics endpoint for Prometheus scraping
+   - Database connection pool occupancy, checkout wait and connect latency
+   - Per-request SQL query count and database time by route, N+1 detection
+   - Event loop lag, with asyncio slow-callback logging in debug mode
+   - Exposed at /metrics endpoint for Prometheus scraping, in OpenMetrics
+     format when requested so exemplars link latency buckets to traces
+   - Multiprocess mode aggregates all uvicorn workers at scrape time
 
 3. **Structured Logging**
+   - JSON lines (orjson) or text, written by a background thread from a
+     bounded queue; records dropped when it is full are counted
+   - Per-logger sampling of high-volume INFO records
    - Trace context correlation (trace_id, span_id)
    - Test mode support for clean pytest output
 
@@ -22,6 +31,8 @@ Environment Variables:
     OTEL_SERVICE_NAME: Service name for traces (default: "backend")
     OTEL_EXPORTER_OTLP_ENDPOINT: Tempo OTLP endpoint (default: "http://tempo:4317")
     TESTING: Set to "true" to disable trace context in logs
+    PROMETHEUS_MULTIPROC_DIR: Directory for shared metric files when running
+        multiple workers; must be empty at startup (set before Python starts)
 
 Usage:
     from app.observability import setup_observability
@@ -33,18 +44,43 @@ Architecture Notes:
     - Uses fail-open pattern: If Tempo is unavailable, traces are dropped silently
       without affecting application availability (NFR-RL-001)
     - Health endpoint (/api/v1/health) is excluded from tracing to reduce noise (OQ-005)
-    - Metrics middleware runs on every request for accurate instrumentation
+    - Metrics middleware is raw ASGI and runs on every request for accurate
+      instrumentation
     - BatchSpanProcessor handles export asynchronously to avoid blocking requests
+    - In multiprocess mode each worker writes its samples to mmap'd files in
+      PROMETHEUS_MULTIPROC_DIR and /metrics aggregates every worker's files,
+      so a scrape reflects the whole server rather than one random worker
 """
 
+import asyncio
+import atexit
+import copy
+import glob
 import logging
 import os
-from typing import Callable, Awaitable
-
+import queue
+import random
+import re
+import threading
+import time
+from collections import Counter as StatementCounter
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+import orjson
 from fastapi import FastAPI, Request, Response
 from opentelemetry import trace
-from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor, TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace.sampling import (
+    Decision,
+    ParentBased,
+    Sampler,
+    SamplingResult,
+    StaticSampler,
+    TraceIdRatioBased,
+)
 from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
 from opentelemetry.sdk.resources import Resource, SERVICE_NAME
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
@@ -52,7 +88,22 @@ from opentelemetry.propagate import set_global_textmap
 from opentelemetry.propagators.composite import CompositePropagator
 from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
 from opentelemetry.baggage.propagation import W3CBaggagePropagator
-from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
+from opentelemetry.trace import Link, SpanContext, SpanKind, StatusCode, TraceFlags
+from opentelemetry.util.types import Attributes
+from prometheus_client import REGISTRY, Counter, Histogram, Gauge
+from prometheus_client.exposition import choose_encoder
+from prometheus_client.core import GaugeMetricFamily, Metric
+from prometheus_client.multiprocess import MultiProcessCollector, mark_process_dead
+from prometheus_client.registry import Collector, CollectorRegistry
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.database import POOL_CHECKOUT_WAIT, engine, replica_engines
+from app.core.timing import end_request_timings, get_request_timings, start_request_timings
 
 
 # =============================================================================
@@ -67,6 +118,11 @@ SERVICE_NAME_VAL = os.getenv("OTEL_SERVICE_NAME", "backend")
 # Default points to Tempo service in Docker Compose network
 OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://tempo:4317")
 
+# Shared metric directory for multi-worker deployments (uvicorn --workers N)
+# prometheus_client reads this variable when it is imported, so it must be set
+# in the process environment, not in .env
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
 # Endpoints to exclude from tracing (OQ-005)
 # Health checks are frequent and add noise without value
 EXCLUDED_TRACE_ENDPOINTS = frozenset({
@@ -104,12 +160,146 @@ class TraceContextFilter(logging.Filter):
         return True
 
 
+# Counter: Log records that were not written
+# - reason: queue_full (the writer thread fell behind) or sampled (INFO
+#   sampling via LOG_INFO_SAMPLE_RATES)
+log_records_dropped_total = Counter(
+    name="log_records_dropped_total",
+    documentation="Log records discarded before being written",
+    labelnames=["reason"]
+)
+
+# LogRecord attributes that are not user-supplied extra={} fields
+_LOG_RECORD_FIELDS = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", (), None))
+) | {"message", "asctime", "otelTraceID", "otelSpanID"}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format log records as one JSON object per line.
+
+    Fields: timestamp, level, logger, message, trace_id and span_id (when a
+    span is active), exception (when present) and every extra={} field.
+    Encoding uses orjson, which serializes UUIDs and datetimes natively and
+    is several times faster than the standard json module; other values fall
+    back to str().
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Serialize the record to a JSON string."""
+        payload: Dict[str, Any] = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        trace_id = getattr(record, "otelTraceID", "")
+        if trace_id:
+            payload["trace_id"] = trace_id
+            payload["span_id"] = record.otelSpanID
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exception"] = record.exc_text
+        for key, value in record.__dict__.items():
+            if key not in _LOG_RECORD_FIELDS and key not in payload:
+                payload[key] = value
+        return orjson.dumps(payload, default=str).decode()
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        """Format the record time as ISO 8601 UTC with milliseconds."""
+        seconds = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created))
+        return f"{seconds}.{int(record.msecs):03d}Z"
+
+
+class LogSamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of INFO records from selected loggers.
+
+    Per-request INFO lines from hot paths (tenant resolution, tenant context)
+    can dominate log volume. Rates apply to a logger and its children, the
+    most specific configured name wins. Records at WARNING and above, and
+    loggers without a rate, are never sampled.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        """
+        Initialize the filter.
+
+        Args:
+            rates: Logger name to fraction of INFO records to keep (0.0-1.0)
+        """
+        super().__init__()
+        self.rates = rates
+        self._rate_by_logger: Dict[str, Optional[float]] = {}
+
+    def _rate(self, name: str) -> Optional[float]:
+        """Resolve the sample rate for a logger name, caching the result."""
+        try:
+            return self._rate_by_logger[name]
+        except KeyError:
+            pass
+        rate = None
+        candidate = name
+        while candidate:
+            if candidate in self.rates:
+                rate = self.rates[candidate]
+                break
+            candidate = candidate.rpartition(".")[0]
+        self._rate_by_logger[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Return False for INFO records that are sampled out."""
+        if record.levelno != logging.INFO:
+            return True
+        rate = self._rate(record.name)
+        if rate is None or random.random() < rate:
+            return True
+        log_records_dropped_total.labels(reason="sampled").inc()
+        return False
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Queue handler that never blocks and counts records it has to drop.
+
+    Runs in the thread that logs. It captures what must be read there (the
+    message with its arguments, trace context, exception text) and hands the
+    record to a QueueListener thread that formats and writes it. When the
+    bounded queue is full the record is dropped instead of blocking the
+    event loop, and log_records_dropped_total is incremented.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Resolve the message and exception text before crossing threads."""
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Put the record on the queue, dropping it if the queue is full."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            log_records_dropped_total.labels(reason="queue_full").inc()
+
+
 def _configure_logging() -> None:
     """
     Configure structured logging with optional trace context.
 
-    In production mode, log format includes trace_id and span_id for
-    correlation with distributed traces in Grafana.
+    In production mode, records carry trace_id and span_id for correlation
+    with distributed traces in Grafana. Application threads only enqueue
+    records; a QueueListener thread formats them (JSON or text, per
+    LOG_FORMAT) and writes them to stderr, so a slow stdout/stderr pipe never
+    blocks the event loop.
 
     In test mode (TESTING=true), uses simplified format to avoid
     noise from empty trace context during pytest.
@@ -125,32 +315,213 @@ def _configure_logging() -> None:
             force=True
         )
     else:
-        # Production format with trace context for correlation
-        # Allows filtering logs by trace_id in Grafana/Loki
-        log_format = (
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s - "
-            "trace_id=%(otelTraceID)s span_id=%(otelSpanID)s"
-        )
-
-        # Create handler with filter that injects trace context
-        # The filter must be on the handler to ensure trace fields are
-        # injected before the formatter tries to use them
-        handler = logging.StreamHandler()
-        handler.setLevel(logging.INFO)
-        handler.setFormatter(logging.Formatter(log_format))
-        handler.addFilter(TraceContextFilter())
+        # Writer side: runs on the listener thread
+        stream_handler = logging.StreamHandler()
+        if settings.LOG_FORMAT == "json":
+            stream_handler.setFormatter(JsonFormatter())
+        else:
+            # Text format with trace context for correlation
+            # Allows filtering logs by trace_id in Grafana/Loki
+            stream_handler.setFormatter(logging.Formatter(
+                "%(asctime)s - %(name)s - %(levelname)s - %(message)s - "
+                "trace_id=%(otelTraceID)s span_id=%(otelSpanID)s"
+            ))
+
+        # Caller side: the trace context filter must run here, in the thread
+        # (and context) that logged, before the record is queued
+        queue_handler = NonBlockingQueueHandler(queue.Queue(settings.LOG_QUEUE_SIZE))
+        queue_handler.setLevel(logging.INFO)
+        if settings.LOG_INFO_SAMPLE_RATES:
+            queue_handler.addFilter(LogSamplingFilter(settings.LOG_INFO_SAMPLE_RATES))
+        queue_handler.addFilter(TraceContextFilter())
+
+        listener = QueueListener(queue_handler.queue, stream_handler)
+        listener.start()
+        # Flush queued records on interpreter exit
+        atexit.register(listener.stop)
 
         # Configure root logger
         root_logger = logging.getLogger()
         root_logger.setLevel(logging.INFO)
         # Remove any existing handlers and add our configured one
         root_logger.handlers.clear()
-        root_logger.addHandler(handler)
+        root_logger.addHandler(queue_handler)
 
 
 # Initialize logging configuration at module load
 _configure_logging()
 
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# Trace Sampling
+# =============================================================================
+
+# Sampler for spans that are recorded for tail sampling but not sampled yet
+RECORD_ONLY = StaticSampler(Decision.RECORD_ONLY)
+
+
+class RecordingTraceIdRatioSampler(TraceIdRatioBased):
+    """
+    Trace ID ratio sampler that records the traces it does not sample.
+
+    Traces that win the ratio draw are sampled as usual. The others are
+    created as RECORD_ONLY spans: they are not exported or propagated as
+    sampled, but TailSamplingSpanProcessor still sees them and can keep
+    the ones that turn out to be errors or slow.
+    """
+
+    def should_sample(
+        self,
+        parent_context: Optional[Context],
+        trace_id: int,
+        name: str,
+        kind: Optional[SpanKind] = None,
+        attributes: Attributes = None,
+        links: Optional[Sequence[Link]] = None,
+        trace_state: Any = None,
+    ) -> SamplingResult:
+        result = super().should_sample(
+            parent_context, trace_id, name, kind, attributes, links, trace_state
+        )
+        if result.decision is Decision.DROP:
+            return SamplingResult(Decision.RECORD_ONLY, attributes, result.trace_state)
+        return result
+
+    def get_description(self) -> str:
+        return f"RecordingTraceIdRatioSampler({self.rate})"
+
+
+def _create_sampler() -> Sampler:
+    """
+    Create the head sampler from settings.
+
+    Follows the caller's sampling decision when a traceparent is present,
+    otherwise samples TRACE_SAMPLE_RATIO of new traces. With tail sampling
+    enabled, unsampled traces are still recorded so TailSamplingSpanProcessor
+    can keep errors and slow requests.
+
+    Returns:
+        Parent-based ratio sampler
+    """
+    ratio = settings.TRACE_SAMPLE_RATIO
+
+    if not settings.TRACE_TAIL_SAMPLING_ENABLED:
+        return ParentBased(root=TraceIdRatioBased(ratio))
+
+    return ParentBased(
+        root=RecordingTraceIdRatioSampler(ratio),
+        remote_parent_not_sampled=RECORD_ONLY,
+        local_parent_not_sampled=RECORD_ONLY,
+    )
+
+
+def _as_sampled(span: ReadableSpan) -> ReadableSpan:
+    """Copy a recorded span with the sampled flag set, so exporters accept it."""
+    ctx = span.context
+    return ReadableSpan(
+        name=span.name,
+        context=SpanContext(
+            ctx.trace_id,
+            ctx.span_id,
+            ctx.is_remote,
+            TraceFlags(TraceFlags.SAMPLED),
+            ctx.trace_state,
+        ),
+        parent=span.parent,
+        resource=span.resource,
+        attributes=span.attributes,
+        events=span.events,
+        links=span.links,
+        kind=span.kind,
+        status=span.status,
+        start_time=span.start_time,
+        end_time=span.end_time,
+        instrumentation_scope=span.instrumentation_scope,
+    )
+
+
+class TailSamplingSpanProcessor(SpanProcessor):
+    """
+    Span processor that decides which unsampled traces to export once they end.
+
+    Sampled spans (traces that won the ratio draw or were sampled upstream)
+    go straight to the delegate processor. Spans of unsampled traces are
+    buffered per trace until the local root span (the request's server span)
+    ends; the whole trace is then exported if any span errored or the root
+    took at least the latency threshold, and discarded otherwise.
+
+    Buffers are bounded: at most max_traces traces are held (oldest dropped
+    first) and at most max_spans_per_trace spans per trace.
+    """
+
+    def __init__(
+        self,
+        delegate: SpanProcessor,
+        latency_threshold_ms: float,
+        max_traces: int = 2048,
+        max_spans_per_trace: int = 512,
+    ):
+        """
+        Initialize the processor.
+
+        Args:
+            delegate: Processor that exports kept spans (BatchSpanProcessor)
+            latency_threshold_ms: Keep traces whose root span took this long
+            max_traces: Maximum number of traces buffered at once
+            max_spans_per_trace: Maximum number of spans buffered per trace
+        """
+        self._delegate = delegate
+        self._latency_threshold_ns = int(latency_threshold_ms * 1_000_000)
+        self._max_traces = max_traces
+        self._max_spans_per_trace = max_spans_per_trace
+        self._traces: Dict[int, List[ReadableSpan]] = {}
+        self._lock = threading.Lock()
+
+    def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
+        self._delegate.on_start(span, parent_context=parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        ctx = span.context
+        if ctx.trace_flags.sampled:
+            self._delegate.on_end(span)
+            return
+
+        is_local_root = span.parent is None or span.parent.is_remote
+
+        with self._lock:
+            if not is_local_root:
+                spans = self._traces.get(ctx.trace_id)
+                if spans is None:
+                    if len(self._traces) >= self._max_traces:
+                        # Dicts keep insertion order: evict the oldest trace
+                        del self._traces[next(iter(self._traces))]
+                    spans = self._traces[ctx.trace_id] = []
+                if len(spans) < self._max_spans_per_trace:
+                    spans.append(span)
+                return
+            spans = self._traces.pop(ctx.trace_id, [])
+
+        spans.append(span)
+        if self._should_keep(span, spans):
+            for buffered in spans:
+                self._delegate.on_end(_as_sampled(buffered))
+
+    def _should_keep(self, root: ReadableSpan, spans: List[ReadableSpan]) -> bool:
+        """Keep traces with an error status on any span, or a slow root."""
+        if root.end_time - root.start_time >= self._latency_threshold_ns:
+            return True
+        return any(s.status.status_code is StatusCode.ERROR for s in spans)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._traces.clear()
+        self._delegate.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self._delegate.force_flush(timeout_millis)
+
 
 # =============================================================================
 # OpenTelemetry Tracing Setup
@@ -166,6 +537,9 @@ def _create_trace_provider() -> TracerProvider:
     Architecture:
         - Resource: Identifies this service in distributed traces
         - TracerProvider: Central manager for trace creation
+        - Sampler: Parent-based ratio sampling (TRACE_SAMPLE_RATIO)
+        - TailSamplingSpanProcessor: Keeps unsampled traces that errored or
+          exceeded TRACE_SLOW_THRESHOLD_MS (TRACE_TAIL_SAMPLING_ENABLED)
         - OTLPSpanExporter: Sends spans to Tempo via gRPC
         - BatchSpanProcessor: Batches spans for efficient export
 
@@ -182,7 +556,7 @@ def _create_trace_provider() -> TracerProvider:
     })
 
     # Create the tracer provider
-    provider = TracerProvider(resource=resource)
+    provider = TracerProvider(resource=resource, sampler=_create_sampler())
 
     # Configure OTLP exporter for Tempo
     # insecure=True: Use plain gRPC (no TLS) - appropriate for internal networks
@@ -195,7 +569,16 @@ def _create_trace_provider() -> TracerProvider:
     # - Batches spans to reduce network overhead
     # - Exports asynchronously (doesn't block request handling)
     # - Handles Tempo unavailability gracefully (drops spans if buffer full)
-    provider.add_span_processor(BatchSpanProcessor(trace_exporter))
+    span_processor: SpanProcessor = BatchSpanProcessor(trace_exporter)
+
+    # Tail sampling sits in front of the batch processor and forwards only
+    # the spans of traces worth keeping
+    if settings.TRACE_TAIL_SAMPLING_ENABLED:
+        span_processor = TailSamplingSpanProcessor(
+            span_processor,
+            latency_threshold_ms=settings.TRACE_SLOW_THRESHOLD_MS,
+        )
+    provider.add_span_processor(span_processor)
 
     return provider
 
@@ -221,7 +604,7 @@ set_global_textmap(CompositePropagator([
 # Counter: Total HTTP requests processed
 # Labels allow filtering/grouping in Grafana dashboards
 # - method: HTTP method (GET, POST, PUT, DELETE, etc.)
-# - endpoint: Request path (/api/v1/todos, /api/v1/health, etc.)
+# - endpoint: Route template (/api/v1/todos/{todo_id}), never the raw path
 # - status: HTTP status code (200, 404, 500, etc.)
 http_requests_total = Counter(
     name="http_requests_total",
@@ -242,12 +625,756 @@ http_request_duration_seconds = Histogram(
 # Gauge: Current number of in-flight requests
 # Useful for detecting request queuing and concurrency issues
 # No labels to keep this metric simple and fast
+# Multiprocess: summed over live workers (a dead worker has no requests in flight)
 active_requests = Gauge(
     name="active_requests",
-    documentation="Number of HTTP requests currently being processed"
+    documentation="Number of HTTP requests currently being processed",
+    multiprocess_mode="livesum"
+)
+
+# Counter: Database round trips avoided by lazy request sessions
+# Incremented when a request-scoped session is closed without ever touching
+# the database, by the number of statements the eager setup would have sent
+# (BEGIN, tenant validation, set_config, COMMIT).
+# - dependency: Session dependency name (get_tenant_db, get_tenant_read_db, ...)
+db_session_round_trips_saved_total = Counter(
+    name="db_session_round_trips_saved_total",
+    documentation="Database round trips avoided by request sessions that were never used",
+    labelnames=["dependency"]
+)
+
+
+# Histogram: Time spent waiting for a pooled database connection
+# Covers queueing for a free connection plus opening one when the pool grows.
+# Sustained waits mean pool_size is too small for the concurrency.
+# - pool: Engine name (primary, replica-0, ...)
+db_pool_checkout_wait_seconds = Histogram(
+    name="db_pool_checkout_wait_seconds",
+    documentation="Time spent waiting to check out a database connection",
+    labelnames=["pool"],
+    buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+
+# Histogram: Time to open a new database connection (TCP, TLS, auth)
+# - pool: Engine name (primary, replica-0, ...)
+db_pool_connect_seconds = Histogram(
+    name="db_pool_connect_seconds",
+    documentation="Time spent opening a new database connection",
+    labelnames=["pool"]
+)
+
+# Histogram: Age of database connections when they are closed
+# Short ages mean overflow connections churn; raise pool_size.
+# - pool: Engine name (primary, replica-0, ...)
+db_pool_connection_age_seconds = Histogram(
+    name="db_pool_connection_age_seconds",
+    documentation="Age of database connections at close",
+    labelnames=["pool"],
+    buckets=(1.0, 10.0, 60.0, 300.0, 900.0, 1800.0, 3600.0, 7200.0)
+)
+
+
+# Pool occupancy metrics: (name, help text), in _pool_occupancy() order
+POOL_OCCUPANCY_METRICS = (
+    ("db_pool_size", "Configured number of pooled database connections"),
+    ("db_pool_checked_out_connections", "Database connections currently in use"),
+    ("db_pool_overflow_connections", "Database connections open beyond pool_size"),
+    ("db_pool_idle_connections", "Open database connections waiting in the pool"),
 )
 
 
+def _pool_occupancy(pool: QueuePool, returning: bool = False) -> Tuple[int, int, int, int]:
+    """
+    Read size, checked-out, overflow and idle counts from a queue pool.
+
+    Args:
+        pool: Pool to read
+        returning: True when called from a checkin listener, which runs
+            before the connection is handed back; the counts are adjusted
+            to the state after the return
+
+    Returns:
+        (size, checked_out, overflow, idle)
+    """
+    size = pool.size()
+    checked_out = pool.checkedout()
+    # overflow() counts up from -pool_size until the pool is full
+    overflow = max(pool.overflow(), 0)
+    idle = pool.checkedin()
+
+    if returning:
+        checked_out -= 1
+        if idle < size:
+            idle += 1
+        else:
+            # No room in the pool: the overflow connection is closed
+            overflow = max(overflow - 1, 0)
+
+    return size, checked_out, overflow, idle
+
+
+class DatabasePoolCollector(Collector):
+    """
+    Prometheus collector for database pool occupancy.
+
+    Reads checked-out, overflow and idle counts from each engine's pool at
+    scrape time, so the request path pays nothing for these gauges. Pools
+    without in-process pooling (NullPool in PgBouncer mode) are skipped.
+
+    Only used in single-process mode; a custom collector sees the pool of
+    the worker serving the scrape, so multiprocess mode uses
+    _instrument_pool_occupancy() instead.
+    """
+
+    def __init__(self, engines: Dict[str, AsyncEngine]):
+        """
+        Initialize the collector.
+
+        Args:
+            engines: Engines to report, keyed by pool label
+        """
+        self.engines = engines
+
+    def collect(self) -> Iterator[Metric]:
+        """Yield pool gauges for the current scrape."""
+        families = [
+            GaugeMetricFamily(name, documentation, labels=["pool"])
+            for name, documentation in POOL_OCCUPANCY_METRICS
+        ]
+
+        for name, db_engine in self.engines.items():
+            pool = db_engine.pool
+            if not isinstance(pool, QueuePool):
+                continue
+            for family, value in zip(families, _pool_occupancy(pool), strict=True):
+                family.add_metric([name], value)
+
+        yield from families
+
+
+def _instrument_pool_occupancy(name: str, sync_engine: Engine) -> None:
+    """
+    Keep multiprocess pool occupancy gauges current from checkout/checkin events.
+
+    Each worker writes its own pool counts; the gauges use livesum mode so a
+    scrape reports the total across live workers. Costs four mmap writes per
+    checkout and checkin.
+
+    Args:
+        name: Pool label for the metrics
+        sync_engine: Synchronous engine behind the AsyncEngine
+    """
+    # registry=None: values live in PROMETHEUS_MULTIPROC_DIR, not in REGISTRY
+    gauges = [
+        Gauge(
+            metric_name,
+            documentation,
+            labelnames=["pool"],
+            registry=None,
+            multiprocess_mode="livesum",
+        ).labels(pool=name)
+        for metric_name, documentation in POOL_OCCUPANCY_METRICS
+    ]
+
+    def _update(pool: Any, returning: bool) -> None:
+        if isinstance(pool, QueuePool):
+            for gauge, value in zip(gauges, _pool_occupancy(pool, returning), strict=True):
+                gauge.set(value)
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_conn: Any, connection_record: Any, connection_proxy: Any) -> None:
+        _update(sync_engine.pool, returning=False)
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_conn: Any, connection_record: Any) -> None:
+        _update(sync_engine.pool, returning=True)
+
+
+def _instrument_pool_events(name: str, sync_engine: Engine) -> None:
+    """
+    Attach checkout, connect and close timing listeners to an engine's pool.
+
+    Listeners are registered on the engine, so they carry over to the new
+    pool created when the engine is disposed.
+
+    Args:
+        name: Pool label for the metrics
+        sync_engine: Synchronous engine behind the AsyncEngine
+    """
+    checkout_wait = db_pool_checkout_wait_seconds.labels(pool=name)
+    connect_latency = db_pool_connect_seconds.labels(pool=name)
+    connection_age = db_pool_connection_age_seconds.labels(pool=name)
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_conn: Any, connection_record: Any, connection_proxy: Any) -> None:
+        waited = connection_record.info.pop(POOL_CHECKOUT_WAIT, None)
+        if waited is not None:
+            checkout_wait.observe(waited)
+
+    @event.listens_for(sync_engine, "do_connect")
+    def _on_do_connect(dialect: Any, connection_record: Any, cargs: Any, cparams: Any) -> Any:
+        start = time.perf_counter()
+        dbapi_conn = dialect.connect(*cargs, **cparams)
+        connect_latency.observe(time.perf_counter() - start)
+        return dbapi_conn
+
+    @event.listens_for(sync_engine, "close")
+    def _on_close(dbapi_conn: Any, connection_record: Any) -> None:
+        connection_age.observe(time.time() - connection_record.starttime)
+
+
+_database_pools_instrumented = False
+
+
+def instrument_database_pools() -> None:
+    """
+    Export metrics for the primary and replica database connection pools.
+
+    Also attaches the per-request SQL statement timing listeners.
+
+    Safe to call more than once; pools are instrumented only the first time.
+    """
+    global _database_pools_instrumented
+
+    if _database_pools_instrumented:
+        return
+
+    engines = {"primary": engine}
+    engines.update({f"replica-{i}": replica for i, replica in enumerate(replica_engines)})
+
+    if PROMETHEUS_MULTIPROC_DIR:
+        for name, db_engine in engines.items():
+            _instrument_pool_occupancy(name, db_engine.sync_engine)
+    else:
+        REGISTRY.register(DatabasePoolCollector(engines))
+
+    for name, db_engine in engines.items():
+        _instrument_pool_events(name, db_engine.sync_engine)
+
+    _database_pools_instrumented = True
+
+
+# =============================================================================
+# Per-Request SQL Instrumentation
+# =============================================================================
+
+# Histogram: SQL statements executed per request
+# - endpoint: Route template (/api/v1/todos/{todo_id}), never the raw path
+db_queries_per_request = Histogram(
+    name="db_queries_per_request",
+    documentation="Number of SQL statements executed per HTTP request",
+    labelnames=["endpoint"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+)
+
+# Histogram: Total time spent in SQL statements per request
+# - endpoint: Route template
+db_time_per_request_seconds = Histogram(
+    name="db_time_per_request_seconds",
+    documentation="Total database time per HTTP request in seconds",
+    labelnames=["endpoint"]
+)
+
+# Histogram: Duration of the slowest SQL statement in each request
+# - endpoint: Route template
+db_slowest_query_seconds = Histogram(
+    name="db_slowest_query_seconds",
+    documentation="Duration of the slowest SQL statement per HTTP request in seconds",
+    labelnames=["endpoint"]
+)
+
+class QueryStats:
+    """
+    SQL statistics collected for a single request.
+
+    Fed by the statement timing listeners of app.core.database through the
+    request's RequestTimings (see RequestTimings.statement_observer). Statement
+    shapes are the SQL text SQLAlchemy sends to the driver, which
+    is already parameterized, so the same query with different bind values
+    counts as one shape.
+    """
+
+    __slots__ = ("count", "total_time", "slowest_time", "slowest_statement", "shapes")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.shapes: StatementCounter[str] = StatementCounter()
+
+    def record(self, statement: str, duration: float) -> None:
+        """Record one executed statement."""
+        self.count += 1
+        self.total_time += duration
+        self.shapes[statement] += 1
+        if duration > self.slowest_time:
+            self.slowest_time = duration
+            self.slowest_statement = statement
+
+
+def _route_template(scope: Dict[str, Any]) -> str:
+    """
+    Get the matched route template for a request, e.g. /api/v1/todos/{todo_id}.
+
+    Args:
+        scope: ASGI scope after routing
+
+    Returns:
+        Route path template, or "unmatched" if no route handled the request
+    """
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ENDPOINT
+
+
+def _report_query_stats(stats: QueryStats, endpoint: str, method: str) -> None:
+    """
+    Export a request's SQL statistics and log N+1 patterns.
+
+    Args:
+        stats: Statistics collected during the request
+        endpoint: Route template label
+        method: HTTP method (for the log record)
+    """
+    db_queries_per_request.labels(endpoint=endpoint).observe(stats.count)
+    if stats.count == 0:
+        return
+
+    db_time_per_request_seconds.labels(endpoint=endpoint).observe(stats.total_time)
+    db_slowest_query_seconds.labels(endpoint=endpoint).observe(stats.slowest_time)
+
+    statement, repeats = stats.shapes.most_common(1)[0]
+    if repeats > settings.SQL_N_PLUS_ONE_THRESHOLD:
+        logger.warning(
+            "Possible N+1 query pattern",
+            extra={
+                "endpoint": endpoint,
+                "method": method,
+                "statement": statement[:500],
+                "repeats": repeats,
+                "query_count": stats.count,
+                "db_time_ms": round(stats.total_time * 1000, 2),
+                "slowest_statement": (stats.slowest_statement or "")[:500],
+                "slowest_ms": round(stats.slowest_time * 1000, 2),
+            },
+        )
+
+
+# =============================================================================
+# HTTP Metrics Middleware
+# =============================================================================
+
+# Endpoint label for requests that matched no route (404s, scanners)
+UNMATCHED_ENDPOINT = "unmatched"
+
+# Endpoint label for route templates beyond the cardinality limit
+OVERFLOW_ENDPOINT = "overflow"
+
+# Method label values; anything else is reported as "OTHER"
+KNOWN_METHODS = frozenset({
+    "GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "TRACE", "CONNECT",
+})
+
+
+class EndpointLabelGuard:
+    """
+    Cardinality guard for the endpoint label.
+
+    Route templates are normally a small, fixed set, but mounted sub-apps or
+    routes registered at runtime can grow it without bound. Once max_endpoints
+    distinct templates have been seen, further templates are reported under
+    the "overflow" label and a warning is logged once.
+    """
+
+    def __init__(self, max_endpoints: int):
+        """
+        Initialize the guard.
+
+        Args:
+            max_endpoints: Maximum number of distinct endpoint label values
+        """
+        self.max_endpoints = max_endpoints
+        self._seen: Set[str] = set()
+        self._overflowed = False
+
+    def label(self, template: str) -> str:
+        """
+        Map a route template to the endpoint label value to export.
+
+        Args:
+            template: Matched route template, or "unmatched"
+
+        Returns:
+            The template itself, or "overflow" once the limit is reached
+        """
+        if template in self._seen or template == UNMATCHED_ENDPOINT:
+            return template
+
+        if len(self._seen) >= self.max_endpoints:
+            if not self._overflowed:
+                self._overflowed = True
+                logger.warning(
+                    "Endpoint label limit reached, reporting new routes as overflow",
+                    extra={"max_endpoints": self.max_endpoints, "endpoint": template},
+                )
+            return OVERFLOW_ENDPOINT
+
+        self._seen.add(template)
+        return template
+
+
+def _trace_exemplar(duration: float, status_code: int) -> Optional[Dict[str, str]]:
+    """
+    Build an OpenMetrics exemplar linking an observation to its trace.
+
+    The exemplar carries the trace_id of the current span, so Grafana can
+    jump from a latency bucket to a representative trace in Tempo. It is only
+    attached when the trace will actually be exported: the span was sampled
+    at the head, or tail sampling will keep it because the request was slow
+    or failed. Linking to traces that were dropped would lead nowhere.
+
+    Args:
+        duration: Request duration in seconds
+        status_code: HTTP status code of the response
+
+    Returns:
+        Exemplar labels, or None if there is no exported trace to link to
+    """
+    span = trace.get_current_span()
+    span_context = span.get_span_context()
+    if not span_context.is_valid or not span.is_recording():
+        return None
+
+    if not span_context.trace_flags.sampled:
+        kept_by_tail_sampling = settings.TRACE_TAIL_SAMPLING_ENABLED and (
+            duration * 1000 >= settings.TRACE_SLOW_THRESHOLD_MS
+            or status_code >= 500
+        )
+        if not kept_by_tail_sampling:
+            return None
+
+    return {"trace_id": trace.format_trace_id(span_context.trace_id)}
+
+
+class PrometheusMiddleware:
+    """
+    Raw ASGI middleware that collects HTTP metrics for every request.
+
+    This middleware wraps every HTTP request to collect:
+    - Active request count (gauge)
+    - Request duration (histogram)
+    - Request count by method, endpoint, status (counter)
+    - Per-request SQL statistics (see QueryStats)
+
+    Duration observations carry a trace_id exemplar when the request's trace
+    is exported (see _trace_exemplar). Exemplars are only exposed in the
+    OpenMetrics format and are not supported by prometheus_client in
+    multiprocess mode.
+
+    The endpoint label is the matched route template read from the scope
+    after routing, so /api/v1/todos/<uuid> is reported once as
+    /api/v1/todos/{todo_id}. Unrouted requests share the "unmatched" label,
+    and EndpointLabelGuard caps the number of distinct values.
+
+    Performance:
+        - Pure ASGI: no extra task or memory stream per request, streaming
+          responses pass through unbuffered
+        - Duration covers the full response, including streamed bodies
+        - Requests that raise before sending a response are counted as 500
+    """
+
+    def __init__(self, app: ASGIApp, max_endpoints: int = 500) -> None:
+        """
+        Initialize the metrics middleware.
+
+        Args:
+            app: The ASGI application
+            max_endpoints: Maximum number of distinct endpoint label values
+        """
+        self.app = app
+        self.endpoints = EndpointLabelGuard(max_endpoints)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Time the request and record metrics once the response is complete."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        # Collect SQL statistics for this request from its statement timings,
+        # starting request timings if no outer middleware did
+        query_stats = QueryStats()
+        timings = get_request_timings()
+        timings_token = None
+        if timings is None:
+            timings_token = start_request_timings()
+            timings = get_request_timings()
+        previous_observer = timings.statement_observer
+        timings.statement_observer = query_stats.record
+
+        active_requests.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - start
+            # Always decrement active requests, even on error
+            active_requests.dec()
+            timings.statement_observer = previous_observer
+            if timings_token is not None:
+                end_request_timings(timings_token)
+
+            # Labels are resolved after routing has populated scope["route"]
+            method = scope["method"] if scope["method"] in KNOWN_METHODS else "OTHER"
+            endpoint = self.endpoints.label(_route_template(scope))
+
+            http_request_duration_seconds.labels(
+                method=method,
+                endpoint=endpoint
+            ).observe(duration, exemplar=_trace_exemplar(duration, status_code))
+            http_requests_total.labels(
+                method=method,
+                endpoint=endpoint,
+                status=status_code
+            ).inc()
+            _report_query_stats(query_stats, endpoint, method)
+
+
+# =============================================================================
+# Multiprocess Metrics
+# =============================================================================
+
+# Live gauge files are gauge_live<mode>_<pid>.db (livesum, livemax, ...)
+_LIVE_GAUGE_FILE = re.compile(r"gauge_live[a-z]+_(\d+)\.db$")
+
+
+def _pid_alive(pid: int) -> bool:
+    """Check whether a process exists (signal 0 sends nothing)."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def cleanup_dead_workers(path: Optional[str] = None) -> int:
+    """
+    Drop live-gauge files left behind by workers that are no longer running.
+
+    uvicorn has no worker-exit hook, so a crashed worker's livesum values
+    (in-flight requests, checked-out connections) would be reported forever.
+    Counter and histogram files are kept: their totals stay valid.
+
+    Args:
+        path: Multiprocess directory (defaults to PROMETHEUS_MULTIPROC_DIR)
+
+    Returns:
+        Number of dead workers cleaned up
+    """
+    path = path or PROMETHEUS_MULTIPROC_DIR
+    if not path:
+        return 0
+
+    dead_pids = set()
+    for filename in glob.glob(os.path.join(path, "gauge_live*_*.db")):
+        match = _LIVE_GAUGE_FILE.search(filename)
+        if match and not _pid_alive(int(match.group(1))):
+            dead_pids.add(int(match.group(1)))
+
+    for pid in dead_pids:
+        mark_process_dead(pid, path)
+
+    if dead_pids:
+        logger.info(
+            "Removed metrics of dead workers",
+            extra={"pids": sorted(dead_pids)},
+        )
+    return len(dead_pids)
+
+
+def metrics_registry() -> CollectorRegistry:
+    """
+    Get the registry to expose on /metrics.
+
+    In single-process mode this is the default REGISTRY. In multiprocess
+    mode a fresh registry aggregates every worker's metric files at scrape
+    time, using each gauge's multiprocess_mode.
+
+    Returns:
+        Registry to pass to the exposition encoder
+    """
+    if not PROMETHEUS_MULTIPROC_DIR:
+        return REGISTRY
+
+    cleanup_dead_workers()
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry, path=PROMETHEUS_MULTIPROC_DIR)
+    return registry
+
+
+# =============================================================================
+# Event Loop Lag
+# =============================================================================
+
+# Histogram: Delay between when a timer should fire and when it fires
+# Any synchronous work on the event loop (CPU-bound code, blocking I/O) delays
+# every other request in the worker; sustained lag means something blocks.
+event_loop_lag_seconds = Histogram(
+    name="event_loop_lag_seconds",
+    documentation="Event loop scheduling delay of a periodic timer",
+    buckets=(.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1.0, 2.5, 5.0)
+)
+
+
+class EventLoopLagMonitor:
+    """
+    Measure how late the event loop runs a periodic timer.
+
+    A background task sleeps for a fixed interval and records how much later
+    than requested it woke up. On an idle, healthy loop the lag is well under
+    a millisecond; each blocking call shows up as lag roughly equal to its
+    duration.
+
+    Optionally enables asyncio debug mode with slow-callback detection:
+    asyncio then logs a warning naming the task or callback (and, for tasks,
+    where it was created) whenever a single step blocks the loop for longer
+    than the threshold. Debug mode adds per-callback overhead, so it is only
+    meant for development.
+
+    Example:
+        monitor = EventLoopLagMonitor(interval=0.5)
+        monitor.start()   # inside the running loop, e.g. in lifespan
+        ...
+        await monitor.stop()
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.5,
+        slow_callback_duration: Optional[float] = None,
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            interval: Seconds between lag measurements
+            slow_callback_duration: If set, enable asyncio debug mode and log
+                callbacks that run longer than this many seconds
+        """
+        self.interval = interval
+        self.slow_callback_duration = slow_callback_duration
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start measuring on the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self.slow_callback_duration is not None:
+            loop.set_debug(True)
+            loop.slow_callback_duration = self.slow_callback_duration
+            logger.info(
+                "asyncio slow callback detection enabled",
+                extra={"slow_callback_seconds": self.slow_callback_duration},
+            )
+        self._task = loop.create_task(self._run(), name="event-loop-lag-monitor")
+
+    async def stop(self) -> None:
+        """Stop measuring and wait for the background task to finish."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        """Sleep for the interval and record how late each wake-up is."""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            event_loop_lag_seconds.observe(max(0.0, loop.time() - expected))
+
+
+# =============================================================================
+# Outbound HTTP Clients
+# =============================================================================
+
+# Histogram: Outbound request latency until response headers, per attempt
+# Recorded by the shared HTTP clients in app.core.http_client.
+# - client: Registry name of the client (idp, ...)
+# - host: Upstream host (a handful of configured services, not user input)
+# - method: HTTP method
+# - status: Response status code, or the exception name for failed attempts
+http_client_request_duration_seconds = Histogram(
+    name="http_client_request_duration_seconds",
+    documentation="Outbound HTTP request duration until response headers",
+    labelnames=["client", "host", "method", "status"],
+)
+
+# Histogram: Time an outbound request waited for a pooled connection
+# Sustained waits mean the per-host connection limit is too small.
+http_client_pool_wait_seconds = Histogram(
+    name="http_client_pool_wait_seconds",
+    documentation="Time outbound HTTP requests waited for a pooled connection",
+    labelnames=["client", "host"],
+    buckets=(.0005, .001, .005, .01, .025, .05, .1, .25, .5, 1.0, 2.5, 5.0)
+)
+
+# Counter: Retried outbound requests (idempotent requests only)
+http_client_retries_total = Counter(
+    name="http_client_retries_total",
+    documentation="Outbound HTTP request retries",
+    labelnames=["client", "host"],
+)
+
+
+# =============================================================================
+# Graceful Shutdown
+# =============================================================================
+
+# Histogram: Time spent waiting for in-flight requests at shutdown
+# Durations near SHUTDOWN_DRAIN_TIMEOUT_SECONDS mean requests outlive the
+# deadline; see shutdown_abandoned_requests_total.
+shutdown_drain_seconds = Histogram(
+    name="shutdown_drain_seconds",
+    documentation="Time spent draining in-flight requests at shutdown",
+    buckets=(.01, .05, .1, .25, .5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+)
+
+# Counter: Requests still in flight when the drain deadline passed
+shutdown_abandoned_requests_total = Counter(
+    name="shutdown_abandoned_requests_total",
+    documentation="Requests still in flight when the shutdown drain deadline passed",
+)
+
+
+def flush_telemetry(timeout_millis: int = 5000) -> bool:
+    """
+    Export buffered spans before the process exits.
+
+    Metrics are pulled by Prometheus and need no flush; the log queue is
+    drained by its listener at exit.
+
+    Args:
+        timeout_millis: Longest time to wait for the export
+
+    Returns:
+        True if all buffered spans were exported in time
+    """
+    return _trace_provider.force_flush(timeout_millis)
+
+
 # =============================================================================
 # Tracer for Custom Instrumentation
 # =============================================================================
@@ -292,10 +1419,11 @@ def setup_observability(app: FastAPI) -> FastAPI:
     """
     Setup observability instrumentation for a FastAPI application.
 
-    This function performs three main tasks:
+    This function performs four main tasks:
     1. Instruments FastAPI with OpenTelemetry for automatic request tracing
-    2. Adds HTTP middleware for Prometheus metrics collection
-    3. Registers the /metrics endpoint for Prometheus scraping
+    2. Adds ASGI middleware for Prometheus metrics collection
+    3. Instruments the database connection pools
+    4. Registers the /metrics endpoint for Prometheus scraping
 
     Args:
         app: FastAPI application instance to instrument
@@ -315,7 +1443,15 @@ def setup_observability(app: FastAPI) -> FastAPI:
     Metrics Collected:
         - http_requests_total: Counter with method, endpoint, status labels
         - http_request_duration_seconds: Histogram with method, endpoint labels
+          (endpoint is the route template, "unmatched" or "overflow") and
+          trace_id exemplars
         - active_requests: Gauge of concurrent requests
+        - db_pool_*: Pool occupancy gauges, checkout wait, connect latency
+          and connection age histograms, labelled by pool
+        - db_queries_per_request, db_time_per_request_seconds,
+          db_slowest_query_seconds: Per-request SQL histograms by route template
+        - event_loop_lag_seconds: Event loop scheduling delay, recorded by
+          EventLoopLagMonitor (started from the application lifespan)
 
     Tracing:
         - Automatic span creation for all HTTP requests
@@ -342,93 +1478,61 @@ def setup_observability(app: FastAPI) -> FastAPI:
     # -------------------------------------------------------------------------
     # 2. Add Prometheus Metrics Middleware
     # -------------------------------------------------------------------------
-    @app.middleware("http")
-    async def metrics_middleware(
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]]
-    ) -> Response:
-        """
-        Middleware that collects HTTP metrics for every request.
-
-        This middleware wraps every HTTP request to collect:
-        - Active request count (gauge)
-        - Request duration (histogram)
-        - Request count by method, endpoint, status (counter)
-
-        Args:
-            request: The incoming HTTP request
-            call_next: Function to call the next middleware/handler
-
-        Returns:
-            The HTTP response from downstream handlers
-
-        Performance:
-            - Minimal overhead (<1ms per request)
-            - Labels are low-cardinality for efficient storage
-            - Context manager ensures accurate timing even on errors
-        """
-        # Increment active requests gauge
-        active_requests.inc()
-
-        # Extract request metadata for labels
-        method = request.method
-        path = request.url.path
-
-        try:
-            # Time the request processing and record in histogram
-            # The context manager ensures timing is accurate even if
-            # an exception occurs during request processing
-            with http_request_duration_seconds.labels(
-                method=method,
-                endpoint=path
-            ).time():
-                response = await call_next(request)
+    app.add_middleware(
+        PrometheusMiddleware,
+        max_endpoints=settings.METRICS_MAX_ENDPOINTS
+    )
 
-            # Record request in counter with status
-            http_requests_total.labels(
-                method=method,
-                endpoint=path,
-                status=response.status_code
-            ).inc()
+    # -------------------------------------------------------------------------
+    # 3. Instrument Database Connection Pools
+    # -------------------------------------------------------------------------
+    instrument_database_pools()
 
-            return response
-        finally:
-            # Always decrement active requests, even on error
-            active_requests.dec()
+    # Workers that exit cleanly drop their live gauges immediately; crashed
+    # workers are cleaned up at the next scrape
+    if PROMETHEUS_MULTIPROC_DIR:
+        atexit.register(mark_process_dead, os.getpid(), PROMETHEUS_MULTIPROC_DIR)
 
     # -------------------------------------------------------------------------
-    # 3. Register /metrics Endpoint
+    # 4. Register /metrics Endpoint
     # -------------------------------------------------------------------------
     @app.get(
         "/metrics",
         include_in_schema=False,  # Hide from OpenAPI docs
         tags=["monitoring"]
     )
-    async def get_metrics() -> Response:
+    async def get_metrics(request: Request) -> Response:
         """
         Prometheus metrics endpoint.
 
         Returns all registered metrics in Prometheus exposition format.
         This endpoint is scraped by Prometheus at regular intervals.
+        In multiprocess mode the values are aggregated across all workers.
+
+        The format is negotiated from the Accept header: Prometheus asks for
+        OpenMetrics, which is the only format that carries exemplars.
 
         Returns:
-            Response: Metrics in text/plain Prometheus format
+            Response: Metrics in OpenMetrics or text/plain Prometheus format
 
         Endpoint Details:
             - Path: /metrics
             - Method: GET
             - Auth: None (should be network-restricted in production)
-            - Content-Type: text/plain; version=0.0.4; charset=utf-8
+            - Content-Type: application/openmetrics-text; version=1.0.0 when
+              accepted, otherwise text/plain; version=0.0.4; charset=utf-8
         """
+        encoder, content_type = choose_encoder(request.headers.get("accept", ""))
         return Response(
-            content=generate_latest(),
-            media_type=CONTENT_TYPE_LATEST
+            content=encoder(metrics_registry()),
+            headers={"Content-Type": content_type}
         )
 
     # Log successful initialization
     logger.info(
         f"Observability configured for service '{SERVICE_NAME_VAL}' "
-        f"(OTLP endpoint: {OTLP_ENDPOINT})"
+        f"(OTLP endpoint: {OTLP_ENDPOINT}, "
+        f"metrics: {'multiprocess' if PROMETHEUS_MULTIPROC_DIR else 'single process'})"
     )
 
     return app
@@ -1,5 +1,6 @@
 """Authentication schemas for OAuth token validation."""
-from typing import List, Optional, Union
+from functools import cached_property
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
 
 from pydantic import BaseModel, Field
 
@@ -45,6 +46,30 @@ ALL_SCOPES = {
     SCOPE_TENANT_ADMIN,
 }
 
+# One bit per defined scope, so sets of defined scopes compile to an int mask
+SCOPE_BITS: Dict[str, int] = {
+    scope: 1 << bit for bit, scope in enumerate(sorted(ALL_SCOPES))
+}
+
+
+def scopes_to_mask(scopes: Iterable[str]) -> int:
+    """
+    Compile scopes into a bitmask over ALL_SCOPES.
+
+    Scopes outside ALL_SCOPES (e.g. realm roles, "openid") have no bit and
+    are ignored; check those against AuthenticatedUser.scope_set instead.
+
+    Args:
+        scopes: Scope strings
+
+    Returns:
+        Bitwise OR of the SCOPE_BITS of the defined scopes
+    """
+    mask = 0
+    for scope in SCOPE_BITS.keys() & scopes:
+        mask |= SCOPE_BITS[scope]
+    return mask
+
 
 class RealmAccess(BaseModel):
     """Keycloak realm_access claim containing user roles."""
@@ -90,10 +115,15 @@ class AuthenticatedUser(BaseModel):
     Authenticated user context extracted from validated JWT token.
 
     This model represents the user identity after successful token validation.
-    It's injected into route handlers via the get_current_user() dependency.
+    get_current_user() injects the lighter Principal into route handlers;
+    Principal.to_schema() converts it to this model for serialization.
 
     All authenticated requests MUST include a tenant_id for multi-tenant isolation.
     The jti and exp fields are included to support token revocation.
+
+    The scopes are compiled once, on first use, into scope_set and scope_mask,
+    so scope checks need no list scans. Build a new model rather than changing
+    scopes afterwards (model_copy keeps the compiled values).
     """
 
     user_id: str = Field(..., description="User ID (OAuth subject claim)")
@@ -109,6 +139,16 @@ class AuthenticatedUser(BaseModel):
     )
     issuer: str = Field(..., description="OAuth issuer URL")
 
+    @cached_property
+    def scope_set(self) -> FrozenSet[str]:
+        """Granted scopes as a frozenset, for O(1) membership tests."""
+        return frozenset(self.scopes)
+
+    @cached_property
+    def scope_mask(self) -> int:
+        """Bitmask of the granted scopes defined in ALL_SCOPES (see SCOPE_BITS)."""
+        return scopes_to_mask(self.scopes)
+
     def has_scope(self, scope: str) -> bool:
         """
         Check if user has a specific scope.
@@ -123,7 +163,243 @@ class AuthenticatedUser(BaseModel):
             >>> user.has_scope("statements/write")
             True
         """
-        return scope in self.scopes
+        return scope in self.scope_set
+
+
+class InvalidClaimsError(ValueError):
+    """Raised when decoded token claims lack a required claim or have a wrong type."""
+
+
+def _str_claim(claims: Dict[str, Any], name: str, required: bool = False) -> Optional[str]:
+    """Read a string claim, None if absent and optional."""
+    value = claims.get(name)
+    if value is None and not required:
+        return None
+    if not isinstance(value, str):
+        raise InvalidClaimsError(f"claim '{name}' must be a string")
+    return value
+
+
+def _int_claim(claims: Dict[str, Any], name: str) -> int:
+    """Read a required integer claim (integral floats are accepted)."""
+    value = claims.get(name)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise InvalidClaimsError(f"claim '{name}' must be an integer")
+    return value
+
+
+class Principal:
+    """
+    Immutable authenticated principal, built per request on the auth hot path.
+
+    get_current_user() returns a Principal rather than an AuthenticatedUser:
+    it is built straight from the decoded claims, validating only the claims
+    the API relies on (the same ones TokenPayload requires), and holds its
+    attributes in __slots__. It exposes the AuthenticatedUser attributes, with
+    scopes as a tuple, compiled to scope_set and scope_mask on construction.
+
+    Convert it with to_schema() where an AuthenticatedUser is serialized.
+
+    Example:
+        >>> principal = Principal.from_claims(jwt.decode(token, ...))
+        >>> principal.has_scope("statements/write")
+        True
+        >>> principal.to_schema().model_dump()
+    """
+
+    __slots__ = (
+        "user_id",
+        "tenant_id",
+        "jti",
+        "exp",
+        "email",
+        "name",
+        "scopes",
+        "issuer",
+        "scope_set",
+        "scope_mask",
+    )
+
+    user_id: str
+    tenant_id: Optional[str]
+    jti: str
+    exp: int
+    email: Optional[str]
+    name: Optional[str]
+    scopes: Tuple[str, ...]
+    issuer: str
+    scope_set: FrozenSet[str]
+    scope_mask: int
+
+    def __init__(
+        self,
+        user_id: str,
+        tenant_id: Optional[str],
+        jti: str,
+        exp: int,
+        issuer: str,
+        email: Optional[str] = None,
+        name: Optional[str] = None,
+        scopes: Iterable[str] = (),
+    ):
+        """
+        Initialize the principal.
+
+        Args:
+            user_id: User ID (OAuth subject claim)
+            tenant_id: Tenant ID (None until the tenant claim is checked)
+            jti: JWT ID
+            exp: Token expiration time (Unix timestamp)
+            issuer: OAuth issuer URL
+            email: User email address
+            name: User display name
+            scopes: Granted OAuth scopes and realm roles
+        """
+        scopes = tuple(scopes)
+        scope_set = frozenset(scopes)
+        setattr_ = object.__setattr__
+        setattr_(self, "user_id", user_id)
+        setattr_(self, "tenant_id", tenant_id)
+        setattr_(self, "jti", jti)
+        setattr_(self, "exp", exp)
+        setattr_(self, "email", email)
+        setattr_(self, "name", name)
+        setattr_(self, "scopes", scopes)
+        setattr_(self, "issuer", issuer)
+        setattr_(self, "scope_set", scope_set)
+        setattr_(self, "scope_mask", scopes_to_mask(scope_set))
+
+    @classmethod
+    def from_claims(cls, claims: Dict[str, Any]) -> "Principal":
+        """
+        Build a principal from decoded, signature-verified JWT claims.
+
+        Scopes are the space-separated scope claim followed by the Keycloak
+        realm roles (roles are used as scopes in this system).
+
+        Args:
+            claims: Claims returned by jwt.decode()
+
+        Returns:
+            Principal; tenant_id is the raw tenant_id claim
+
+        Raises:
+            InvalidClaimsError: If sub, iss, aud, exp, iat or jti is missing, or
+                a claim has the wrong type
+        """
+        aud = claims.get("aud")
+        if not isinstance(aud, (str, list)):
+            raise InvalidClaimsError("claim 'aud' must be a string or a list")
+        _int_claim(claims, "iat")
+
+        scope = _str_claim(claims, "scope")
+        scopes = scope.split() if scope else []
+        realm_access = claims.get("realm_access")
+        if realm_access is not None:
+            if not isinstance(realm_access, dict):
+                raise InvalidClaimsError("claim 'realm_access' must be an object")
+            roles = realm_access.get("roles", [])
+            if not isinstance(roles, list) or not all(isinstance(role, str) for role in roles):
+                raise InvalidClaimsError("claim 'realm_access.roles' must be a list of strings")
+            scopes.extend(roles)
+
+        return cls(
+            user_id=_str_claim(claims, "sub", required=True),
+            tenant_id=_str_claim(claims, "tenant_id"),
+            jti=_str_claim(claims, "jti", required=True),
+            exp=_int_claim(claims, "exp"),
+            issuer=_str_claim(claims, "iss", required=True),
+            email=_str_claim(claims, "email"),
+            name=_str_claim(claims, "name"),
+            scopes=scopes,
+        )
+
+    def replace(self, **changes: Any) -> "Principal":
+        """
+        Return a copy of the principal with some attributes changed.
+
+        Args:
+            **changes: New values of __init__ arguments
+
+        Returns:
+            New Principal
+        """
+        values = {
+            "user_id": self.user_id,
+            "tenant_id": self.tenant_id,
+            "jti": self.jti,
+            "exp": self.exp,
+            "issuer": self.issuer,
+            "email": self.email,
+            "name": self.name,
+            "scopes": self.scopes,
+        }
+        values.update(changes)
+        return Principal(**values)
+
+    def has_scope(self, scope: str) -> bool:
+        """
+        Check if the principal has a specific scope.
+
+        Args:
+            scope: OAuth scope to check (e.g., "statements/write")
+
+        Returns:
+            True if the principal has the scope, False otherwise
+        """
+        return scope in self.scope_set
+
+    def to_schema(self) -> AuthenticatedUser:
+        """
+        Convert to the AuthenticatedUser schema, for serialization.
+
+        Returns:
+            AuthenticatedUser with the same attributes
+        """
+        return AuthenticatedUser(
+            user_id=self.user_id,
+            tenant_id=self.tenant_id,
+            jti=self.jti,
+            exp=self.exp,
+            email=self.email,
+            name=self.name,
+            scopes=list(self.scopes),
+            issuer=self.issuer,
+        )
+
+    def _key(self) -> Tuple[Any, ...]:
+        return (
+            self.user_id,
+            self.tenant_id,
+            self.jti,
+            self.exp,
+            self.email,
+            self.name,
+            self.scopes,
+            self.issuer,
+        )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Principal):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        return (
+            f"Principal(user_id={self.user_id!r}, tenant_id={self.tenant_id!r}, "
+            f"jti={self.jti!r}, scopes={self.scopes!r})"
+        )
 
 
 class AuthError(BaseModel):
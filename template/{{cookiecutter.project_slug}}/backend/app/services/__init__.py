@@ -2,6 +2,7 @@
 
 from app.services.tenant_context import (
     set_tenant_context,
+    defer_tenant_context,
     clear_tenant_context,
     bypass_rls,
     validate_tenant_active,
@@ -11,6 +12,7 @@ from app.services.tenant_context import (
 
 __all__ = [
     "set_tenant_context",
+    "defer_tenant_context",
     "clear_tenant_context",
     "bypass_rls",
     "validate_tenant_active",
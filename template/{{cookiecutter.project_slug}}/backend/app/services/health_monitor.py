@@ -0,0 +1,257 @@
+"""
+Background dependency health monitor behind the readiness probe.
+
+Orchestrators probe /ready every few seconds on every pod. Instead of
+checking dependencies on each probe, a background task checks the database,
+Redis and JWKS availability every READINESS_CHECK_INTERVAL_SECONDS (each
+check bounded by READINESS_CHECK_TIMEOUT_SECONDS) and keeps the results in
+memory. /ready answers from those results without any I/O.
+
+Readiness rules:
+- Not ready while the startup warm-up runs (see app.services.warmup)
+- Not ready until the first round of checks has completed
+- Not ready when the last completed round is older than
+  READINESS_MAX_STALENESS_SECONDS (the monitor is stuck or the event loop is
+  blocked)
+- Not ready when a check in READINESS_REQUIRED_CHECKS failed
+- Ready but "degraded" when only other checks failed; Redis and the JWKS
+  provider are shared by every pod, so pulling pods out of rotation does not
+  help while their failures are already handled (caches fall back, cached
+  keys keep validating tokens)
+
+When the monitor is not running (READINESS_CHECK_INTERVAL_SECONDS=0, or no
+application lifespan, as in unit tests), /ready always passes.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Iterable, Optional
+
+from app.core.cache import get_redis_client
+from app.core.config import settings
+from app.core.database import ping_database
+from app.services.jwks_client import get_jwks_client
+
+logger = logging.getLogger(__name__)
+
+# A health check succeeds by returning and fails by raising
+HealthCheck = Callable[[], Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class CheckResult:
+    """
+    Outcome of one dependency check.
+
+    Attributes:
+        healthy: Whether the check passed within its timeout
+        latency_ms: Time the check took
+        checked_at: When the check finished (UTC)
+        error: Failure description for unhealthy checks
+    """
+
+    healthy: bool
+    latency_ms: float
+    checked_at: datetime
+    error: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class Readiness:
+    """
+    Readiness derived from the latest check results.
+
+    Attributes:
+        ready: Whether the instance should receive traffic
+        status: "ready", "degraded", "not_ready", "stale", "starting" or
+            "warming_up"
+        checks: Latest result per check name
+    """
+
+    ready: bool
+    status: str
+    checks: Dict[str, CheckResult] = field(default_factory=dict)
+
+
+async def check_redis() -> None:
+    """Ping Redis through the shared client."""
+    client = await get_redis_client()
+    if client is None:
+        raise ConnectionError("Redis client unavailable")
+    await client.ping()
+
+
+async def check_jwks() -> None:
+    """Ensure signing keys for the configured issuer are obtainable (cached or fetched)."""
+    client = await get_jwks_client()
+    await client.get_jwks(settings.OAUTH_ISSUER_URL)
+
+
+class HealthMonitor:
+    """
+    Runs dependency checks periodically and answers readiness from memory.
+
+    Example:
+        monitor = HealthMonitor({"database": ping_database}, required=["database"])
+        monitor.start()
+        ...
+        if not monitor.readiness().ready:
+            ...
+        await monitor.stop()
+    """
+
+    def __init__(
+        self,
+        checks: Dict[str, HealthCheck],
+        required: Iterable[str] = (),
+        interval: float = 5.0,
+        timeout: float = 2.0,
+        max_staleness: float = 30.0,
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            checks: Check coroutine functions by name
+            required: Names of checks that must pass for readiness
+            interval: Seconds between check rounds
+            timeout: Timeout per check in seconds
+            max_staleness: Age in seconds after which results are not trusted
+        """
+        self.checks = checks
+        self.required = frozenset(required)
+        self.interval = interval
+        self.timeout = timeout
+        self.max_staleness = max_staleness
+        self._results: Dict[str, CheckResult] = {}
+        self._last_run: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        # Set while the startup warm-up runs (see app.services.warmup)
+        self.warming_up = False
+
+    @property
+    def running(self) -> bool:
+        """Whether the background task is running."""
+        return self._task is not None and not self._task.done()
+
+    async def _run_check(self, name: str, check: HealthCheck) -> CheckResult:
+        """Run one check with the timeout, turning failures into a result."""
+        start = time.perf_counter()
+        error = None
+        try:
+            await asyncio.wait_for(check(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            error = f"timed out after {self.timeout}s"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        return CheckResult(
+            healthy=error is None,
+            latency_ms=round((time.perf_counter() - start) * 1000, 3),
+            checked_at=datetime.now(timezone.utc),
+            error=error,
+        )
+
+    async def check_all(self) -> Dict[str, CheckResult]:
+        """
+        Run every check concurrently and store the results.
+
+        Returns:
+            Result per check name
+        """
+        names = list(self.checks)
+        outcomes = await asyncio.gather(
+            *(self._run_check(name, self.checks[name]) for name in names)
+        )
+        results = dict(zip(names, outcomes, strict=True))
+
+        for name, result in results.items():
+            previous = self._results.get(name)
+            if not result.healthy and (previous is None or previous.healthy):
+                logger.warning(
+                    "Dependency check failed",
+                    extra={"check": name, "error": result.error},
+                )
+            elif result.healthy and previous is not None and not previous.healthy:
+                logger.info("Dependency check recovered", extra={"check": name})
+
+        # Replace rather than update, so readers never see a partial round
+        self._results = results
+        self._last_run = time.monotonic()
+        return results
+
+    async def _run(self) -> None:
+        """Check forever, sleeping the interval between rounds."""
+        while True:
+            await self.check_all()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start checking in the background (call from the running event loop)."""
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="health-monitor")
+
+    async def stop(self) -> None:
+        """Stop the background checks."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def readiness(self) -> Readiness:
+        """
+        Get readiness from the latest results without performing any I/O.
+
+        Returns:
+            Readiness of this instance
+        """
+        if self.warming_up:
+            return Readiness(ready=False, status="warming_up")
+        if self._task is None:
+            return Readiness(ready=True, status="ready")
+        if self._last_run is None:
+            return Readiness(ready=False, status="starting")
+
+        results = self._results
+        if time.monotonic() - self._last_run > self.max_staleness:
+            return Readiness(ready=False, status="stale", checks=results)
+
+        failed = {name for name, result in results.items() if not result.healthy}
+        if failed & self.required:
+            return Readiness(ready=False, status="not_ready", checks=results)
+        if failed:
+            return Readiness(ready=True, status="degraded", checks=results)
+        return Readiness(ready=True, status="ready", checks=results)
+
+
+# Global health monitor instance (singleton pattern)
+_health_monitor: Optional[HealthMonitor] = None
+
+
+def get_health_monitor() -> HealthMonitor:
+    """
+    Get global health monitor instance.
+
+    Returns:
+        HealthMonitor checking database, redis and jwks as configured in settings
+    """
+    global _health_monitor
+    if _health_monitor is None:
+        _health_monitor = HealthMonitor(
+            checks={
+                "database": ping_database,
+                "redis": check_redis,
+                "jwks": check_jwks,
+            },
+            required=settings.READINESS_REQUIRED_CHECKS,
+            interval=settings.READINESS_CHECK_INTERVAL_SECONDS,
+            timeout=settings.READINESS_CHECK_TIMEOUT_SECONDS,
+            max_staleness=settings.READINESS_MAX_STALENESS_SECONDS,
+        )
+    return _health_monitor
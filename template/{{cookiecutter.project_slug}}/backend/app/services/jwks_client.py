@@ -16,7 +16,11 @@ from typing import Dict, List, Optional, Any
 import httpx
 import redis.asyncio as redis
 
+from app.core.cache import TimedRedis
 from app.core.config import settings
+from app.core.http_client import create_http_client, get_http_client
+from app.core.timing import timed
+from app.services.oidc_discovery import OIDCDiscoveryCache, get_oidc_discovery_cache
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +39,8 @@ class JWKSClient:
         redis_client: redis.Redis,
         cache_ttl: int = 3600,
         http_timeout: int = 10,
+        http_client: Optional[httpx.AsyncClient] = None,
+        discovery_cache: Optional[OIDCDiscoveryCache] = None,
     ):
         """
         Initialize JWKS client.
@@ -43,11 +49,17 @@ class JWKSClient:
             redis_client: Async Redis client for caching JWKS
             cache_ttl: Cache TTL in seconds (default 1 hour)
             http_timeout: HTTP request timeout in seconds (default 10s)
+            http_client: Shared HTTP client to send requests with, not closed by
+                close() (default: own client created with http_timeout)
+            discovery_cache: Shared OIDC discovery cache (default: process-local
+                cache using the HTTP client)
         """
         self.redis_client = redis_client
         self.cache_ttl = cache_ttl
         self.http_timeout = http_timeout
-        self._http_client = httpx.AsyncClient(timeout=http_timeout)
+        self._owns_http_client = http_client is None
+        self._http_client = http_client or create_http_client("jwks", http_timeout)
+        self._discovery_cache = discovery_cache or OIDCDiscoveryCache(self._http_client)
 
     async def get_jwks(self, issuer_url: str, force_refresh: bool = False) -> Dict[str, Any]:
         """
@@ -96,6 +108,7 @@ class JWKSClient:
 
         return jwks
 
+    @timed("jwks")
     async def get_signing_key(
         self, issuer_url: str, key_id: str, force_refresh: bool = False
     ) -> Optional[Dict[str, Any]]:
@@ -155,7 +168,8 @@ class JWKSClient:
         Fetch JWKS from OAuth provider via OIDC discovery.
 
         Implements the OIDC discovery flow:
-        1. Fetch .well-known/openid-configuration from issuer
+        1. Get .well-known/openid-configuration of the issuer (from the
+           discovery cache, see app.services.oidc_discovery)
         2. Extract jwks_uri from discovery document
         3. Fetch JWKS from jwks_uri endpoint
 
@@ -169,40 +183,20 @@ class JWKSClient:
             httpx.HTTPError: If discovery or JWKS fetch fails
             ValueError: If JWKS format is invalid
         """
-        # Step 1: Discover JWKS endpoint via OIDC discovery
-        discovery_url = f"{issuer_url}/.well-known/openid-configuration"
-
+        # Step 1: Discover JWKS endpoint via OIDC discovery (cached)
         try:
-            logger.debug(
-                "Fetching OIDC discovery document",
-                extra={"discovery_url": discovery_url},
-            )
-            discovery_response = await self._http_client.get(discovery_url)
-            discovery_response.raise_for_status()
-            discovery_data = discovery_response.json()
-            jwks_uri = discovery_data.get("jwks_uri")
-
-            if not jwks_uri:
-                raise ValueError(
-                    f"No jwks_uri in OIDC discovery document: {discovery_url}"
-                )
-
-            logger.debug(
-                "OIDC discovery successful",
-                extra={"issuer": issuer_url, "jwks_uri": jwks_uri},
-            )
-
+            discovery_data = await self._discovery_cache.get(issuer_url)
         except httpx.HTTPError as e:
             logger.error(
                 "OIDC discovery failed",
-                extra={
-                    "issuer": issuer_url,
-                    "discovery_url": discovery_url,
-                    "error": str(e),
-                },
+                extra={"issuer": issuer_url, "error": str(e)},
             )
             raise
 
+        jwks_uri = discovery_data.get("jwks_uri")
+        if not jwks_uri:
+            raise ValueError(f"No jwks_uri in OIDC discovery document for {issuer_url}")
+
         # Step 2: Fetch JWKS from jwks_uri
         try:
             logger.debug("Fetching JWKS", extra={"jwks_uri": jwks_uri})
@@ -303,9 +297,11 @@ class JWKSClient:
         Close HTTP client and cleanup resources.
 
         Should be called when the application shuts down to properly close
-        the HTTP client connection pool.
+        the HTTP client connection pool. A shared HTTP client passed to the
+        constructor is left open for its other users.
         """
-        await self._http_client.aclose()
+        if self._owns_http_client:
+            await self._http_client.aclose()
         logger.debug("JWKS client closed")
 
 
@@ -332,7 +328,7 @@ async def get_jwks_client() -> JWKSClient:
 
     if _jwks_client is None:
         # Initialize Redis client
-        redis_client = redis.from_url(
+        redis_client = TimedRedis.from_url(
             settings.REDIS_URL,
             encoding="utf-8",
             decode_responses=True,
@@ -342,6 +338,8 @@ async def get_jwks_client() -> JWKSClient:
             redis_client=redis_client,
             cache_ttl=settings.JWKS_CACHE_TTL,
             http_timeout=settings.JWKS_HTTP_TIMEOUT,
+            http_client=get_http_client("idp", settings.JWKS_HTTP_TIMEOUT),
+            discovery_cache=await get_oidc_discovery_cache(),
         )
 
         logger.info(
@@ -354,3 +352,18 @@ async def get_jwks_client() -> JWKSClient:
         )
 
     return _jwks_client
+
+
+async def close_jwks_client() -> None:
+    """
+    Close the singleton JWKS client's HTTP client and Redis connection pool.
+
+    Should be called when the application shuts down. After calling this,
+    get_jwks_client() creates a new instance on next call.
+    """
+    global _jwks_client
+
+    if _jwks_client is not None:
+        await _jwks_client.close()
+        await _jwks_client.redis_client.aclose()
+        _jwks_client = None
@@ -11,13 +11,21 @@ import logging
 import secrets
 import hashlib
 import base64
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Sequence
 from urllib.parse import urlencode
 
 import httpx
 
 from app.core.config import settings
+from app.core.http_client import create_http_client, get_http_client
 from app.schemas.oauth import OIDCDiscovery, TokenResponse, UserInfo, PKCEChallenge
+from app.services.oidc_discovery import OIDCDiscoveryCache, get_oidc_discovery_cache
+from app.services.token_refresh import RefreshCoalescer, get_refresh_coalescer
+from app.services.userinfo_cache import (
+    DEFAULT_PROFILE_CLAIMS,
+    UserInfoCache,
+    user_info_from_claims,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -63,6 +71,11 @@ class OAuthClient:
         scopes: Optional[List[str]] = None,
         use_pkce: bool = True,
         http_timeout: int = 10,
+        http_client: Optional[httpx.AsyncClient] = None,
+        discovery_cache: Optional[OIDCDiscoveryCache] = None,
+        refresh_coalescer: Optional[RefreshCoalescer] = None,
+        userinfo_cache: Optional[UserInfoCache] = None,
+        oidc_config: Optional[OIDCDiscovery] = None,
     ):
         """
         Initialize OAuth client.
@@ -75,6 +88,15 @@ class OAuthClient:
             scopes: OAuth scopes to request (default: ["openid", "profile", "email"])
             use_pkce: Enable PKCE for enhanced security (default: True)
             http_timeout: HTTP request timeout in seconds (default: 10)
+            http_client: Shared HTTP client to send requests with, not closed by
+                close() (default: own client created with http_timeout)
+            discovery_cache: Shared OIDC discovery cache (default: process-local
+                cache using the HTTP client)
+            refresh_coalescer: Coalescer of concurrent refreshes of a token
+                (default: in-process only)
+            userinfo_cache: Cache of userinfo responses (default: 5 minute TTL)
+            oidc_config: Configured provider endpoints, used instead of OIDC
+                discovery (default: discovered from issuer_url)
         """
         self.client_id = client_id
         self.client_secret = client_secret
@@ -84,8 +106,14 @@ class OAuthClient:
         self.use_pkce = use_pkce
         self.http_timeout = http_timeout
 
-        self._http_client = httpx.AsyncClient(timeout=http_timeout)
+        self._owns_http_client = http_client is None
+        self._http_client = http_client or create_http_client("oauth", http_timeout)
+        self._discovery_cache = discovery_cache or OIDCDiscoveryCache(self._http_client)
+        self._refresh_coalescer = refresh_coalescer or RefreshCoalescer()
+        self._userinfo_cache = userinfo_cache or UserInfoCache()
+        self._static_oidc_config = oidc_config
         self._oidc_config: Optional[OIDCDiscovery] = None
+        self._oidc_document: Optional[Dict[str, Any]] = None
 
     async def discover_endpoints(self) -> OIDCDiscovery:
         """
@@ -95,8 +123,10 @@ class OAuthClient:
         .well-known/openid-configuration endpoint. The discovery document
         contains all OAuth endpoint URLs (authorization, token, jwks, etc.).
 
-        The discovery result is cached after the first successful fetch to
-        avoid repeated network requests.
+        The discovery document comes from the discovery cache (see
+        app.services.oidc_discovery), so it is refetched after its TTL; it is
+        parsed again only when the cache returns a new document. Clients
+        constructed with oidc_config return it without discovery.
 
         Returns:
             OIDCDiscovery: OIDC configuration with endpoint URLs
@@ -109,46 +139,42 @@ class OAuthClient:
             >>> config = await client.discover_endpoints()
             >>> print(f"Token endpoint: {config.token_endpoint}")
         """
-        if self._oidc_config is not None:
-            return self._oidc_config
-
-        discovery_url = f"{self.issuer_url}/.well-known/openid-configuration"
+        if self._static_oidc_config is not None:
+            return self._static_oidc_config
 
         try:
-            logger.debug(
-                "Fetching OIDC discovery document",
-                extra={"discovery_url": discovery_url},
-            )
-            response = await self._http_client.get(discovery_url)
-            response.raise_for_status()
-            discovery_data = response.json()
-
-            # Validate and parse discovery document
-            self._oidc_config = OIDCDiscovery(**discovery_data)
-
-            logger.info(
-                "OIDC discovery successful",
-                extra={
-                    "issuer": self.issuer_url,
-                    "authorization_endpoint": self._oidc_config.authorization_endpoint,
-                    "token_endpoint": self._oidc_config.token_endpoint,
-                },
-            )
-
-            return self._oidc_config
-
+            discovery_data = await self._discovery_cache.get(self.issuer_url)
         except httpx.HTTPError as e:
             logger.error(
                 "OIDC discovery failed",
                 extra={"issuer": self.issuer_url, "error": str(e)},
             )
             raise
+
+        if self._oidc_config is not None and discovery_data is self._oidc_document:
+            return self._oidc_config
+
+        try:
+            # Validate and parse discovery document
+            self._oidc_config = OIDCDiscovery(**discovery_data)
         except Exception as e:
             logger.error(
                 "OIDC discovery parsing failed",
                 extra={"issuer": self.issuer_url, "error": str(e)},
             )
             raise ValueError(f"Invalid OIDC discovery document: {e}")
+        self._oidc_document = discovery_data
+
+        logger.info(
+            "OIDC discovery successful",
+            extra={
+                "issuer": self.issuer_url,
+                "authorization_endpoint": self._oidc_config.authorization_endpoint,
+                "token_endpoint": self._oidc_config.token_endpoint,
+            },
+        )
+
+        return self._oidc_config
 
     def generate_pkce_challenge(self) -> PKCEChallenge:
         """
@@ -372,6 +398,9 @@ class OAuthClient:
         and client credentials. Returns a new access token and optionally
         a new refresh token.
 
+        Concurrent refreshes of the same refresh token (several tabs, parallel
+        API calls) share one exchange, see app.services.token_refresh.
+
         Args:
             refresh_token: Refresh token from previous token exchange
 
@@ -385,6 +414,12 @@ class OAuthClient:
             >>> new_token = await client.refresh_token(old_token.refresh_token)
             >>> print(f"New access token: {new_token.access_token}")
         """
+        return await self._refresh_coalescer.refresh(
+            refresh_token, lambda: self._exchange_refresh_token(refresh_token)
+        )
+
+    async def _exchange_refresh_token(self, refresh_token: str) -> TokenResponse:
+        """Send the refresh token grant to the token endpoint."""
         oidc_config = await self.discover_endpoints()
         token_endpoint = oidc_config.token_endpoint
 
@@ -444,15 +479,27 @@ class OAuthClient:
             )
             raise
 
-    async def get_user_info(self, access_token: str) -> UserInfo:
+    async def get_user_info(
+        self,
+        access_token: str,
+        claims: Optional[Dict[str, Any]] = None,
+        required_claims: Sequence[str] = DEFAULT_PROFILE_CLAIMS,
+    ) -> UserInfo:
         """
         Fetch user info from OAuth provider.
 
         Sends a GET request to the userinfo endpoint with the access token.
         Returns user profile information including email, name, etc.
 
+        The request is skipped when the token claims already include sub and
+        the required claims, or when the access token's userinfo is cached
+        (see app.services.userinfo_cache).
+
         Args:
             access_token: Valid OAuth access token
+            claims: Claims of the already validated ID or access token
+            required_claims: Profile claims the caller needs from the claims
+                (default: email and name)
 
         Returns:
             UserInfo: User profile information
@@ -465,6 +512,15 @@ class OAuthClient:
             >>> user_info = await client.get_user_info(token.access_token)
             >>> print(f"User email: {user_info.email}")
         """
+        if claims is not None:
+            user_info = user_info_from_claims(claims, required_claims)
+            if user_info is not None:
+                return user_info
+
+        user_info = self._userinfo_cache.get(access_token)
+        if user_info is not None:
+            return user_info
+
         oidc_config = await self.discover_endpoints()
 
         if not oidc_config.userinfo_endpoint:
@@ -486,6 +542,9 @@ class OAuthClient:
                 extra={"user_id": user_info.sub, "has_email": user_info.email is not None},
             )
 
+            self._userinfo_cache.set(
+                access_token, user_info, token_exp=claims.get("exp") if claims else None
+            )
             return user_info
 
         except httpx.HTTPError as e:
@@ -500,9 +559,11 @@ class OAuthClient:
         Close HTTP client and cleanup resources.
 
         Should be called when the application shuts down to properly close
-        the HTTP client connection pool.
+        the HTTP client connection pool. A shared HTTP client passed to the
+        constructor is left open for its other users.
         """
-        await self._http_client.aclose()
+        if self._owns_http_client:
+            await self._http_client.aclose()
         logger.debug("OAuth client closed")
 
 
@@ -535,6 +596,13 @@ async def get_oauth_client() -> OAuthClient:
             scopes=settings.OAUTH_SCOPES,
             use_pkce=settings.OAUTH_USE_PKCE,
             http_timeout=settings.JWKS_HTTP_TIMEOUT,
+            http_client=get_http_client("idp", settings.JWKS_HTTP_TIMEOUT),
+            discovery_cache=await get_oidc_discovery_cache(),
+            refresh_coalescer=await get_refresh_coalescer(),
+            userinfo_cache=UserInfoCache(
+                ttl=settings.USERINFO_CACHE_TTL_SECONDS,
+                max_entries=settings.USERINFO_CACHE_MAX_ENTRIES,
+            ),
         )
 
         logger.info(
@@ -549,3 +617,17 @@ async def get_oauth_client() -> OAuthClient:
         )
 
     return _oauth_client
+
+
+async def close_oauth_client() -> None:
+    """
+    Close the singleton OAuth client's HTTP client.
+
+    Should be called when the application shuts down. After calling this,
+    get_oauth_client() creates a new instance on next call.
+    """
+    global _oauth_client
+
+    if _oauth_client is not None:
+        await _oauth_client.close()
+        _oauth_client = None
@@ -0,0 +1,261 @@
+"""
+Registry of OAuth clients per tenant.
+
+Tenants with an OAuthProvider row log in through their own identity provider;
+the others use the default client from settings (get_oauth_client). The
+registry builds each tenant's OAuthClient on first use and keeps it, so a
+login or token refresh needs neither a database read nor client construction:
+
+- Clients share the identity provider HTTP pool, OIDC discovery cache,
+  refresh coalescer and userinfo cache
+- Provider endpoints stored in the row are used without OIDC discovery
+- Least recently used clients are evicted beyond
+  OAUTH_CLIENT_REGISTRY_MAX_CLIENTS, and clients idle for
+  OAUTH_CLIENT_REGISTRY_IDLE_SECONDS are dropped
+- Committing a change to an OAuthProvider row drops the tenant's client in
+  this process; other processes reload it at the latest after
+  OAUTH_CLIENT_REGISTRY_MAX_AGE_SECONDS
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Optional
+from uuid import UUID
+
+import httpx
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.http_client import get_http_client
+from app.models.oauth_provider import OAuthProvider
+from app.schemas.oauth import OIDCDiscovery
+from app.services.oauth_client import OAuthClient, get_oauth_client
+from app.services.oidc_discovery import OIDCDiscoveryCache, get_oidc_discovery_cache
+from app.services.token_refresh import RefreshCoalescer, get_refresh_coalescer
+from app.services.userinfo_cache import UserInfoCache
+
+logger = logging.getLogger(__name__)
+
+# Session.info key collecting tenants whose provider changed in the transaction
+_CHANGED_PROVIDER_TENANTS = "changed_oauth_provider_tenants"
+
+
+@dataclass
+class _RegistryEntry:
+    """A tenant's client (None: the default client) and its use times."""
+
+    client: Optional[OAuthClient]
+    loaded_at: float
+    last_used: float
+
+
+class OAuthClientRegistry:
+    """
+    Lazily built, LRU-evicted OAuth clients by tenant.
+
+    Single event loop, so no locking. Concurrent first uses of a tenant may
+    each load its provider; the last client built is kept.
+
+    Example:
+        registry = await get_oauth_client_registry()
+        client = await registry.get_client(session, tenant_id)
+        url, state, challenge = await client.get_authorization_url()
+    """
+
+    def __init__(
+        self,
+        default_client: OAuthClient,
+        http_client: httpx.AsyncClient,
+        discovery_cache: OIDCDiscoveryCache,
+        refresh_coalescer: RefreshCoalescer,
+        userinfo_cache: UserInfoCache,
+        max_clients: int = 256,
+        idle_seconds: float = 3600.0,
+        max_age_seconds: float = 300.0,
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            default_client: Client of tenants without an active OAuthProvider
+            http_client: Shared HTTP client of the tenant clients
+            discovery_cache: Shared OIDC discovery cache
+            refresh_coalescer: Shared refresh token coalescer
+            userinfo_cache: Shared userinfo cache
+            max_clients: Maximum number of tenants kept
+            idle_seconds: Unused tenants are dropped after this time
+            max_age_seconds: Tenants are reloaded from the database after this time
+        """
+        self.default_client = default_client
+        self.http_client = http_client
+        self.discovery_cache = discovery_cache
+        self.refresh_coalescer = refresh_coalescer
+        self.userinfo_cache = userinfo_cache
+        self.max_clients = max_clients
+        self.idle_seconds = idle_seconds
+        self.max_age_seconds = max_age_seconds
+        self._entries: "OrderedDict[UUID, _RegistryEntry]" = OrderedDict()
+
+    async def get_client(self, session: AsyncSession, tenant_id: UUID) -> OAuthClient:
+        """
+        Get the OAuth client of a tenant.
+
+        Args:
+            session: Database session to load the provider with on first use
+                (subject to the tenant's row-level security context)
+            tenant_id: Tenant UUID
+
+        Returns:
+            The tenant's OAuthClient, or the default client if the tenant has
+            no active provider
+        """
+        now = time.monotonic()
+        entry = self._entries.get(tenant_id)
+        if entry is not None and now - entry.loaded_at < self.max_age_seconds:
+            entry.last_used = now
+            self._entries.move_to_end(tenant_id)
+            return entry.client or self.default_client
+
+        result = await session.execute(
+            select(OAuthProvider).where(
+                OAuthProvider.tenant_id == tenant_id, OAuthProvider.is_active.is_(True)
+            )
+        )
+        provider = result.scalar_one_or_none()
+        client = self.build_client(provider) if provider is not None else None
+
+        self._entries[tenant_id] = _RegistryEntry(client=client, loaded_at=now, last_used=now)
+        self._entries.move_to_end(tenant_id)
+        self._evict(now)
+        logger.debug(
+            "OAuth client loaded",
+            extra={
+                "tenant_id": str(tenant_id),
+                "provider": provider.provider_type.value if provider else "default",
+            },
+        )
+        return client or self.default_client
+
+    def build_client(self, provider: OAuthProvider) -> OAuthClient:
+        """
+        Build the OAuth client of a provider row.
+
+        Args:
+            provider: Tenant's OAuth provider configuration
+
+        Returns:
+            OAuthClient using the shared HTTP pool and caches
+        """
+        oidc_config = None
+        if provider.authorization_endpoint and provider.token_endpoint:
+            oidc_config = OIDCDiscovery(
+                issuer=provider.issuer,
+                authorization_endpoint=provider.authorization_endpoint,
+                token_endpoint=provider.token_endpoint,
+                jwks_uri=provider.jwks_uri,
+                userinfo_endpoint=provider.userinfo_endpoint,
+            )
+        return OAuthClient(
+            client_id=provider.client_id,
+            client_secret=provider.client_secret or "",
+            redirect_uri=settings.OAUTH_REDIRECT_URI,
+            issuer_url=provider.issuer,
+            scopes=settings.OAUTH_SCOPES,
+            use_pkce=settings.OAUTH_USE_PKCE,
+            http_timeout=settings.JWKS_HTTP_TIMEOUT,
+            http_client=self.http_client,
+            discovery_cache=self.discovery_cache,
+            refresh_coalescer=self.refresh_coalescer,
+            userinfo_cache=self.userinfo_cache,
+            oidc_config=oidc_config,
+        )
+
+    def invalidate(self, tenant_id: UUID) -> None:
+        """
+        Drop a tenant's client, so it is rebuilt from the database on next use.
+
+        Args:
+            tenant_id: Tenant UUID
+        """
+        if self._entries.pop(tenant_id, None) is not None:
+            logger.info("OAuth client invalidated", extra={"tenant_id": str(tenant_id)})
+
+    def _evict(self, now: float) -> None:
+        """Drop least recently used tenants beyond the limit, and idle ones."""
+        while len(self._entries) > self.max_clients:
+            self._entries.popitem(last=False)
+        # Entries are ordered by last use, so idle ones are at the front
+        while self._entries:
+            oldest = next(iter(self._entries.values()))
+            if now - oldest.last_used < self.idle_seconds:
+                break
+            self._entries.popitem(last=False)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_provider_changes(session: Session, flush_context: Any) -> None:
+    """Note the tenants of OAuthProvider rows written in the transaction."""
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, OAuthProvider) and obj.tenant_id is not None:
+            session.info.setdefault(_CHANGED_PROVIDER_TENANTS, set()).add(obj.tenant_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_providers(session: Session) -> None:
+    """Drop the clients of tenants whose provider changed, once committed."""
+    tenant_ids = session.info.pop(_CHANGED_PROVIDER_TENANTS, None)
+    if tenant_ids and _oauth_client_registry is not None:
+        for tenant_id in tenant_ids:
+            _oauth_client_registry.invalidate(tenant_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_provider_changes(session: Session) -> None:
+    """Forget provider changes that were rolled back."""
+    session.info.pop(_CHANGED_PROVIDER_TENANTS, None)
+
+
+# Global registry instance (singleton pattern)
+_oauth_client_registry: Optional[OAuthClientRegistry] = None
+
+
+async def get_oauth_client_registry() -> OAuthClientRegistry:
+    """
+    Get global OAuth client registry instance.
+
+    Returns:
+        OAuthClientRegistry falling back to the default OAuth client
+    """
+    global _oauth_client_registry
+    if _oauth_client_registry is None:
+        _oauth_client_registry = OAuthClientRegistry(
+            default_client=await get_oauth_client(),
+            http_client=get_http_client("idp", settings.JWKS_HTTP_TIMEOUT),
+            discovery_cache=await get_oidc_discovery_cache(),
+            refresh_coalescer=await get_refresh_coalescer(),
+            userinfo_cache=UserInfoCache(
+                ttl=settings.USERINFO_CACHE_TTL_SECONDS,
+                max_entries=settings.USERINFO_CACHE_MAX_ENTRIES,
+            ),
+            max_clients=settings.OAUTH_CLIENT_REGISTRY_MAX_CLIENTS,
+            idle_seconds=settings.OAUTH_CLIENT_REGISTRY_IDLE_SECONDS,
+            max_age_seconds=settings.OAUTH_CLIENT_REGISTRY_MAX_AGE_SECONDS,
+        )
+    return _oauth_client_registry
+
+
+async def close_oauth_client_registry() -> None:
+    """
+    Drop the global registry and its tenant clients.
+
+    Should be called when the application shuts down. The tenant clients use
+    shared HTTP clients and caches, closed separately. After calling this,
+    get_oauth_client_registry() creates a new instance on next call.
+    """
+    global _oauth_client_registry
+    _oauth_client_registry = None
@@ -0,0 +1,286 @@
+"""
+OIDC discovery document cache.
+
+The JWKS client (to find jwks_uri) and the OAuth client (to find the
+authorization, token and userinfo endpoints) read the issuer's
+.well-known/openid-configuration through one cache with two tiers:
+
+- Process-local: served without I/O until the document expires
+- Redis: shared by all pods, so one pod fetching a document saves the
+  others the request
+
+Documents expire OIDC_DISCOVERY_CACHE_TTL seconds after they were fetched
+from the identity provider, so configuration changes there are picked up.
+Before that, each pod refreshes in the background at a random point between
+75% and 95% of the TTL: the first pod to refresh fetches from the identity
+provider and stores the document in Redis, the pods refreshing later find
+the newer document there. A fleet thus makes about one discovery request
+per TTL per issuer.
+
+If the identity provider is unreachable, the last document keeps being
+served and the fetch is retried every FAILED_REFRESH_RETRY_SECONDS.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional
+
+import httpx
+import redis.asyncio as redis
+
+from app.core.cache import get_redis_client
+from app.core.config import settings
+from app.core.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+# Refresh window as fractions of the TTL (randomized per pod and document)
+REFRESH_AHEAD_MIN = 0.75
+REFRESH_AHEAD_MAX = 0.95
+
+# Delay before fetching again after a failed refresh (stale document served)
+FAILED_REFRESH_RETRY_SECONDS = 30.0
+
+
+@dataclass(frozen=True)
+class CachedDocument:
+    """A discovery document with its fetch time and local refresh deadlines."""
+
+    document: Dict[str, Any]
+    fetched_at: float  # Unix time the identity provider served the document
+    refresh_at: float  # Unix time to refresh in the background
+    expires_at: float  # Unix time after which the document is not served
+
+
+class OIDCDiscoveryCache:
+    """
+    Two-tier TTL cache of OIDC discovery documents by issuer.
+
+    Concurrent lookups of the same issuer share one load. Single event loop,
+    so no locking.
+
+    Example:
+        cache = await get_oidc_discovery_cache()
+        document = await cache.get(settings.OAUTH_ISSUER_URL)
+        jwks_uri = document["jwks_uri"]
+    """
+
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient,
+        redis_client: Optional[redis.Redis] = None,
+        ttl: int = 3600,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            http_client: HTTP client to fetch documents with (not closed by the cache)
+            redis_client: Redis client of the shared tier (default: process-local only)
+            ttl: Lifetime of a document in seconds, counted from its fetch
+        """
+        self.http_client = http_client
+        self.redis_client = redis_client
+        self.ttl = ttl
+        self._documents: Dict[str, CachedDocument] = {}
+        self._loading: Dict[str, asyncio.Task] = {}
+
+    async def get(self, issuer_url: str) -> Dict[str, Any]:
+        """
+        Get the discovery document of an issuer.
+
+        Args:
+            issuer_url: OAuth issuer URL
+
+        Returns:
+            Discovery document (shared; do not modify)
+
+        Raises:
+            httpx.HTTPError: If no document is cached and the fetch fails
+            ValueError: If the identity provider returns no JSON object
+        """
+        cached = self._documents.get(issuer_url)
+        now = time.time()
+        if cached is not None and now < cached.expires_at:
+            if now >= cached.refresh_at:
+                self._load(issuer_url).add_done_callback(self._log_refresh_failure)
+            return cached.document
+
+        # asyncio.shield: a cancelled caller does not cancel the shared load
+        return (await asyncio.shield(self._load(issuer_url))).document
+
+    def _load(self, issuer_url: str) -> asyncio.Task:
+        """Get the running load of an issuer, starting one if none runs."""
+        task = self._loading.get(issuer_url)
+        if task is None:
+            task = asyncio.create_task(self._refresh(issuer_url))
+            self._loading[issuer_url] = task
+            task.add_done_callback(lambda _: self._loading.pop(issuer_url, None))
+        return task
+
+    async def _refresh(self, issuer_url: str) -> CachedDocument:
+        """Replace an issuer's document with a newer one from Redis or the provider."""
+        current = self._documents.get(issuer_url)
+        shared = await self._read_shared(issuer_url)
+        if (
+            shared is not None
+            and (current is None or shared.fetched_at > current.fetched_at)
+            and time.time() < shared.refresh_at
+        ):
+            self._documents[issuer_url] = shared
+            return shared
+
+        try:
+            document = await self._fetch(issuer_url)
+        except (httpx.HTTPError, ValueError) as e:
+            if current is None:
+                raise
+            now = time.time()
+            logger.warning(
+                "OIDC discovery refresh failed, serving cached document",
+                extra={
+                    "issuer": issuer_url,
+                    "age_seconds": round(now - current.fetched_at),
+                    "error": f"{type(e).__name__}: {e}",
+                },
+            )
+            current = replace(
+                current,
+                refresh_at=now + FAILED_REFRESH_RETRY_SECONDS,
+                expires_at=max(current.expires_at, now + FAILED_REFRESH_RETRY_SECONDS),
+            )
+            self._documents[issuer_url] = current
+            return current
+
+        cached = self._cached(document, time.time())
+        self._documents[issuer_url] = cached
+        await self._write_shared(issuer_url, cached)
+        return cached
+
+    def _cached(self, document: Dict[str, Any], fetched_at: float) -> CachedDocument:
+        """Wrap a document fetched at the given time with this pod's deadlines."""
+        return CachedDocument(
+            document=document,
+            fetched_at=fetched_at,
+            refresh_at=fetched_at + self.ttl * random.uniform(REFRESH_AHEAD_MIN, REFRESH_AHEAD_MAX),
+            expires_at=fetched_at + self.ttl,
+        )
+
+    async def _fetch(self, issuer_url: str) -> Dict[str, Any]:
+        """Fetch the discovery document from the identity provider."""
+        discovery_url = f"{issuer_url}/.well-known/openid-configuration"
+        logger.debug(
+            "Fetching OIDC discovery document",
+            extra={"discovery_url": discovery_url},
+        )
+        response = await self.http_client.get(discovery_url)
+        response.raise_for_status()
+        document = response.json()
+        if not isinstance(document, dict):
+            raise ValueError(f"OIDC discovery document is not a JSON object: {discovery_url}")
+
+        logger.info("OIDC discovery document fetched", extra={"issuer": issuer_url})
+        return document
+
+    async def _read_shared(self, issuer_url: str) -> Optional[CachedDocument]:
+        """
+        Get an issuer's document from Redis.
+
+        Note:
+            Redis failures are logged but don't raise exceptions - the document
+            is fetched from the provider instead.
+        """
+        if self.redis_client is None:
+            return None
+        cache_key = f"oidc_discovery:{issuer_url}"
+        try:
+            cached_data = await self.redis_client.get(cache_key)
+            if not cached_data:
+                return None
+            data = json.loads(cached_data)
+            return self._cached(data["document"], data["fetched_at"])
+        except redis.RedisError as e:
+            logger.warning(
+                "Redis cache read failed",
+                extra={"cache_key": cache_key, "error": str(e)},
+            )
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            logger.warning(
+                "Invalid OIDC discovery entry in Redis cache",
+                extra={"cache_key": cache_key, "error": str(e)},
+            )
+        return None
+
+    async def _write_shared(self, issuer_url: str, cached: CachedDocument) -> None:
+        """Store an issuer's document in Redis until it expires."""
+        if self.redis_client is None:
+            return
+        cache_key = f"oidc_discovery:{issuer_url}"
+        try:
+            await self.redis_client.setex(
+                cache_key,
+                self.ttl,
+                json.dumps({"document": cached.document, "fetched_at": cached.fetched_at}),
+            )
+        except redis.RedisError as e:
+            logger.warning(
+                "Redis cache write failed",
+                extra={"cache_key": cache_key, "error": str(e)},
+            )
+
+    @staticmethod
+    def _log_refresh_failure(task: asyncio.Task) -> None:
+        """Log an unexpected error of a background refresh."""
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(
+                "OIDC discovery background refresh failed",
+                extra={"error": f"{type(task.exception()).__name__}: {task.exception()}"},
+            )
+
+    async def close(self) -> None:
+        """Cancel running loads. The HTTP and Redis clients are left open."""
+        tasks = list(self._loading.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# Global discovery cache instance (singleton pattern)
+_oidc_discovery_cache: Optional[OIDCDiscoveryCache] = None
+
+
+async def get_oidc_discovery_cache() -> OIDCDiscoveryCache:
+    """
+    Get global OIDC discovery cache instance.
+
+    Uses the shared identity provider HTTP client and the shared Redis
+    client (process-local only if Redis is unavailable).
+
+    Returns:
+        OIDCDiscoveryCache shared by the JWKS and OAuth clients
+    """
+    global _oidc_discovery_cache
+    if _oidc_discovery_cache is None:
+        _oidc_discovery_cache = OIDCDiscoveryCache(
+            http_client=get_http_client("idp", settings.JWKS_HTTP_TIMEOUT),
+            redis_client=await get_redis_client(),
+            ttl=settings.OIDC_DISCOVERY_CACHE_TTL,
+        )
+    return _oidc_discovery_cache
+
+
+async def close_oidc_discovery_cache() -> None:
+    """
+    Stop the global discovery cache's background refreshes.
+
+    Should be called when the application shuts down. After calling this,
+    get_oidc_discovery_cache() creates a new instance on next call.
+    """
+    global _oidc_discovery_cache
+    if _oidc_discovery_cache is not None:
+        await _oidc_discovery_cache.close()
+        _oidc_discovery_cache = None
@@ -0,0 +1,227 @@
+"""
+In-process sampling profiler for diagnosing CPU hot spots in production.
+
+A background thread periodically captures the Python stack of every thread
+with sys._current_frames() and counts identical stacks. Nothing is
+instrumented while no profile is running, and the cost during a profile is
+one stack walk per thread per interval, so it is safe to run against live
+traffic for short periods.
+
+Samples are attributed to the route that was being served: while a profile
+is running, ProfilerMiddleware registers the frame of each request's ASGI
+call together with its scope. When a sampled stack passes through one of
+those frames, its route template becomes the root of the stack. Context
+variables cannot be read from another thread, so the frame registry plays
+the role of the request context for the sampler.
+
+The result is returned in collapsed-stack format ("frame;frame;frame count"
+per line), which flamegraph.pl, speedscope and Grafana's flame graph panel
+read directly.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from types import FrameType
+from typing import Dict, List, Optional, Tuple
+
+from starlette.types import Scope
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("wall", "cpu")
+
+# Innermost Python frames of threads that are parked rather than running.
+# "cpu" mode discards these samples, approximating on-CPU time: an idle
+# event loop sits in the selector, idle worker threads wait on a queue.
+IDLE_FRAMES = frozenset({
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+    ("socket.py", "accept"),
+})
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profile is requested while another one is running."""
+
+
+def _frame_label(frame: FrameType) -> str:
+    """Format a frame as "qualname (file:line)" without stack separators."""
+    code = frame.f_code
+    filename = os.path.basename(code.co_filename)
+    return f"{code.co_qualname} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+def _route_label(scope: Scope) -> str:
+    """Describe a tracked request by method and matched route template."""
+    route = scope.get("route")
+    path = getattr(route, "path", None) or "unmatched"
+    return f"{scope.get('method', '')} {path}".strip()
+
+
+class SamplingProfiler:
+    """
+    Stack sampling profiler with per-route attribution.
+
+    Only one profile runs at a time. The profile itself runs on the calling
+    thread, so async callers should use asyncio.to_thread().
+
+    Example:
+        profiler = get_profiler()
+        samples = profiler.profile(seconds=10)
+        print(profiler.collapse(samples))
+    """
+
+    def __init__(self) -> None:
+        """Initialize an idle profiler."""
+        self._lock = threading.Lock()
+        self._requests: Dict[FrameType, Scope] = {}
+        self.running = False
+
+    def track(self, frame: FrameType, scope: Scope) -> None:
+        """
+        Attribute samples passing through a request's frame to its route.
+
+        Args:
+            frame: Frame of the request's outermost tracked ASGI call
+            scope: ASGI scope of the request; the route is read at sample time
+        """
+        self._requests[frame] = scope
+
+    def untrack(self, frame: FrameType) -> None:
+        """
+        Stop attributing samples to a finished request.
+
+        Args:
+            frame: Frame previously passed to track()
+        """
+        self._requests.pop(frame, None)
+
+    def profile(
+        self,
+        seconds: float,
+        interval: float = 0.01,
+        mode: str = "wall",
+    ) -> Counter:
+        """
+        Sample all thread stacks for a period of time.
+
+        Args:
+            seconds: How long to profile
+            interval: Time between samples in seconds
+            mode: "wall" keeps every sample, "cpu" drops samples of idle threads
+
+        Returns:
+            Counter of collapsed stacks (root first, ";"-separated) to sample counts
+
+        Raises:
+            ProfilerBusyError: If another profile is already running
+            ValueError: If mode is not one of PROFILE_MODES
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"mode must be one of {PROFILE_MODES}")
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already running")
+
+        samples: Counter = Counter()
+        sampler_id = threading.get_ident()
+        self.running = True
+        started = time.monotonic()
+        try:
+            deadline = started + seconds
+            while time.monotonic() < deadline:
+                thread_names = {t.ident: t.name for t in threading.enumerate()}
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == sampler_id:
+                        continue
+                    stack = self._collapse_stack(frame, mode)
+                    if stack is None:
+                        continue
+                    root, frames = stack
+                    if root is None:
+                        root = f"thread:{thread_names.get(thread_id, thread_id)}"
+                    samples[";".join([root, *frames])] += 1
+                time.sleep(interval)
+        finally:
+            self.running = False
+            self._requests.clear()
+            self._lock.release()
+
+        logger.info(
+            "Profile completed",
+            extra={
+                "mode": mode,
+                "duration_seconds": round(time.monotonic() - started, 3),
+                "samples": sum(samples.values()),
+                "stacks": len(samples),
+            },
+        )
+        return samples
+
+    def _collapse_stack(
+        self, frame: FrameType, mode: str
+    ) -> Optional[Tuple[Optional[str], List[str]]]:
+        """
+        Walk a thread's stack from the innermost frame outwards.
+
+        Args:
+            frame: Innermost frame of the thread
+            mode: Profile mode, see profile()
+
+        Returns:
+            (route label, or None outside a tracked request, and frame labels
+            root first), or None if the sample is discarded as idle
+        """
+        code = frame.f_code
+        if mode == "cpu" and (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+            return None
+
+        root: Optional[str] = None
+        frames: List[str] = []
+        current: Optional[FrameType] = frame
+        while current is not None:
+            scope = self._requests.get(current)
+            if scope is not None:
+                root = _route_label(scope)
+                break
+            frames.append(_frame_label(current))
+            current = current.f_back
+
+        frames.reverse()
+        return root, frames
+
+    @staticmethod
+    def collapse(samples: Counter) -> str:
+        """
+        Render samples in collapsed-stack format, most frequent first.
+
+        Args:
+            samples: Result of profile()
+
+        Returns:
+            One "stack count" line per distinct stack
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in samples.most_common())
+
+
+# Global profiler instance (singleton pattern)
+_profiler: Optional[SamplingProfiler] = None
+
+
+def get_profiler() -> SamplingProfiler:
+    """
+    Get global profiler instance.
+
+    Returns:
+        SamplingProfiler shared by ProfilerMiddleware and the admin endpoint
+    """
+    global _profiler
+    if _profiler is None:
+        _profiler = SamplingProfiler()
+    return _profiler
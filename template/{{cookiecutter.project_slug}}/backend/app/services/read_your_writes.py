@@ -0,0 +1,84 @@
+"""
+Read-your-writes markers for read replica routing.
+
+Replicas apply the primary's changes asynchronously, so a user who has just
+written data may not see it when the next request reads from a replica. After
+a write, a short-lived per-user marker is stored in Redis; while it exists,
+that user's reads are served by the primary. Markers expire on their own after
+DATABASE_READ_YOUR_WRITES_SECONDS, which should exceed the expected replica lag.
+
+Redis failures fail toward consistency: if the marker cannot be read, the
+read goes to the primary.
+"""
+
+import logging
+from uuid import UUID
+
+import redis.asyncio as redis
+
+from app.core.cache import get_redis_client
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _marker_key(tenant_id: UUID, user_id: str) -> str:
+    """Build the Redis key for a user's recent-write marker."""
+    return f"recent_write:{tenant_id}:{user_id}"
+
+
+async def mark_recent_write(tenant_id: UUID, user_id: str) -> None:
+    """
+    Record that a user has just committed a write.
+
+    Args:
+        tenant_id: Tenant the write belongs to
+        user_id: User who performed the write (OAuth subject)
+
+    Note:
+        Redis failures are logged but don't raise exceptions - the write has
+        already been committed and must not fail the request.
+    """
+    redis_client = await get_redis_client()
+    if redis_client is None:
+        return
+
+    key = _marker_key(tenant_id, user_id)
+    try:
+        await redis_client.set(key, "1", ex=settings.DATABASE_READ_YOUR_WRITES_SECONDS)
+        logger.debug(
+            "Recent write marker set",
+            extra={"redis_key": key, "ttl": settings.DATABASE_READ_YOUR_WRITES_SECONDS},
+        )
+    except redis.RedisError as e:
+        logger.warning(
+            "Redis error setting recent write marker",
+            extra={"redis_key": key, "error": str(e)},
+        )
+
+
+async def has_recent_write(tenant_id: UUID, user_id: str) -> bool:
+    """
+    Check whether a user's reads must go to the primary.
+
+    Args:
+        tenant_id: Tenant of the current request
+        user_id: User of the current request (OAuth subject)
+
+    Returns:
+        True if the user wrote recently or the marker cannot be checked,
+        False if reads can safely be served by a replica
+    """
+    redis_client = await get_redis_client()
+    if redis_client is None:
+        return True
+
+    key = _marker_key(tenant_id, user_id)
+    try:
+        return bool(await redis_client.exists(key))
+    except redis.RedisError as e:
+        logger.warning(
+            "Redis error checking recent write marker, reading from primary",
+            extra={"redis_key": key, "error": str(e)},
+        )
+        return True
@@ -0,0 +1,173 @@
+"""
+Graceful shutdown: draining in-flight requests and closing client pools.
+
+The application lifespan coordinates shutdown in this order:
+
+1. Stop accepting work: RequestDrainMiddleware answers new requests with
+   503 and "Connection: close" (which also fails the readiness probe)
+2. Drain: wait up to SHUTDOWN_DRAIN_TIMEOUT_SECONDS for in-flight requests
+3. Stop background tasks (health monitor, warm-up)
+{%- if cookiecutter.include_observability == "yes" %}
+4. Flush buffered spans to the trace exporter
+5. Close every client pool (database, Redis, HTTP)
+{%- else %}
+4. Close every client pool (database, Redis, HTTP)
+{%- endif %}
+
+Uvicorn stops accepting connections and waits for open requests itself
+before running the lifespan shutdown (bounded by --timeout-graceful-shutdown);
+the drain here covers servers that do not, and requests still running
+(e.g. streaming responses) when the lifespan shutdown starts.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from app.core.cache import close_redis_client
+from app.core.database import close_db
+from app.core.http_client import close_http_clients
+from app.core.rate_limit import close_rate_limiter
+{%- if cookiecutter.include_observability == "yes" %}
+from app.observability import shutdown_abandoned_requests_total, shutdown_drain_seconds
+{%- endif %}
+from app.services.jwks_client import close_jwks_client
+from app.services.oauth_client import close_oauth_client
+from app.services.oauth_client_registry import close_oauth_client_registry
+from app.services.oidc_discovery import close_oidc_discovery_cache
+from app.services.token_refresh import close_refresh_coalescer
+from app.services.token_revocation import close_token_revocation_service
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTracker:
+    """
+    Counts in-flight HTTP requests and drains them at shutdown.
+
+    Updated by RequestDrainMiddleware; single event loop, so no locking.
+
+    Example:
+        tracker = get_request_tracker()
+        abandoned = await tracker.drain(timeout=20)
+    """
+
+    def __init__(self) -> None:
+        """Initialize a tracker accepting requests."""
+        self.in_flight = 0
+        self.draining = False
+        self._idle: Optional[asyncio.Event] = None
+
+    def accept_requests(self) -> None:
+        """Accept new requests again after a completed shutdown."""
+        self.draining = False
+
+    def request_started(self) -> None:
+        """Count a request as in flight."""
+        self.in_flight += 1
+
+    def request_finished(self) -> None:
+        """Count a request as finished, waking a pending drain when idle."""
+        self.in_flight -= 1
+        if self.in_flight == 0 and self._idle is not None:
+            self._idle.set()
+
+    async def drain(self, timeout: float) -> int:
+        """
+        Stop accepting requests and wait for in-flight ones to finish.
+
+        Args:
+            timeout: Longest time to wait in seconds
+
+        Returns:
+            Number of requests still in flight when the wait ended
+        """
+        self.draining = True
+        # Created per drain, so it belongs to the event loop shutting down
+        self._idle = asyncio.Event()
+        if self.in_flight == 0:
+            self._idle.set()
+
+        in_flight = self.in_flight
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._idle = None
+        duration = time.perf_counter() - start
+        abandoned = self.in_flight
+{%- if cookiecutter.include_observability == "yes" %}
+
+        shutdown_drain_seconds.observe(duration)
+        if abandoned:
+            shutdown_abandoned_requests_total.inc(abandoned)
+{%- endif %}
+
+        log = logger.warning if abandoned else logger.info
+        log(
+            "Request drain finished",
+            extra={
+                "in_flight_at_start": in_flight,
+                "abandoned": abandoned,
+                "duration_ms": round(duration * 1000, 1),
+            },
+        )
+        return abandoned
+
+
+# Global request tracker instance (singleton pattern)
+_request_tracker: Optional[RequestTracker] = None
+
+
+def get_request_tracker() -> RequestTracker:
+    """
+    Get global request tracker instance.
+
+    Returns:
+        RequestTracker shared by the drain middleware and the lifespan
+    """
+    global _request_tracker
+    if _request_tracker is None:
+        _request_tracker = RequestTracker()
+    return _request_tracker
+
+
+async def close_clients() -> None:
+    """
+    Close every client pool, continuing past failures.
+
+    Covers the database engines, the shared Redis client, the Redis clients
+    of the rate limiter and token revocation service, the JWKS client, the
+    default and per-tenant OAuth clients with their OIDC discovery cache,
+    and the shared HTTP clients they send requests with. Each close is
+    logged with its duration.
+    """
+    closers: List[Tuple[str, Callable[[], Awaitable[None]]]] = [
+        ("oauth_client_registry", close_oauth_client_registry),
+        ("oauth_client", close_oauth_client),
+        ("jwks_client", close_jwks_client),
+        ("oidc_discovery_cache", close_oidc_discovery_cache),
+        ("refresh_coalescer", close_refresh_coalescer),
+        ("http_clients", close_http_clients),
+        ("rate_limiter", close_rate_limiter),
+        ("token_revocation", close_token_revocation_service),
+        ("redis", close_redis_client),
+        ("database", close_db),
+    ]
+    for name, close in closers:
+        start = time.perf_counter()
+        try:
+            await close()
+        except Exception as e:
+            logger.warning(
+                "Failed to close client",
+                extra={"client": name, "error": f"{type(e).__name__}: {e}"},
+            )
+            continue
+        logger.debug(
+            "Client closed",
+            extra={"client": name, "duration_ms": round((time.perf_counter() - start) * 1000, 1)},
+        )
@@ -0,0 +1,122 @@
+"""
+In-memory log of slow requests for diagnosing latency outliers.
+
+Requests that take longer than SLOW_REQUEST_THRESHOLD_MS are recorded with
+what is needed to explain them after the fact: route, tenant, per-phase
+timings, the SQL statements executed, the number of Redis commands, and a
+snapshot of the request task's stack taken when it crossed the threshold,
+which shows what the request was waiting on at that moment.
+
+Records are kept in a bounded ring buffer per worker process; the oldest
+record is discarded when it is full. SQL is recorded without parameters.
+"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+# Maximum SQL statements kept per slow request
+MAX_STATEMENTS = 50
+
+# Maximum frames kept in a stack snapshot (innermost frames are kept)
+MAX_STACK_FRAMES = 30
+
+
+@dataclass
+class SlowRequest:
+    """
+    Diagnostic record of one slow request.
+
+    Attributes:
+        timestamp: When the request started (UTC)
+        method: HTTP method
+        route: Matched route template, or "unmatched"
+        path: Request path
+        status_code: Response status (500 if no response was sent)
+        duration_ms: Total request duration
+        tenant_id: Resolved tenant, if any
+        timings_ms: Per-phase durations (see app.core.timing)
+        redis_calls: Number of Redis commands executed
+        statements: Executed SQL statements with durations in milliseconds
+        stack: Request task stack when the threshold was crossed, outermost
+            first, or None if the request finished before it could be taken
+    """
+
+    timestamp: datetime
+    method: str
+    route: str
+    path: str
+    status_code: int
+    duration_ms: float
+    tenant_id: Optional[str] = None
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+    redis_calls: int = 0
+    statements: List[Tuple[str, float]] = field(default_factory=list)
+    stack: Optional[List[str]] = None
+
+
+class SlowRequestLog:
+    """
+    Bounded, thread-safe ring buffer of slow request records.
+
+    Example:
+        log = get_slow_request_log()
+        for record in log.entries():
+            print(record.route, record.duration_ms)
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Initialize an empty log.
+
+        Args:
+            capacity: Maximum number of records kept
+        """
+        self._records: Deque[SlowRequest] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def add(self, record: SlowRequest) -> None:
+        """
+        Add a record, discarding the oldest one if the log is full.
+
+        Args:
+            record: Slow request to keep
+        """
+        with self._lock:
+            self._records.append(record)
+
+    def entries(self) -> List[SlowRequest]:
+        """
+        Get the recorded slow requests.
+
+        Returns:
+            Records, newest first
+        """
+        with self._lock:
+            return list(reversed(self._records))
+
+    def clear(self) -> None:
+        """Discard all records."""
+        with self._lock:
+            self._records.clear()
+
+
+# Global slow request log instance (singleton pattern)
+_slow_request_log: Optional[SlowRequestLog] = None
+
+
+def get_slow_request_log() -> SlowRequestLog:
+    """
+    Get global slow request log instance.
+
+    Returns:
+        SlowRequestLog sized by SLOW_REQUEST_BUFFER_SIZE
+    """
+    global _slow_request_log
+    if _slow_request_log is None:
+        _slow_request_log = SlowRequestLog(settings.SLOW_REQUEST_BUFFER_SIZE)
+    return _slow_request_log
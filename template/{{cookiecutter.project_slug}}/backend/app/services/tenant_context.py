@@ -9,6 +9,7 @@ Security Critical: All queries MUST have tenant context set before execution to
 prevent cross-tenant data leakage.
 """
 
+from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text, select
 from uuid import UUID
@@ -17,15 +18,24 @@ import logging
 
 from app.models.tenant import Tenant
 from app.core.context import set_current_tenant, clear_current_tenant
+from app.core.database import run_on_begin
+from app.core.timing import timed
 
 logger = logging.getLogger(__name__)
 
+# TRUE makes the setting transaction-scoped (equivalent to SET LOCAL)
+SET_TENANT_CONTEXT_SQL = text("SELECT set_config('app.current_tenant_id', :tenant_id, TRUE)")
+
+# session.info key holding the tenant already validated by defer_tenant_context()
+SESSION_TENANT_VALIDATED = "tenant_validated"
+
 
 class TenantContextError(Exception):
     """Raised when tenant context operations fail."""
     pass
 
 
+@timed("tenant_context")
 async def set_tenant_context(
     session: AsyncSession,
     tenant_id: UUID,
@@ -59,10 +69,7 @@ async def set_tenant_context(
 
         # Set PostgreSQL session variable for RLS policies
         # TRUE parameter makes this transaction-scoped (LOCAL)
-        await session.execute(
-            text("SELECT set_config('app.current_tenant_id', :tenant_id, TRUE)"),
-            {"tenant_id": str(tenant_id)}
-        )
+        await session.execute(SET_TENANT_CONTEXT_SQL, {"tenant_id": str(tenant_id)})
 
         # Also set in contextvars for application-level tracking
         set_current_tenant(tenant_id)
@@ -86,6 +93,104 @@ async def set_tenant_context(
         raise TenantContextError(f"Failed to set tenant context: {e}") from e
 
 
+def defer_tenant_context(
+    session: AsyncSession,
+    tenant_id: UUID,
+    validate: bool = True,
+    required: bool = True,
+) -> None:
+    """
+    Set tenant context lazily, when the session first touches the database.
+
+    Lazy counterpart of set_tenant_context() used by the request-scoped
+    session dependencies. Nothing is executed here: validation and the
+    `app.current_tenant_id` setting are applied on the session's connection
+    at the start of each transaction, before any other statement runs. A
+    request whose handler never queries the database therefore costs no
+    pool checkout and no round trips, while RLS is still enforced for every
+    statement that does run - including statements in transactions opened
+    after a mid-request commit. The tenant is validated once per session;
+    later transactions only re-apply the setting. As with
+    set_tenant_context(), the contextvar is set only once validation succeeds.
+
+    Args:
+        session: SQLAlchemy async session
+        tenant_id: UUID of the tenant to set as current context
+        validate: If True, validates tenant exists and is active (default: True)
+        required: If True, a failed validation raises TenantContextError from
+            the first statement; if False, the transaction continues without
+            tenant context (default: True)
+
+    Example:
+        defer_tenant_context(session, tenant_id)
+        # No database work yet; the first query sets context, then runs
+        result = await session.execute(select(User))
+    """
+    def apply(connection: Connection) -> None:
+        _apply_tenant_context(connection, session.info, tenant_id, validate, required)
+
+    run_on_begin(session, apply)
+
+    logger.debug("Tenant context deferred: tenant_id=%s, validated=%s", tenant_id, validate)
+
+
+def _apply_tenant_context(
+    connection: Connection,
+    session_info: dict,
+    tenant_id: UUID,
+    validate: bool,
+    required: bool,
+) -> None:
+    """
+    Apply deferred tenant context on a connection at transaction start.
+
+    Args:
+        connection: Connection the session transaction is using
+        session_info: The session's info dict, recording a successful validation
+        tenant_id: UUID of the tenant to set as current context
+        validate: If True, validates tenant exists and is active
+        required: If False, validation failures are logged instead of raised
+
+    Raises:
+        TenantContextError: If validation fails (when required) or the
+            session variable cannot be set
+    """
+    if validate and session_info.get(SESSION_TENANT_VALIDATED) != tenant_id:
+        is_active = connection.execute(
+            select(Tenant.is_active).where(Tenant.id == tenant_id)
+        ).scalar_one_or_none()
+
+        if not is_active:
+            reason = "does not exist" if is_active is None else "is not active"
+            if required:
+                logger.error("Tenant validation failed: tenant_id=%s, reason=%s", tenant_id, reason)
+                raise TenantContextError(f"Tenant {tenant_id} {reason}")
+            logger.warning(
+                "Optional tenant context validation failed, continuing without tenant: "
+                "tenant_id=%s, reason=%s",
+                tenant_id,
+                reason,
+            )
+            clear_current_tenant()
+            return
+
+        session_info[SESSION_TENANT_VALIDATED] = tenant_id
+
+    try:
+        connection.execute(SET_TENANT_CONTEXT_SQL, {"tenant_id": str(tenant_id)})
+    except Exception as e:
+        logger.error(
+            "Failed to set tenant context: tenant_id=%s, error=%s, error_type=%s",
+            tenant_id,
+            str(e),
+            type(e).__name__
+        )
+        raise TenantContextError(f"Failed to set tenant context: {e}") from e
+
+    # Also set in contextvars for application-level tracking
+    set_current_tenant(tenant_id)
+
+
 async def clear_tenant_context(session: AsyncSession) -> None:
     """
     Clear tenant context from PostgreSQL session.
@@ -19,6 +19,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.cache import get_redis_client
+from app.core.timing import timed
 from app.models.tenant import Tenant
 from app.schemas.tenant import TenantInfo, TenantInactiveError, TenantNotFoundError
 
@@ -67,6 +68,7 @@ class TenantResolver:
             self.redis = await get_redis_client()
         return self.redis
 
+    @timed("tenant")
     async def resolve_by_id(
         self,
         session: AsyncSession,
@@ -103,7 +105,7 @@ class TenantResolver:
         tenant_info = await self._get_from_cache(cache_key)
         if tenant_info:
             logger.debug(
-                f"Tenant resolved from cache: tenant_id={tenant_id}, cache_key={cache_key}"
+                "Tenant resolved from cache: tenant_id=%s, cache_key=%s", tenant_id, cache_key
             )
             if require_active and not tenant_info.is_active:
                 raise TenantInactiveError(f"Tenant {tenant_id} is not active")
@@ -114,7 +116,7 @@ class TenantResolver:
         tenant = result.scalar_one_or_none()
 
         if tenant is None:
-            logger.error(f"Tenant not found: tenant_id={tenant_id}")
+            logger.error("Tenant not found: tenant_id=%s", tenant_id)
             raise TenantNotFoundError(f"Tenant {tenant_id} not found")
 
         tenant_info = TenantInfo.model_validate(tenant)
@@ -123,8 +125,10 @@ class TenantResolver:
         await self._set_in_cache(cache_key, tenant_info)
 
         logger.info(
-            f"Tenant resolved from DB: tenant_id={tenant_id}, "
-            f"tenant_slug={tenant_info.slug}, is_active={tenant_info.is_active}"
+            "Tenant resolved from DB: tenant_id=%s, tenant_slug=%s, is_active=%s",
+            tenant_id,
+            tenant_info.slug,
+            tenant_info.is_active,
         )
 
         if require_active and not tenant_info.is_active:
@@ -132,6 +136,7 @@ class TenantResolver:
 
         return tenant_info
 
+    @timed("tenant")
     async def resolve_by_slug(
         self,
         session: AsyncSession,
@@ -167,7 +172,7 @@ class TenantResolver:
         tenant_info = await self._get_from_cache(cache_key)
         if tenant_info:
             logger.debug(
-                f"Tenant resolved from cache: tenant_slug={slug}, cache_key={cache_key}"
+                "Tenant resolved from cache: tenant_slug=%s, cache_key=%s", slug, cache_key
             )
             if require_active and not tenant_info.is_active:
                 raise TenantInactiveError(f"Tenant '{slug}' is not active")
@@ -178,7 +183,7 @@ class TenantResolver:
         tenant = result.scalar_one_or_none()
 
         if tenant is None:
-            logger.error(f"Tenant not found: tenant_slug={slug}")
+            logger.error("Tenant not found: tenant_slug=%s", slug)
             raise TenantNotFoundError(f"Tenant '{slug}' not found")
 
         tenant_info = TenantInfo.model_validate(tenant)
@@ -188,8 +193,10 @@ class TenantResolver:
         await self._set_in_cache(f"tenant:id:{tenant_info.id}", tenant_info)
 
         logger.info(
-            f"Tenant resolved from DB: tenant_id={tenant_info.id}, "
-            f"tenant_slug={slug}, is_active={tenant_info.is_active}"
+            "Tenant resolved from DB: tenant_id=%s, tenant_slug=%s, is_active=%s",
+            tenant_info.id,
+            slug,
+            tenant_info.is_active,
         )
 
         if require_active and not tenant_info.is_active:
@@ -321,9 +328,7 @@ class TenantResolver:
             # Serialize TenantInfo to JSON
             tenant_json = tenant_info.model_dump_json()
             await redis.setex(cache_key, self.cache_ttl, tenant_json)
-            logger.debug(
-                f"Tenant cached: cache_key={cache_key}, ttl={self.cache_ttl}"
-            )
+            logger.debug("Tenant cached: cache_key=%s, ttl=%s", cache_key, self.cache_ttl)
         except Exception as e:
             logger.warning(
                 f"Cache set failed: cache_key={cache_key}, "
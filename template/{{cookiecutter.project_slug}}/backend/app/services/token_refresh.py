@@ -0,0 +1,232 @@
+"""
+Single-flight coalescing of refresh token exchanges.
+
+When an access token expires, a SPA with several tabs or parallel API calls
+sends several /oauth/token/refresh requests with the same refresh token at
+once. Exchanging each of them at the identity provider multiplies the load,
+and with refresh token rotation every exchange but the first fails, logging
+the user out. RefreshCoalescer makes one exchange serve all of them:
+
+- In-process: concurrent refreshes of a token wait for the first one
+- Across workers and pods (with Redis): the first worker takes a short lock
+  (TOKEN_REFRESH_LOCK_SECONDS) and stores the token response for
+  TOKEN_REFRESH_RESULT_TTL_SECONDS; the others wait for that response
+
+Refresh tokens are identified by their SHA-256 digest. The stored response
+is encrypted with a key derived from the refresh token, so reading it from
+Redis requires the refresh token it was exchanged for.
+
+If Redis is unavailable, or the lock holder does not store a response in
+time, the refresh is exchanged directly, as without coalescing.
+"""
+
+import asyncio
+import base64
+import hashlib
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+import redis.asyncio as redis
+from cryptography.fernet import Fernet, InvalidToken
+
+from app.core.cache import get_redis_client
+from app.core.config import settings
+from app.schemas.oauth import TokenResponse
+
+logger = logging.getLogger(__name__)
+
+# Interval between checks for the lock holder's response
+POLL_INTERVAL_SECONDS = 0.05
+
+TokenExchange = Callable[[], Awaitable[TokenResponse]]
+
+
+def refresh_token_digest(refresh_token: str) -> str:
+    """Identify a refresh token without revealing it (hex SHA-256 digest)."""
+    return hashlib.sha256(refresh_token.encode("utf-8")).hexdigest()
+
+
+def _fernet(refresh_token: str) -> Fernet:
+    """Encryption of the stored response, keyed by the refresh token."""
+    key = hashlib.sha256(b"token-refresh-result:" + refresh_token.encode("utf-8")).digest()
+    return Fernet(base64.urlsafe_b64encode(key))
+
+
+class RefreshCoalescer:
+    """
+    Coalesces concurrent exchanges of the same refresh token.
+
+    Single event loop, so no locking in-process.
+
+    Example:
+        coalescer = RefreshCoalescer(await get_redis_client())
+        token = await coalescer.refresh(refresh_token, exchange)
+    """
+
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis] = None,
+        lock_seconds: float = 10.0,
+        result_ttl: int = 30,
+    ):
+        """
+        Initialize the coalescer.
+
+        Args:
+            redis_client: Redis client for coalescing across workers
+                (default: in-process only)
+            lock_seconds: Longest time one exchange holds the lock; also the
+                longest time other workers wait for its response
+            result_ttl: Seconds the response is kept for late concurrent callers
+        """
+        self.redis_client = redis_client
+        self.lock_seconds = lock_seconds
+        self.result_ttl = result_ttl
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+    async def refresh(self, refresh_token: str, exchange: TokenExchange) -> TokenResponse:
+        """
+        Exchange a refresh token, sharing the result with concurrent callers.
+
+        Args:
+            refresh_token: Refresh token to exchange
+            exchange: Coroutine function performing the exchange at the provider
+
+        Returns:
+            TokenResponse of the one exchange
+
+        Raises:
+            httpx.HTTPError: If the exchange fails (raised to every waiting caller)
+        """
+        digest = refresh_token_digest(refresh_token)
+        task = self._in_flight.get(digest)
+        if task is None:
+            task = asyncio.create_task(self._refresh_shared(digest, refresh_token, exchange))
+            self._in_flight[digest] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(digest, None))
+        else:
+            logger.debug("Joining in-flight token refresh", extra={"digest": digest[:12]})
+
+        # asyncio.shield: a cancelled caller does not cancel the shared exchange
+        return await asyncio.shield(task)
+
+    async def _refresh_shared(
+        self, digest: str, refresh_token: str, exchange: TokenExchange
+    ) -> TokenResponse:
+        """Exchange once across workers, or wait for another worker's exchange."""
+        if self.redis_client is None:
+            return await exchange()
+
+        result_key = f"token_refresh:result:{digest}"
+        try:
+            cached = await self._read_result(result_key, refresh_token)
+            if cached is not None:
+                return cached
+            lock_key = f"token_refresh:lock:{digest}"
+            lock = self.redis_client.lock(lock_key, timeout=self.lock_seconds, blocking=False)
+            acquired = await lock.acquire()
+        except redis.RedisError as e:
+            logger.warning(
+                "Token refresh coalescing unavailable",
+                extra={"digest": digest[:12], "error": str(e)},
+            )
+            return await exchange()
+
+        if not acquired:
+            cached = await self._wait_for_result(result_key, lock_key, refresh_token)
+            if cached is not None:
+                return cached
+            logger.warning(
+                "No result from concurrent token refresh, exchanging directly",
+                extra={"digest": digest[:12]},
+            )
+            return await exchange()
+
+        try:
+            token_response = await exchange()
+            encrypted = _fernet(refresh_token).encrypt(
+                token_response.model_dump_json().encode("utf-8")
+            )
+            try:
+                await self.redis_client.setex(result_key, self.result_ttl, encrypted)
+            except redis.RedisError as e:
+                logger.warning(
+                    "Failed to store token refresh result",
+                    extra={"digest": digest[:12], "error": str(e)},
+                )
+            return token_response
+        finally:
+            try:
+                await lock.release()
+            except redis.RedisError:
+                pass  # Expires after lock_seconds
+
+    async def _read_result(self, result_key: str, refresh_token: str) -> Optional[TokenResponse]:
+        """Get the stored response of an exchange by another worker."""
+        data = await self.redis_client.get(result_key)
+        if not data:
+            return None
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        try:
+            decrypted = _fernet(refresh_token).decrypt(data)
+        except InvalidToken:
+            logger.warning("Invalid token refresh result in Redis", extra={"key": result_key})
+            return None
+        logger.debug("Using token refresh result of another worker")
+        return TokenResponse.model_validate_json(decrypted)
+
+    async def _wait_for_result(
+        self, result_key: str, lock_key: str, refresh_token: str
+    ) -> Optional[TokenResponse]:
+        """Poll for the lock holder's response until it is released or expires."""
+        deadline = time.monotonic() + self.lock_seconds
+        while time.monotonic() < deadline:
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+            try:
+                cached = await self._read_result(result_key, refresh_token)
+                if cached is not None:
+                    return cached
+                if not await self.redis_client.exists(lock_key):
+                    # Released: stored just now, or the exchange failed
+                    return await self._read_result(result_key, refresh_token)
+            except redis.RedisError:
+                return None
+        return None
+
+
+# Global coalescer instance (singleton pattern)
+_refresh_coalescer: Optional[RefreshCoalescer] = None
+
+
+async def get_refresh_coalescer() -> RefreshCoalescer:
+    """
+    Get global refresh coalescer instance.
+
+    Coalesces across workers through the shared Redis client, or in-process
+    only if Redis is unavailable.
+
+    Returns:
+        RefreshCoalescer used by the OAuth client
+    """
+    global _refresh_coalescer
+    if _refresh_coalescer is None:
+        _refresh_coalescer = RefreshCoalescer(
+            redis_client=await get_redis_client(),
+            lock_seconds=settings.TOKEN_REFRESH_LOCK_SECONDS,
+            result_ttl=settings.TOKEN_REFRESH_RESULT_TTL_SECONDS,
+        )
+    return _refresh_coalescer
+
+
+async def close_refresh_coalescer() -> None:
+    """
+    Release the global refresh coalescer.
+
+    Should be called when the application shuts down, after the OAuth client.
+    After calling this, get_refresh_coalescer() creates a new instance with
+    the current Redis client on next call.
+    """
+    global _refresh_coalescer
+    _refresh_coalescer = None
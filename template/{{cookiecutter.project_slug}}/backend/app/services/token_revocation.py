@@ -5,6 +5,7 @@ from typing import Optional
 
 import redis.asyncio as redis
 
+from app.core.cache import TimedRedis
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -231,7 +232,7 @@ async def get_token_revocation_service() -> TokenRevocationService:
 
     if _token_revocation_service is None:
         # Create Redis client
-        redis_client = redis.from_url(
+        redis_client = TimedRedis.from_url(
             settings.REDIS_URL,
             encoding="utf-8",
             decode_responses=True,
@@ -245,3 +246,18 @@ async def get_token_revocation_service() -> TokenRevocationService:
         )
 
     return _token_revocation_service
+
+
+async def close_token_revocation_service() -> None:
+    """
+    Close the token revocation service's Redis connection pool.
+
+    Should be called when the application shuts down. After calling this,
+    get_token_revocation_service() creates a new instance on next call.
+    """
+    global _token_revocation_service
+
+    if _token_revocation_service is not None:
+        await _token_revocation_service.redis_client.aclose()
+        _token_revocation_service = None
+        logger.debug("Token revocation service closed")
@@ -0,0 +1,135 @@
+"""
+Userinfo lookups without identity provider round trips.
+
+OAuthClient.get_user_info avoids calling the userinfo endpoint in two ways:
+
+- Claims first: the validated ID or access token usually carries the profile
+  claims already (sub, email, name, ...); when it has every claim the caller
+  needs, the UserInfo is built from it
+- Cache: userinfo responses are kept per access token for
+  USERINFO_CACHE_TTL_SECONDS, never beyond the token's expiry
+
+The cache is process-local: profile data is not copied to Redis. Access
+tokens are identified by their SHA-256 digest.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import jwt
+
+from app.core.config import settings
+from app.schemas.oauth import UserInfo
+
+# Profile claims needed by default for the claims-first path (besides sub)
+DEFAULT_PROFILE_CLAIMS = ("email", "name")
+
+
+def user_info_from_claims(
+    claims: Dict[str, Any], required_claims: Sequence[str] = DEFAULT_PROFILE_CLAIMS
+) -> Optional[UserInfo]:
+    """
+    Build UserInfo from token claims if they include the needed ones.
+
+    Args:
+        claims: Claims of an already validated ID or access token
+        required_claims: Claims the caller needs besides sub
+
+    Returns:
+        UserInfo, or None if sub or a required claim is missing
+    """
+    if not claims.get("sub") or any(claims.get(claim) is None for claim in required_claims):
+        return None
+    data = {name: claims[name] for name in UserInfo.model_fields if name in claims}
+    tenant_id = claims.get(settings.TENANT_CLAIM_NAME)
+    if tenant_id is not None:
+        data["tenant_id"] = str(tenant_id)
+    return UserInfo(**data)
+
+
+def _unverified_exp(access_token: str) -> Optional[float]:
+    """Read the exp claim of a JWT access token (None for opaque tokens)."""
+    try:
+        exp = jwt.decode(access_token, options={"verify_signature": False}).get("exp")
+    except jwt.InvalidTokenError:
+        return None
+    return exp if isinstance(exp, (int, float)) else None
+
+
+class UserInfoCache:
+    """
+    Bounded TTL cache of userinfo responses by access token.
+
+    Least recently used entries are evicted beyond max_entries.
+
+    Example:
+        cache = UserInfoCache(ttl=300)
+        cache.set(access_token, user_info, token_exp=claims["exp"])
+        user_info = cache.get(access_token)
+    """
+
+    def __init__(self, ttl: int = 300, max_entries: int = 10000):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Longest time in seconds a response is served from the cache
+            max_entries: Maximum number of cached responses
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, UserInfo]]" = OrderedDict()
+
+    @staticmethod
+    def _key(access_token: str) -> str:
+        """Identify an access token without keeping it (hex SHA-256 digest)."""
+        return hashlib.sha256(access_token.encode("utf-8")).hexdigest()
+
+    def get(self, access_token: str) -> Optional[UserInfo]:
+        """
+        Get the cached userinfo of an access token.
+
+        Args:
+            access_token: Access token the userinfo was fetched with
+
+        Returns:
+            Cached UserInfo, or None if not cached or expired
+        """
+        key = self._key(access_token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, user_info = entry
+        if time.time() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return user_info
+
+    def set(
+        self, access_token: str, user_info: UserInfo, token_exp: Optional[float] = None
+    ) -> None:
+        """
+        Cache the userinfo of an access token.
+
+        Args:
+            access_token: Access token the userinfo was fetched with
+            user_info: Userinfo response
+            token_exp: Token expiration time (Unix timestamp), bounding the TTL
+                (default: exp claim of a JWT access token)
+        """
+        if token_exp is None:
+            token_exp = _unverified_exp(access_token)
+        expires_at = time.time() + self.ttl
+        if token_exp is not None:
+            expires_at = min(expires_at, token_exp)
+        if expires_at <= time.time():
+            return
+
+        key = self._key(access_token)
+        self._entries[key] = (expires_at, user_info)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
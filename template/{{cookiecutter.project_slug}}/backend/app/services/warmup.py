@@ -0,0 +1,170 @@
+"""
+Startup warm-up of connection pools and identity provider metadata.
+
+Database and Redis pools, OIDC discovery and JWKS are otherwise created or
+fetched lazily by the first requests a new instance serves, making them slow
+enough to be timed out behind a load balancer. The warm-up runs at startup,
+in the background so liveness probes are answered meanwhile, and holds the
+readiness probe at "warming_up" until it has finished:
+
+- database: opens WARMUP_DB_CONNECTIONS pool connections (plus the health
+  check connection)
+- redis: pings every Redis client used on the request path, opening a
+  connection in each pool
+- oidc_discovery: fetches the OIDC discovery document
+- jwks: fetches (or loads from cache) the issuer's signing keys
+
+Steps run concurrently, each limited to WARMUP_TIMEOUT_SECONDS. A failed step
+is logged and does not block startup: readiness is then decided by the health
+monitor as usual, and the lazy paths retry on demand.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack
+from typing import Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import text
+
+from app.core.cache import get_redis_client
+from app.core.config import settings
+from app.core.database import engine, ping_database
+from app.core.rate_limit import get_rate_limiter
+from app.services.health_monitor import HealthMonitor
+from app.services.jwks_client import get_jwks_client
+from app.services.oauth_client import get_oauth_client
+from app.services.token_revocation import get_token_revocation_service
+
+logger = logging.getLogger(__name__)
+
+# A warm-up step succeeds by returning and fails by raising
+WarmupStep = Callable[[], Awaitable[None]]
+
+
+async def warm_database(connections: Optional[int] = None) -> None:
+    """
+    Open pool connections so the first requests do not pay for connecting.
+
+    Connections are opened one after another and held until all are open,
+    so each one is a distinct pool connection.
+
+    Args:
+        connections: Connections to open (default: WARMUP_DB_CONNECTIONS,
+            capped at DATABASE_POOL_SIZE; at least one to verify connectivity)
+    """
+    if connections is None:
+        connections = min(settings.WARMUP_DB_CONNECTIONS, settings.DATABASE_POOL_SIZE)
+
+    async with AsyncExitStack() as stack:
+        for _ in range(max(connections, 1)):
+            conn = await stack.enter_async_context(engine.connect())
+            await conn.execute(text("SELECT 1"))
+    await ping_database()
+
+
+async def warm_redis() -> None:
+    """Ping the Redis clients of the cache, rate limiter, token revocation and JWKS cache."""
+    client = await get_redis_client()
+    if client is None:
+        raise ConnectionError("Redis client unavailable")
+    clients = [
+        client,
+        (await get_rate_limiter()).redis_client,
+        (await get_token_revocation_service()).redis_client,
+        (await get_jwks_client()).redis_client,
+    ]
+    await asyncio.gather(*(redis_client.ping() for redis_client in clients))
+
+
+async def warm_oidc_discovery() -> None:
+    """Fetch the OIDC discovery document into the discovery cache and OAuth client."""
+    await (await get_oauth_client()).discover_endpoints()
+
+
+async def warm_jwks() -> None:
+    """Fetch the configured issuer's signing keys into the JWKS cache."""
+    await (await get_jwks_client()).get_jwks(settings.OAUTH_ISSUER_URL)
+
+
+def default_warmup_steps() -> Dict[str, WarmupStep]:
+    """
+    Get the warm-up steps for this application.
+
+    Returns:
+        Warm-up step coroutine functions by name
+    """
+    return {
+        "database": warm_database,
+        "redis": warm_redis,
+        "oidc_discovery": warm_oidc_discovery,
+        "jwks": warm_jwks,
+    }
+
+
+async def _run_step(name: str, step: WarmupStep, timeout: float) -> bool:
+    """Run one step with the timeout, logging its duration and outcome."""
+    start = time.perf_counter()
+    error = None
+    try:
+        await asyncio.wait_for(step(), timeout=timeout)
+    except asyncio.TimeoutError:
+        error = f"timed out after {timeout}s"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    duration_ms = round((time.perf_counter() - start) * 1000, 1)
+
+    if error is not None:
+        logger.warning(
+            "Warm-up step failed",
+            extra={"step": name, "duration_ms": duration_ms, "error": error},
+        )
+        return False
+    logger.info("Warm-up step complete", extra={"step": name, "duration_ms": duration_ms})
+    return True
+
+
+async def warm_up(
+    monitor: HealthMonitor,
+    steps: Optional[Dict[str, WarmupStep]] = None,
+    timeout: Optional[float] = None,
+) -> Dict[str, bool]:
+    """
+    Run the warm-up steps concurrently, holding readiness until they finish.
+
+    Args:
+        monitor: Health monitor whose readiness is held at "warming_up"
+        steps: Steps by name (default: default_warmup_steps())
+        timeout: Timeout per step in seconds (default: WARMUP_TIMEOUT_SECONDS)
+
+    Returns:
+        Whether each step succeeded, by name
+
+    Example:
+        >>> # In the application lifespan
+        >>> monitor.warming_up = True
+        >>> task = asyncio.create_task(warm_up(monitor))
+    """
+    if steps is None:
+        steps = default_warmup_steps()
+    if timeout is None:
+        timeout = settings.WARMUP_TIMEOUT_SECONDS
+
+    monitor.warming_up = True
+    start = time.perf_counter()
+    try:
+        outcomes = await asyncio.gather(
+            *(_run_step(name, step, timeout) for name, step in steps.items())
+        )
+    finally:
+        monitor.warming_up = False
+
+    results = dict(zip(steps, outcomes, strict=True))
+    logger.info(
+        "Warm-up finished",
+        extra={
+            "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+            "failed_steps": [name for name, ok in results.items() if not ok],
+        },
+    )
+    return results
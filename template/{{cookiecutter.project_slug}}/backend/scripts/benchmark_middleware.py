@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Benchmark the HTTP middleware stack in-process.
+
+Compares request throughput of the application's middleware stack (CORS,
+SecurityHeadersMiddleware, TenantResolutionMiddleware) as pure ASGI middleware
+against the same stack built on Starlette's BaseHTTPMiddleware, which is how
+both middlewares were implemented previously.
+
+Requests are driven through httpx's ASGI transport, so the numbers measure
+middleware and framework overhead only - no sockets, no server, no database.
+Compare runs on the same machine; absolute values are not meaningful.
+
+Usage:
+    python -m scripts.benchmark_middleware
+    python -m scripts.benchmark_middleware --requests 20000 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import Callable, Dict
+
+import httpx
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.context import clear_current_tenant, set_current_tenant
+from app.middleware.security import SecurityHeadersMiddleware
+from app.middleware.tenant import TenantResolutionMiddleware
+
+
+class BaseHTTPSecurityHeaders(BaseHTTPMiddleware):
+    """Previous SecurityHeadersMiddleware implementation, for comparison."""
+
+    def __init__(self, app) -> None:
+        super().__init__(app)
+        self._headers = SecurityHeadersMiddleware(app)._http_headers
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        response = await call_next(request)
+        for name, value in self._headers:
+            response.headers[name.decode("latin-1")] = value.decode("latin-1")
+        return response
+
+
+class BaseHTTPTenantResolution(BaseHTTPMiddleware):
+    """Previous TenantResolutionMiddleware implementation, for comparison."""
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        if request.url.path in TenantResolutionMiddleware.PUBLIC_PATHS:
+            return await call_next(request)
+        try:
+            user = getattr(request.state, "user", None)
+            tenant_id = getattr(user, "tenant_id", None)
+            if tenant_id is not None:
+                request.state.tenant_id = tenant_id
+                set_current_tenant(tenant_id)
+            return await call_next(request)
+        finally:
+            clear_current_tenant()
+
+
+def build_app(security_middleware: type, tenant_middleware: type) -> FastAPI:
+    """Build an app with the production middleware order and trivial routes."""
+    app = FastAPI()
+
+    @app.get("/api/v1/items")
+    async def list_items():
+        return {"items": [{"id": i} for i in range(10)]}
+
+    @app.get("/api/v1/stream")
+    async def stream_items():
+        async def chunks():
+            for i in range(10):
+                yield f"{i}\n".encode()
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    # Same order as app.main: security headers, CORS, tenant resolution
+    app.add_middleware(security_middleware)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["http://localhost:5173"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.add_middleware(tenant_middleware)
+    return app
+
+
+async def run_benchmark(app: FastAPI, path: str, requests: int, concurrency: int) -> float:
+    """Send `requests` GETs with `concurrency` workers and return requests/second."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        # Warm up routing and response classes
+        for _ in range(100):
+            (await client.get(path)).raise_for_status()
+
+        remaining = requests
+
+        async def worker() -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                response = await client.get(path)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return requests / elapsed
+
+
+def main() -> int:
+    """Run the benchmark for each stack and endpoint and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=5000, help="requests per run")
+    parser.add_argument("--concurrency", type=int, default=50, help="concurrent clients")
+    args = parser.parse_args()
+
+    stacks: Dict[str, Callable[[], FastAPI]] = {
+        "BaseHTTPMiddleware (before)": lambda: build_app(
+            BaseHTTPSecurityHeaders, BaseHTTPTenantResolution
+        ),
+        "pure ASGI (after)": lambda: build_app(
+            SecurityHeadersMiddleware, TenantResolutionMiddleware
+        ),
+    }
+    paths = {"JSON": "/api/v1/items", "streaming": "/api/v1/stream"}
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}\n")
+    print(f"{'stack':<30}{'endpoint':<12}{'req/s':>10}")
+
+    results: Dict[str, Dict[str, float]] = {}
+    for stack_name, factory in stacks.items():
+        for path_name, path in paths.items():
+            rps = asyncio.run(
+                run_benchmark(factory(), path, args.requests, args.concurrency)
+            )
+            results.setdefault(path_name, {})[stack_name] = rps
+            print(f"{stack_name:<30}{path_name:<12}{rps:>10.0f}")
+
+    print()
+    for path_name, by_stack in results.items():
+        before, after = by_stack.values()
+        print(f"{path_name}: {after / before:.2f}x throughput")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
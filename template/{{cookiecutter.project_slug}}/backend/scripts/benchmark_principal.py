@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark building the per-request principal from decoded token claims.
+
+Compares, for one set of decoded JWT claims:
+
+- pydantic (before): TokenPayload(**claims) with its nested RealmAccess,
+  scope parsing, then an AuthenticatedUser model - how get_current_user()
+  built the user previously
+- Principal (after): Principal.from_claims(claims), the __slots__ principal
+
+For each, reports the time per build and, with tracemalloc, the memory
+blocks and bytes held by each principal and the peak bytes allocated by one
+build, temporaries included. Signature verification and revocation checks
+are not included. Compare runs on the same machine; absolute values are not
+meaningful.
+
+Usage:
+    python -m scripts.benchmark_principal
+    python -m scripts.benchmark_principal --iterations 200000
+"""
+
+import argparse
+import functools
+import sys
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, Tuple
+
+from app.schemas.auth import AuthenticatedUser, Principal, TokenPayload
+
+# Typical Keycloak access token claims, as returned by jwt.decode()
+CLAIMS: Dict[str, Any] = {
+    "exp": 1762903147,
+    "iat": 1762902847,
+    "jti": "0f3c6d1e-6a0f-4b59-9d0c-7f1f1b2a9e41",
+    "iss": "http://keycloak.test/realms/bench",
+    "aud": ["backend", "account"],
+    "sub": "c4a760a8-dbcf-4e14-9f39-645a9b1f2e3b",
+    "typ": "Bearer",
+    "azp": "frontend",
+    "sid": "5e1b0c29-3f7a-4a62-8d1e-9b6f0e7c2d11",
+    "realm_access": {"roles": ["user", "offline_access", "uma_authorization"]},
+    "scope": "openid profile email statements/read statements/write",
+    "email_verified": True,
+    "tenant_id": "550e8400-e29b-41d4-a716-446655440000",
+    "name": "Bench User",
+    "preferred_username": "bench",
+    "email": "bench@example.com",
+}
+
+
+def build_pydantic(claims: Dict[str, Any]) -> AuthenticatedUser:
+    """Previous get_current_user() user construction, for comparison."""
+    token_payload = TokenPayload(**claims)
+    scopes = token_payload.scope.split() if token_payload.scope else []
+    if token_payload.realm_access and token_payload.realm_access.roles:
+        scopes.extend(token_payload.realm_access.roles)
+    return AuthenticatedUser(
+        user_id=token_payload.sub,
+        tenant_id=token_payload.tenant_id,
+        jti=token_payload.jti,
+        exp=token_payload.exp,
+        email=token_payload.email,
+        name=token_payload.name,
+        scopes=scopes,
+        issuer=token_payload.iss,
+    )
+
+
+def measure_memory(
+    build: Callable[[Dict[str, Any]], Any], count: int
+) -> Tuple[float, float, float]:
+    """
+    Trace the memory of `count` builds with tracemalloc.
+
+    Args:
+        build: Function building a principal from claims
+        count: Number of builds to trace
+
+    Returns:
+        Memory blocks and bytes held per principal, and peak bytes allocated
+        (temporaries included) by a single build
+    """
+    build(CLAIMS)  # Warm up validators and interned strings
+    principals = []
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        for _ in range(count):
+            principals.append(build(CLAIMS))
+        after = tracemalloc.take_snapshot()
+
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        build(CLAIMS)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    held = after.compare_to(before, "filename")
+    held_blocks = sum(stat.count_diff for stat in held)
+    held_bytes = sum(stat.size_diff for stat in held)
+    return held_blocks / count, held_bytes / count, float(peak - baseline)
+
+
+def main() -> int:
+    """Time and trace the memory of each build and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=100000, help="builds per timing run")
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs (best is reported)")
+    parser.add_argument("--traced", type=int, default=1000, help="builds traced")
+    args = parser.parse_args()
+
+    builds: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+        "pydantic (before)": build_pydantic,
+        "Principal (after)": Principal.from_claims,
+    }
+
+    print(f"{args.iterations} builds, best of {args.repeat}; {args.traced} traced\n")
+    print(f"{'build':<20}{'us/build':>10}{'blocks held':>13}{'bytes held':>12}{'peak bytes':>12}")
+
+    for name, build in builds.items():
+        best = min(
+            timeit.repeat(
+                functools.partial(build, CLAIMS), number=args.iterations, repeat=args.repeat
+            )
+        )
+        held_blocks, held_bytes, peak = measure_memory(build, args.traced)
+        print(
+            f"{name:<20}{best / args.iterations * 1e6:>10.2f}"
+            f"{held_blocks:>13.1f}{held_bytes:>12.0f}{peak:>12.0f}"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
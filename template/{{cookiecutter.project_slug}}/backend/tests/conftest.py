@@ -39,3 +39,105 @@ def event_loop():
     loop = asyncio.get_event_loop_policy().new_event_loop()
     yield loop
     loop.close()
+
+
+class FakeLock:
+    """Non-blocking lock on a FakeRedis key."""
+
+    def __init__(self, store, name):
+        self.store = store
+        self.name = name
+
+    async def acquire(self):
+        if self.name in self.store.data:
+            return False
+        self.store.data[self.name] = "locked"
+        return True
+
+    async def release(self):
+        self.store.data.pop(self.name, None)
+
+
+class FakeRedis:
+    """Dict-backed stand-in for the Redis commands the shared caches use."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    async def exists(self, key):
+        return int(key in self.data)
+
+    def lock(self, name, timeout=None, blocking=True):
+        return FakeLock(self, name)
+
+
+@pytest.fixture
+def fake_redis():
+    """Empty dict-backed Redis stand-in (see FakeRedis)."""
+    return FakeRedis()
+
+
+class CheckStubs:
+    """Health check and warm-up step coroutines with fixed outcomes."""
+
+    @staticmethod
+    async def ok() -> None:
+        pass
+
+    @staticmethod
+    async def fail() -> None:
+        raise ConnectionError("connection refused")
+
+    @staticmethod
+    async def hang() -> None:
+        await asyncio.sleep(10)
+
+
+@pytest.fixture
+def check_stubs():
+    """Succeeding, failing and hanging check coroutines (see CheckStubs)."""
+    return CheckStubs()
+
+
+@pytest.fixture
+def make_principal():
+    """Factory for the Principal returned by get_current_user()."""
+    from app.schemas.auth import Principal
+
+    def make(*scopes: str):
+        return Principal(
+            user_id="admin-user",
+            tenant_id="550e8400-e29b-41d4-a716-446655440000",
+            jti="jwt-id-123",
+            exp=9999999999,
+            issuer="http://keycloak/realms/test",
+            scopes=scopes,
+        )
+
+    return make
+
+
+@pytest.fixture
+def admin_client(make_principal):
+    """
+    TestClient for the admin router, authenticated with the admin scope.
+
+    Returns the client and its app, so tests can override get_current_user.
+    """
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.api.dependencies.auth import get_current_user
+    from app.api.routers import admin
+    from app.schemas.auth import SCOPE_ADMIN
+
+    app = FastAPI()
+    app.include_router(admin.router)
+    app.dependency_overrides[get_current_user] = lambda: make_principal(SCOPE_ADMIN)
+    return TestClient(app), app
@@ -0,0 +1,94 @@
+"""
+Integration tests for PgBouncer transaction pooling mode.
+
+Runs the database engine in DATABASE_PGBOUNCER mode against a real PgBouncer
+in transaction pooling mode (the `pgbouncer` compose profile) and verifies:
+- Prepared statements do not collide when server connections are shared
+- Transaction-scoped tenant context (set_config(..., TRUE)) stays isolated
+  between concurrent sessions and never leaks into later transactions
+
+Start the stand-in with:
+    docker compose --profile pgbouncer up -d pgbouncer
+
+Tests are skipped when PgBouncer is not reachable.
+"""
+
+import asyncio
+import os
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.database import create_database_engine
+from app.services.tenant_context import set_tenant_context
+
+PGBOUNCER_DATABASE_URL = os.environ.get(
+    "PGBOUNCER_DATABASE_URL",
+    "postgresql+asyncpg://{{ cookiecutter.postgres_app_user }}:{{ cookiecutter.postgres_app_password }}@pgbouncer:5432/{{ cookiecutter.postgres_db }}",
+)
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.integration]
+
+CURRENT_TENANT_SQL = text("SELECT current_setting('app.current_tenant_id', TRUE)")
+
+
+@pytest.fixture
+async def pgbouncer_sessionmaker():
+    """Session factory bound to a PgBouncer-mode engine, or skip if unavailable."""
+    engine = create_database_engine(PGBOUNCER_DATABASE_URL, pgbouncer=True)
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except Exception as e:
+        await engine.dispose()
+        pytest.skip(f"PgBouncer not available: {e}")
+
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    await engine.dispose()
+
+
+async def test_repeated_statements_across_shared_server_connections(pgbouncer_sessionmaker):
+    """Test that the same statement runs repeatedly from many clients without errors."""
+
+    async def run_queries(worker: int) -> None:
+        async with pgbouncer_sessionmaker() as session:
+            for i in range(20):
+                result = await session.execute(
+                    text("SELECT CAST(:value AS integer)"), {"value": worker * 100 + i}
+                )
+                assert result.scalar() == worker * 100 + i
+                await session.commit()
+
+    await asyncio.gather(*(run_queries(worker) for worker in range(10)))
+
+
+async def test_tenant_context_isolated_between_concurrent_sessions(pgbouncer_sessionmaker):
+    """Test that each session sees only its own tenant context inside its transaction."""
+
+    async def check_tenant_context() -> None:
+        tenant_id = uuid4()
+        async with pgbouncer_sessionmaker() as session:
+            await set_tenant_context(session, tenant_id, validate=False)
+            # Yield so other clients' transactions interleave on the pool
+            await asyncio.sleep(0.01)
+            result = await session.execute(CURRENT_TENANT_SQL)
+            assert result.scalar() == str(tenant_id)
+            await session.commit()
+
+    await asyncio.gather(*(check_tenant_context() for _ in range(25)))
+
+
+async def test_tenant_context_does_not_outlive_transaction(pgbouncer_sessionmaker):
+    """Test that tenant context is gone once the transaction that set it ends."""
+    async with pgbouncer_sessionmaker() as session:
+        await set_tenant_context(session, uuid4(), validate=False)
+        await session.commit()
+
+    # Any server connection PgBouncer hands out next must be clean
+    for _ in range(10):
+        async with pgbouncer_sessionmaker() as session:
+            result = await session.execute(CURRENT_TENANT_SQL)
+            assert not result.scalar()
@@ -0,0 +1,118 @@
+"""
+Unit tests for the background health monitor and the readiness endpoint.
+
+Tests cover:
+- Readiness states (starting, ready, degraded, not_ready, stale)
+- Check timeouts and failures
+- /ready status codes answered from monitor state
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routers import health
+from app.services import health_monitor
+from app.services.health_monitor import HealthMonitor
+
+
+class TestHealthMonitor:
+    """Tests for check execution and readiness derivation."""
+
+    def test_ready_when_not_running(self, check_stubs):
+        """Without the background task, readiness is not gated."""
+        monitor = HealthMonitor({"database": check_stubs.fail}, required=["database"])
+
+        assert monitor.readiness().ready
+
+    async def test_starting_until_first_round(self, check_stubs):
+        """Readiness waits for the first completed round of checks."""
+        monitor = HealthMonitor({"database": check_stubs.hang}, required=["database"], timeout=0.05)
+        monitor.start()
+        try:
+            assert monitor.readiness().status == "starting"
+            await asyncio.sleep(0.1)
+            assert monitor.readiness().status == "not_ready"
+        finally:
+            await monitor.stop()
+
+    async def test_required_and_optional_failures(self, check_stubs):
+        """Required failures make the instance unready, others degrade it."""
+        checks = {"database": check_stubs.ok, "redis": check_stubs.fail}
+        monitor = HealthMonitor(checks, required=["database"], interval=60)
+        monitor.start()
+        try:
+            await asyncio.sleep(0.01)
+            readiness = monitor.readiness()
+            assert readiness.ready
+            assert readiness.status == "degraded"
+            assert readiness.checks["database"].healthy
+            assert readiness.checks["redis"].error == "ConnectionError: connection refused"
+
+            monitor.checks["database"] = check_stubs.fail
+            await monitor.check_all()
+            assert monitor.readiness().status == "not_ready"
+        finally:
+            await monitor.stop()
+
+    async def test_timeout(self, check_stubs):
+        """Checks exceeding the timeout fail."""
+        monitor = HealthMonitor({"jwks": check_stubs.hang}, timeout=0.01)
+
+        result = (await monitor.check_all())["jwks"]
+
+        assert not result.healthy
+        assert result.error == "timed out after 0.01s"
+
+    async def test_stale_results(self, check_stubs):
+        """Results older than max_staleness are not trusted."""
+        monitor = HealthMonitor({"database": check_stubs.ok}, interval=60, max_staleness=0.02)
+        monitor.start()
+        try:
+            await asyncio.sleep(0.01)
+            assert monitor.readiness().status == "ready"
+            await asyncio.sleep(0.05)
+            assert monitor.readiness().status == "stale"
+        finally:
+            await monitor.stop()
+
+
+def _app(monitor: HealthMonitor) -> FastAPI:
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        monitor.start()
+        yield
+        await monitor.stop()
+
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(health.router)
+    return app
+
+
+class TestReadinessEndpoint:
+    """Tests for /ready."""
+
+    @pytest.mark.parametrize(
+        ("check", "status_code", "status"),
+        [("ok", 200, "ready"), ("fail", 503, "not_ready")],
+    )
+    def test_answers_from_monitor_state(
+        self, check_stubs, monkeypatch, check, status_code, status
+    ):
+        """The response reflects the latest check round."""
+        monitor = HealthMonitor(
+            {"database": getattr(check_stubs, check)}, required=["database"], interval=60
+        )
+        monkeypatch.setattr(health_monitor, "_health_monitor", monitor)
+
+        with TestClient(_app(monitor)) as client:
+            response = client.get("/ready")
+            while response.json()["status"] == "starting":
+                response = client.get("/ready")
+
+        assert response.status_code == status_code
+        assert response.json()["status"] == status
+        assert response.json()["checks"]["database"]["healthy"] is (status_code == 200)
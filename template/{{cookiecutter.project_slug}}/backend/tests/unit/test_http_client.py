@@ -0,0 +1,155 @@
+"""
+Unit tests for the shared outbound HTTP clients.
+
+Tests cover:
+- Retrying idempotent requests after connection errors and 502/503/504
+- Not retrying non-idempotent requests
+- A connection pool per host
+- The shared client registry
+"""
+
+from typing import List, Union
+
+import httpx
+import pytest
+
+from app.core import http_client
+from app.core.http_client import OutboundTransport, close_http_clients, get_http_client
+
+
+class FakePool(httpx.AsyncBaseTransport):
+    """Connection pool answering with queued responses or errors."""
+
+    def __init__(self, outcomes: List[Union[int, Exception]]):
+        self.outcomes = outcomes
+        self.requests: List[httpx.Request] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(outcome, request=request)
+
+
+def _client(pool: FakePool, retries: int = 2) -> httpx.AsyncClient:
+    transport = OutboundTransport("unit", httpx.Limits(), retries=retries, backoff=0)
+    transport._pool = lambda url: pool
+    return httpx.AsyncClient(transport=transport)
+
+
+class TestRetries:
+    """Tests for retrying transient failures."""
+
+    async def test_retries_get_until_success(self):
+        """GET is retried after a connection error and a 503."""
+        pool = FakePool([httpx.ConnectError("refused"), 503, 200])
+
+        async with _client(pool) as client:
+            response = await client.get("http://idp.test/jwks")
+
+        assert response.status_code == 200
+        assert len(pool.requests) == 3
+
+    async def test_gives_up_after_retries(self):
+        """The last response is returned once retries are used up."""
+        pool = FakePool([502, 502, 502])
+
+        async with _client(pool) as client:
+            response = await client.get("http://idp.test/jwks")
+
+        assert response.status_code == 502
+        assert len(pool.requests) == 3
+
+    async def test_raises_last_error(self):
+        """The last connection error is raised once retries are used up."""
+        pool = FakePool([httpx.ConnectError("refused")] * 2)
+
+        async with _client(pool, retries=1) as client:
+            with pytest.raises(httpx.ConnectError):
+                await client.get("http://idp.test/jwks")
+
+    async def test_post_not_retried(self):
+        """Token requests (POST) are sent once."""
+        pool = FakePool([503, 200])
+
+        async with _client(pool) as client:
+            response = await client.post("http://idp.test/token", data={"grant_type": "x"})
+
+        assert response.status_code == 503
+        assert len(pool.requests) == 1
+
+    async def test_client_errors_not_retried(self):
+        """Responses other than 502/503/504 are returned directly."""
+        pool = FakePool([404, 200])
+
+        async with _client(pool) as client:
+            response = await client.get("http://idp.test/jwks")
+
+        assert response.status_code == 404
+        assert len(pool.requests) == 1
+
+    async def test_records_metrics(self):
+        """Each attempt and retry is counted."""
+        observability = pytest.importorskip("app.observability")
+        registry = observability.REGISTRY
+        labels = {"client": "unit", "host": "metrics.test"}
+        attempt = {**labels, "method": "GET", "status": "503"}
+        retries = registry.get_sample_value("http_client_retries_total", labels) or 0
+        attempts = (
+            registry.get_sample_value("http_client_request_duration_seconds_count", attempt) or 0
+        )
+
+        pool = FakePool([503, 200])
+        async with _client(pool) as client:
+            await client.get("http://metrics.test/jwks")
+
+        assert registry.get_sample_value("http_client_retries_total", labels) == retries + 1
+        assert (
+            registry.get_sample_value("http_client_request_duration_seconds_count", attempt)
+            == attempts + 1
+        )
+
+
+class TestPools:
+    """Tests for per-host connection pools."""
+
+    async def test_pool_per_host(self):
+        """Hosts get separate pools; the same host reuses its pool."""
+        transport = OutboundTransport("unit", httpx.Limits(max_connections=5))
+
+        idp = transport._pool(httpx.URL("https://idp.test/jwks"))
+        other = transport._pool(httpx.URL("https://other.test/jwks"))
+
+        assert idp is transport._pool(httpx.URL("https://idp.test/token"))
+        assert idp is not other
+        await transport.aclose()
+        assert transport._pools == {}
+
+
+class TestRegistry:
+    """Tests for the shared client registry."""
+
+    async def test_shared_by_name(self):
+        """The same client is returned for a name until closed."""
+        try:
+            client = get_http_client("unit-registry", timeout=3)
+
+            assert get_http_client("unit-registry") is client
+            assert get_http_client("unit-other") is not client
+            assert client.timeout.connect == 3
+        finally:
+            await close_http_clients()
+
+        assert client.is_closed
+        assert http_client._http_clients == {}
+
+    async def test_http2_falls_back_without_h2(self, monkeypatch):
+        """HTTP/2 is disabled with a warning when h2 is missing."""
+        monkeypatch.setattr(http_client.settings, "HTTP_CLIENT_HTTP2", True)
+        monkeypatch.setattr(http_client.importlib.util, "find_spec", lambda name: None)
+
+        client = http_client.create_http_client("unit", timeout=1)
+
+        assert client._transport.http2 is False
+        await client.aclose()
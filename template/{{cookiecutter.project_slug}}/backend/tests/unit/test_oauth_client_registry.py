@@ -0,0 +1,179 @@
+"""
+Unit tests for the per-tenant OAuth client registry.
+
+Tests cover:
+- Building one client per tenant provider, without repeated database reads
+- Falling back to the default client for tenants without a provider
+- LRU, idle and max-age eviction
+- Invalidation when provider changes are committed
+"""
+
+import time
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.models import OAuthProvider, ProviderType
+from app.services import oauth_client_registry
+from app.services.oauth_client import OAuthClient
+from app.services.oauth_client_registry import OAuthClientRegistry
+from app.services.oidc_discovery import OIDCDiscoveryCache
+from app.services.token_refresh import RefreshCoalescer
+from app.services.userinfo_cache import UserInfoCache
+
+
+def _provider(tenant_id: uuid.UUID, **kwargs) -> OAuthProvider:
+    return OAuthProvider(
+        tenant_id=tenant_id,
+        provider_type=ProviderType.OKTA,
+        issuer=f"https://{tenant_id}.okta.test",
+        client_id=f"client-{tenant_id}",
+        client_secret="secret",
+        jwks_uri=f"https://{tenant_id}.okta.test/keys",
+        **kwargs,
+    )
+
+
+def _session(providers) -> MagicMock:
+    """Session mock answering provider queries with the providers in turn."""
+    session = MagicMock()
+
+    async def execute(statement):
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = providers.pop(0)
+        return result
+
+    session.execute = AsyncMock(side_effect=execute)
+    return session
+
+
+@pytest.fixture
+def registry():
+    http_client = MagicMock()
+    default_client = OAuthClient(
+        client_id="default",
+        client_secret="secret",
+        redirect_uri="http://localhost:8000/callback",
+        issuer_url="http://keycloak.test/realms/default",
+        http_client=http_client,
+    )
+    return OAuthClientRegistry(
+        default_client=default_client,
+        http_client=http_client,
+        discovery_cache=OIDCDiscoveryCache(http_client),
+        refresh_coalescer=RefreshCoalescer(),
+        userinfo_cache=UserInfoCache(),
+        max_clients=2,
+    )
+
+
+@pytest.mark.asyncio
+class TestGetClient:
+    """Tests for looking up tenant clients."""
+
+    async def test_client_built_once_per_tenant(self, registry):
+        """The provider is read and the client built on first use only."""
+        tenant_id = uuid.uuid4()
+        session = _session([_provider(tenant_id)])
+
+        client = await registry.get_client(session, tenant_id)
+
+        assert await registry.get_client(session, tenant_id) is client
+        assert client.client_id == f"client-{tenant_id}"
+        assert client._http_client is registry.http_client
+        assert session.execute.call_count == 1
+
+    async def test_default_client_without_provider(self, registry):
+        """Tenants without a provider use the default client, also cached."""
+        tenant_id = uuid.uuid4()
+        session = _session([None])
+
+        assert await registry.get_client(session, tenant_id) is registry.default_client
+        assert await registry.get_client(session, tenant_id) is registry.default_client
+        assert session.execute.call_count == 1
+
+    async def test_configured_endpoints_skip_discovery(self, registry):
+        """Endpoints stored in the provider row are used as is."""
+        tenant_id = uuid.uuid4()
+        provider = _provider(
+            tenant_id,
+            authorization_endpoint="https://idp.test/authorize",
+            token_endpoint="https://idp.test/token",
+        )
+        client = await registry.get_client(_session([provider]), tenant_id)
+
+        config = await client.discover_endpoints()
+
+        assert config.token_endpoint == "https://idp.test/token"
+        registry.http_client.get.assert_not_called()
+
+    async def test_reloaded_after_max_age(self, registry):
+        """Clients are rebuilt from the database after max_age_seconds."""
+        tenant_id = uuid.uuid4()
+        session = _session([_provider(tenant_id), _provider(tenant_id)])
+        first = await registry.get_client(session, tenant_id)
+
+        registry._entries[tenant_id].loaded_at -= registry.max_age_seconds
+
+        assert await registry.get_client(session, tenant_id) is not first
+        assert session.execute.call_count == 2
+
+
+@pytest.mark.asyncio
+class TestEviction:
+    """Tests for bounding the registry."""
+
+    async def test_least_recently_used_evicted(self, registry):
+        """Beyond max_clients, the least recently used tenant is dropped."""
+        tenants = [uuid.uuid4() for _ in range(3)]
+        session = _session([_provider(tenant_id) for tenant_id in tenants])
+        await registry.get_client(session, tenants[0])
+        await registry.get_client(session, tenants[1])
+        await registry.get_client(session, tenants[0])
+
+        await registry.get_client(session, tenants[2])
+
+        assert list(registry._entries) == [tenants[0], tenants[2]]
+
+    async def test_idle_clients_dropped(self, registry):
+        """Clients unused for idle_seconds are dropped."""
+        idle, active = uuid.uuid4(), uuid.uuid4()
+        session = _session([_provider(idle), _provider(active)])
+        await registry.get_client(session, idle)
+        registry._entries[idle].last_used = time.monotonic() - registry.idle_seconds
+
+        await registry.get_client(session, active)
+
+        assert list(registry._entries) == [active]
+
+
+class TestInvalidation:
+    """Tests for dropping clients of changed providers."""
+
+    def test_invalidated_on_commit(self, registry, monkeypatch):
+        """Committed provider changes drop the tenant's client."""
+        monkeypatch.setattr(oauth_client_registry, "_oauth_client_registry", registry)
+        tenant_id = uuid.uuid4()
+        registry._entries[tenant_id] = MagicMock()
+        session = MagicMock(new=[], dirty=[_provider(tenant_id)], deleted=[], info={})
+
+        oauth_client_registry._collect_provider_changes(session, None)
+        assert tenant_id in registry._entries
+        oauth_client_registry._invalidate_changed_providers(session)
+
+        assert tenant_id not in registry._entries
+        assert session.info == {}
+
+    def test_rolled_back_changes_ignored(self, registry, monkeypatch):
+        """Rolled back provider changes keep the tenant's client."""
+        monkeypatch.setattr(oauth_client_registry, "_oauth_client_registry", registry)
+        tenant_id = uuid.uuid4()
+        registry._entries[tenant_id] = MagicMock()
+        session = MagicMock(new=[], dirty=[_provider(tenant_id)], deleted=[], info={})
+
+        oauth_client_registry._collect_provider_changes(session, None)
+        oauth_client_registry._discard_provider_changes(session)
+        oauth_client_registry._invalidate_changed_providers(session)
+
+        assert tenant_id in registry._entries
@@ -0,0 +1,618 @@
+"""
+Unit tests for observability instrumentation.
+
+Tests cover:
+- Database pool occupancy collector
+- Pool checkout wait, connect latency and connection age histograms
+- Per-request SQL statistics and N+1 detection
+- HTTP metrics middleware route-template labels and cardinality guard
+- trace_id exemplars on request duration histograms
+- Multiprocess mode pool gauges and dead-worker cleanup
+- Head ratio sampling and tail sampling of errored/slow traces
+- Event loop lag monitor
+- JSON log formatting, INFO sampling and the non-blocking queue handler
+"""
+
+import asyncio
+import json
+import logging
+import os
+import queue
+import subprocess
+import sys
+import time
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool, QueuePool
+
+observability = pytest.importorskip("app.observability")
+
+from opentelemetry.sdk.trace import TracerProvider  # noqa: E402
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor  # noqa: E402
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (  # noqa: E402
+    InMemorySpanExporter,
+)
+from opentelemetry.trace import Status, StatusCode, use_span  # noqa: E402
+from prometheus_client import CollectorRegistry  # noqa: E402
+
+from app.core.database import TimedQueuePool  # noqa: E402
+from app.core.timing import (  # noqa: E402
+    end_request_timings,
+    get_request_timings,
+    start_request_timings,
+)
+
+
+@pytest.fixture
+async def sqlite_engine(tmp_path):
+    """Async engine with the application's timed queue pool."""
+    test_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path}/pool.db",
+        poolclass=TimedQueuePool,
+        pool_size=2,
+        max_overflow=1,
+    )
+    yield test_engine
+    await test_engine.dispose()
+
+
+def _sample(registry: CollectorRegistry, name: str, pool: str) -> float:
+    return registry.get_sample_value(name, {"pool": pool})
+
+
+class TestDatabasePoolCollector:
+    """Tests for scrape-time pool occupancy gauges."""
+
+    @pytest.mark.asyncio
+    async def test_reports_checked_out_and_idle_connections(self, sqlite_engine):
+        """Gauges reflect the pool state at scrape time."""
+        registry = CollectorRegistry()
+        registry.register(observability.DatabasePoolCollector({"test": sqlite_engine}))
+
+        async with sqlite_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            assert _sample(registry, "db_pool_checked_out_connections", "test") == 1
+            assert _sample(registry, "db_pool_size", "test") == 2
+
+        assert _sample(registry, "db_pool_checked_out_connections", "test") == 0
+        assert _sample(registry, "db_pool_idle_connections", "test") == 1
+        assert _sample(registry, "db_pool_overflow_connections", "test") == 0
+
+    @pytest.mark.asyncio
+    async def test_skips_pools_without_in_process_pooling(self, tmp_path):
+        """NullPool engines (PgBouncer mode) report no occupancy gauges."""
+        null_engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path}/null.db", poolclass=NullPool
+        )
+        registry = CollectorRegistry()
+        registry.register(observability.DatabasePoolCollector({"test": null_engine}))
+
+        assert _sample(registry, "db_pool_size", "test") is None
+        await null_engine.dispose()
+
+
+class TestPoolEventInstrumentation:
+    """Tests for pool timing histograms."""
+
+    @pytest.mark.asyncio
+    async def test_records_checkout_wait_connect_and_age(self, sqlite_engine):
+        """Checkout, connect and close events feed the pool histograms."""
+        observability._instrument_pool_events("unit-test", sqlite_engine.sync_engine)
+        registry = observability.REGISTRY
+
+        async with sqlite_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        async with sqlite_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+        assert _sample(registry, "db_pool_checkout_wait_seconds_count", "unit-test") == 2
+        assert _sample(registry, "db_pool_connect_seconds_count", "unit-test") == 1
+
+        await sqlite_engine.dispose()
+        assert _sample(registry, "db_pool_connection_age_seconds_count", "unit-test") == 1
+
+
+class TestQueryStats:
+    """Tests for per-request SQL instrumentation."""
+
+    @pytest.mark.asyncio
+    async def test_collects_statements_for_current_request(self, sqlite_engine):
+        """Statements timed for the request are passed to its QueryStats."""
+        stats = observability.QueryStats()
+        token = start_request_timings()
+        get_request_timings().statement_observer = stats.record
+        try:
+            async with sqlite_engine.connect() as conn:
+                for value in range(3):
+                    await conn.execute(text("SELECT :value"), {"value": value})
+                await conn.execute(text("SELECT 42"))
+            db_count = get_request_timings().counts["db"]
+        finally:
+            end_request_timings(token)
+
+        assert stats.count == db_count == 4
+        assert stats.shapes["SELECT ?"] == 3
+        assert stats.total_time >= stats.slowest_time > 0
+        assert stats.slowest_statement is not None
+
+    def test_middleware_collects_without_server_timing(self, tmp_path, monkeypatch):
+        """The metrics middleware times statements even when no outer timings exist."""
+        reported = []
+        monkeypatch.setattr(
+            observability,
+            "_report_query_stats",
+            lambda stats, endpoint, method: reported.append((stats.count, endpoint)),
+        )
+        app = FastAPI()
+        app.add_middleware(observability.PrometheusMiddleware)
+
+        @app.get("/unit/query-stats")
+        async def query_stats_endpoint():
+            request_engine = create_async_engine(
+                f"sqlite+aiosqlite:///{tmp_path}/stats.db", poolclass=NullPool
+            )
+            async with request_engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                await conn.execute(text("SELECT 2"))
+            await request_engine.dispose()
+            return {}
+
+        TestClient(app).get("/unit/query-stats")
+
+        assert reported == [(2, "/unit/query-stats")]
+        assert get_request_timings() is None
+
+    def test_reports_histograms_by_route_template(self):
+        """Request statistics are exported under the route template label."""
+        stats = observability.QueryStats()
+        stats.record("SELECT 1", 0.002)
+        stats.record("SELECT 2", 0.005)
+
+        observability._report_query_stats(stats, "/unit/{item_id}", "GET")
+
+        registry = observability.REGISTRY
+        labels = {"endpoint": "/unit/{item_id}"}
+        assert registry.get_sample_value("db_queries_per_request_sum", labels) == 2
+        assert registry.get_sample_value("db_slowest_query_seconds_sum", labels) == 0.005
+
+    def test_logs_n_plus_one_pattern(self, caplog):
+        """A statement shape repeated beyond the threshold is logged."""
+        stats = observability.QueryStats()
+        threshold = observability.settings.SQL_N_PLUS_ONE_THRESHOLD
+        for _ in range(threshold + 1):
+            stats.record("SELECT * FROM todos WHERE id = $1", 0.001)
+
+        observability._report_query_stats(stats, "/unit/n-plus-one", "GET")
+
+        records = [r for r in caplog.records if r.message == "Possible N+1 query pattern"]
+        assert len(records) == 1
+        assert records[0].repeats == threshold + 1
+
+    def test_route_template_for_unmatched_requests(self):
+        """Requests that matched no route share a single label."""
+        assert observability._route_template({}) == "unmatched"
+        assert observability._route_template(
+            {"route": type("Route", (), {"path": "/api/v1/todos/{todo_id}"})()}
+        ) == "/api/v1/todos/{todo_id}"
+
+
+def _requests_total(method: str, endpoint: str, status: str) -> float:
+    return observability.REGISTRY.get_sample_value(
+        "http_requests_total", {"method": method, "endpoint": endpoint, "status": status}
+    ) or 0.0
+
+
+def _metrics_app(max_endpoints: int = 500) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(observability.PrometheusMiddleware, max_endpoints=max_endpoints)
+
+    @app.get("/unit-metrics/items/{item_id}")
+    async def get_item(item_id: str):
+        return {"id": item_id}
+
+    @app.get("/unit-metrics/other")
+    async def get_other():
+        return {}
+
+    @app.get("/unit-metrics/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    return app
+
+
+class TestPrometheusMiddleware:
+    """Tests for the raw ASGI HTTP metrics middleware."""
+
+    def test_labels_by_route_template(self):
+        """Different path parameters share one time series."""
+        before = _requests_total("GET", "/unit-metrics/items/{item_id}", "200")
+        client = TestClient(_metrics_app())
+
+        client.get("/unit-metrics/items/1")
+        client.get("/unit-metrics/items/2")
+
+        assert _requests_total("GET", "/unit-metrics/items/{item_id}", "200") == before + 2
+        assert _requests_total("GET", "/unit-metrics/items/1", "200") == 0
+
+    def test_unmatched_paths_share_one_label(self):
+        """404s for unknown paths are collapsed into the unmatched bucket."""
+        before = _requests_total("GET", "unmatched", "404")
+        client = TestClient(_metrics_app())
+
+        client.get("/wp-admin/setup.php")
+        client.get("/unit-metrics/nope")
+
+        assert _requests_total("GET", "unmatched", "404") == before + 2
+
+    def test_unhandled_errors_counted_as_500(self):
+        """Requests that raise before responding are recorded with status 500."""
+        before = _requests_total("GET", "/unit-metrics/boom", "500")
+        client = TestClient(_metrics_app(), raise_server_exceptions=False)
+
+        client.get("/unit-metrics/boom")
+
+        assert _requests_total("GET", "/unit-metrics/boom", "500") == before + 1
+
+    def test_cardinality_guard_reports_overflow(self):
+        """Templates beyond the limit are reported under the overflow label."""
+        before = _requests_total("GET", "overflow", "200")
+        client = TestClient(_metrics_app(max_endpoints=1))
+
+        client.get("/unit-metrics/items/1")
+        client.get("/unit-metrics/other")
+
+        assert _requests_total("GET", "overflow", "200") == before + 1
+
+    def test_guard_keeps_known_templates_and_unmatched(self):
+        """Seen templates and the unmatched bucket never overflow."""
+        guard = observability.EndpointLabelGuard(max_endpoints=1)
+
+        assert guard.label("/a") == "/a"
+        assert guard.label("/b") == "overflow"
+        assert guard.label("/a") == "/a"
+        assert guard.label("unmatched") == "unmatched"
+
+
+class TestExemplars:
+    """Tests for trace_id exemplars on request duration observations."""
+
+    def test_no_exemplar_without_span(self):
+        """Requests outside a trace are observed without an exemplar."""
+        assert observability._trace_exemplar(0.01, 200) is None
+
+    def test_sampled_span_exemplar(self):
+        """Sampled traces are linked by their hex trace id."""
+        tracer, _, _ = _tail_sampled_tracer(ratio=1.0)
+
+        with tracer.start_as_current_span("request") as span:
+            exemplar = observability._trace_exemplar(0.01, 200)
+
+        trace_id = span.get_span_context().trace_id
+        assert exemplar == {"trace_id": format(trace_id, "032x")}
+
+    def test_unsampled_span_linked_only_when_tail_kept(self, monkeypatch):
+        """Unsampled traces are linked only if tail sampling will keep them."""
+        monkeypatch.setattr(observability.settings, "TRACE_TAIL_SAMPLING_ENABLED", True)
+        monkeypatch.setattr(observability.settings, "TRACE_SLOW_THRESHOLD_MS", 1000)
+        tracer, _, _ = _tail_sampled_tracer(ratio=0.0)
+
+        with tracer.start_as_current_span("request"):
+            assert observability._trace_exemplar(0.01, 200) is None
+            assert observability._trace_exemplar(1.5, 200) is not None
+            assert observability._trace_exemplar(0.01, 503) is not None
+
+        monkeypatch.setattr(observability.settings, "TRACE_TAIL_SAMPLING_ENABLED", False)
+        with tracer.start_as_current_span("request"):
+            assert observability._trace_exemplar(1.5, 503) is None
+
+    def test_middleware_attaches_exemplar(self):
+        """The duration histogram exposes the request's trace in OpenMetrics."""
+        tracer, _, _ = _tail_sampled_tracer(ratio=1.0)
+        app = _metrics_app()
+
+        @app.get("/unit-metrics/traced")
+        async def traced():
+            return {}
+
+        with tracer.start_as_current_span("request") as span:
+            TestClient(app).get("/unit-metrics/traced")
+
+        encoder, content_type = observability.choose_encoder("application/openmetrics-text")
+        output = encoder(observability.REGISTRY).decode()
+        trace_id = format(span.get_span_context().trace_id, "032x")
+        assert content_type.startswith("application/openmetrics-text")
+        assert any(
+            'endpoint="/unit-metrics/traced"' in line and f'trace_id="{trace_id}"' in line
+            for line in output.splitlines()
+        )
+
+
+class TestPoolOccupancy:
+    """Tests for pool occupancy accounting shared by both metrics modes."""
+
+    @pytest.mark.asyncio
+    async def test_returning_adjusts_to_state_after_checkin(self, sqlite_engine):
+        """Counts read during checkin reflect the connection being returned."""
+        async with sqlite_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            pool = sqlite_engine.pool
+            assert isinstance(pool, QueuePool)
+            during = observability._pool_occupancy(pool, returning=True)
+
+        assert during == observability._pool_occupancy(sqlite_engine.pool)
+        assert during == (2, 0, 0, 1)
+
+
+class TestMultiprocessMetrics:
+    """Tests for multiprocess helpers."""
+
+    def test_cleanup_removes_only_dead_worker_live_gauges(self, tmp_path, monkeypatch):
+        """Live gauge files of dead PIDs are removed; other files are kept."""
+        monkeypatch.setattr(observability, "_pid_alive", lambda pid: pid == 100)
+        for filename in (
+            "gauge_livesum_100.db",
+            "gauge_livesum_200.db",
+            "gauge_livemax_200.db",
+            "counter_200.db",
+            "gauge_max_200.db",
+        ):
+            (tmp_path / filename).write_bytes(b"")
+
+        assert observability.cleanup_dead_workers(str(tmp_path)) == 1
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "counter_200.db",
+            "gauge_livesum_100.db",
+            "gauge_max_200.db",
+        ]
+
+    def test_registry_is_default_in_single_process_mode(self, monkeypatch):
+        """Without PROMETHEUS_MULTIPROC_DIR the default registry is exposed."""
+        monkeypatch.setattr(observability, "PROMETHEUS_MULTIPROC_DIR", None)
+
+        assert observability.metrics_registry() is observability.REGISTRY
+
+    def test_registry_aggregates_worker_files(self, tmp_path, monkeypatch):
+        """Counters from every worker are summed; exited workers' live gauges are dropped."""
+        worker = (
+            "from prometheus_client import Counter, Gauge\n"
+            "Counter('unit_jobs', 'Jobs').inc(3)\n"
+            "Gauge('unit_busy', 'Busy', multiprocess_mode='livesum').set(1)\n"
+        )
+        env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+        for _ in range(2):
+            subprocess.run([sys.executable, "-c", worker], env=env, check=True)
+        monkeypatch.setattr(observability, "PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+        registry = observability.metrics_registry()
+
+        assert registry.get_sample_value("unit_jobs_total") == 6
+        assert registry.get_sample_value("unit_busy") is None
+
+
+def _log_record(name: str = "app.unit", level: int = logging.INFO, **extra) -> logging.LogRecord:
+    record = logging.LogRecord(name, level, __file__, 1, "user %s logged in", ("alice",), None)
+    record.__dict__.update(extra)
+    return record
+
+
+def _dropped(reason: str) -> float:
+    return observability.REGISTRY.get_sample_value(
+        "log_records_dropped_total", {"reason": reason}
+    ) or 0.0
+
+
+class TestLoggingPipeline:
+    """Tests for the JSON formatter, INFO sampling and the queue handler."""
+
+    def test_json_formatter_fields(self):
+        """Records become one JSON object with message, trace and extra fields."""
+        tenant_id = uuid.uuid4()
+        record = _log_record(
+            otelTraceID="ab" * 16, otelSpanID="cd" * 8, tenant_id=tenant_id
+        )
+
+        line = observability.JsonFormatter().format(record)
+
+        payload = json.loads(line)
+        assert "\n" not in line
+        assert payload["level"] == "INFO"
+        assert payload["logger"] == "app.unit"
+        assert payload["message"] == "user alice logged in"
+        assert payload["trace_id"] == "ab" * 16
+        assert payload["span_id"] == "cd" * 8
+        assert payload["tenant_id"] == str(tenant_id)
+        assert payload["timestamp"].endswith("Z")
+        assert "args" not in payload
+
+    def test_json_formatter_exception(self):
+        """Exception tracebacks are kept in their own field."""
+        try:
+            raise ValueError("bad")
+        except ValueError:
+            record = logging.LogRecord(
+                "app.unit", logging.ERROR, __file__, 1, "failed", (), sys.exc_info()
+            )
+
+        payload = json.loads(observability.JsonFormatter().format(record))
+
+        assert payload["message"] == "failed"
+        assert "ValueError: bad" in payload["exception"]
+        assert "trace_id" not in payload
+
+    def test_sampling_applies_to_logger_and_children(self):
+        """Configured loggers and their children are sampled at INFO only."""
+        before = _dropped("sampled")
+        sampler = observability.LogSamplingFilter({"app.noisy": 0.0})
+
+        assert not sampler.filter(_log_record("app.noisy"))
+        assert not sampler.filter(_log_record("app.noisy.child"))
+        assert sampler.filter(_log_record("app.noisy", logging.WARNING))
+        assert sampler.filter(_log_record("app.noisy", logging.DEBUG))
+        assert sampler.filter(_log_record("app.noisier"))
+        assert _dropped("sampled") == before + 2
+
+    def test_most_specific_rate_wins(self):
+        """A child logger's own rate overrides its parent's."""
+        sampler = observability.LogSamplingFilter({"app": 0.0, "app.keep": 1.0})
+
+        assert sampler.filter(_log_record("app.keep.child"))
+        assert not sampler.filter(_log_record("app.other"))
+
+    def test_queue_handler_resolves_message_before_queueing(self):
+        """Arguments are merged in the logging thread, not the writer thread."""
+        records = queue.Queue()
+        handler = observability.NonBlockingQueueHandler(records)
+
+        handler.handle(_log_record())
+
+        queued = records.get_nowait()
+        assert queued.msg == "user alice logged in"
+        assert queued.args is None
+
+    def test_full_queue_drops_and_counts(self):
+        """A full queue drops records instead of blocking."""
+        before = _dropped("queue_full")
+        handler = observability.NonBlockingQueueHandler(queue.Queue(maxsize=1))
+
+        for _ in range(3):
+            handler.handle(_log_record())
+
+        assert handler.queue.qsize() == 1
+        assert _dropped("queue_full") == before + 2
+
+
+def _slow_lag_count() -> float:
+    """Number of lag observations above 25ms."""
+    sample = observability.REGISTRY.get_sample_value
+    return (sample("event_loop_lag_seconds_count") or 0.0) - (
+        sample("event_loop_lag_seconds_bucket", {"le": "0.025"}) or 0.0
+    )
+
+
+class TestEventLoopLagMonitor:
+    """Tests for the event loop lag probe."""
+
+    async def test_records_blocking_as_lag(self):
+        """A blocking call shows up as lag of about its duration."""
+        before = _slow_lag_count()
+        monitor = observability.EventLoopLagMonitor(interval=0.01)
+        monitor.start()
+
+        await asyncio.sleep(0.02)
+        time.sleep(0.1)  # Block the loop
+        await asyncio.sleep(0.02)
+        await monitor.stop()
+
+        assert _slow_lag_count() > before
+
+    async def test_debug_mode_enables_slow_callback_detection(self):
+        """With a threshold, asyncio debug mode reports slow callbacks."""
+        loop = asyncio.get_running_loop()
+        monitor = observability.EventLoopLagMonitor(slow_callback_duration=0.05)
+        monitor.start()
+        try:
+            assert loop.get_debug()
+            assert loop.slow_callback_duration == 0.05
+        finally:
+            await monitor.stop()
+            loop.set_debug(False)
+
+    async def test_stop_without_start(self):
+        """Stopping a monitor that never started is a no-op."""
+        await observability.EventLoopLagMonitor().stop()
+
+
+def _tail_sampled_tracer(ratio: float, threshold_ms: float = 1000, **kwargs):
+    """Tracer with the ratio sampler and tail processor, exporting to memory."""
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider(
+        sampler=observability.ParentBased(
+            root=observability.RecordingTraceIdRatioSampler(ratio),
+            remote_parent_not_sampled=observability.RECORD_ONLY,
+            local_parent_not_sampled=observability.RECORD_ONLY,
+        )
+    )
+    processor = observability.TailSamplingSpanProcessor(
+        SimpleSpanProcessor(exporter), latency_threshold_ms=threshold_ms, **kwargs
+    )
+    provider.add_span_processor(processor)
+    return provider.get_tracer("unit-test"), exporter, processor
+
+
+class TestTraceSampling:
+    """Tests for head ratio sampling combined with tail sampling."""
+
+    def test_unsampled_traces_are_still_recorded(self):
+        """Traces that lose the ratio draw are recorded, not sampled."""
+        tracer, _, _ = _tail_sampled_tracer(ratio=0.0)
+
+        with tracer.start_as_current_span("request") as root:
+            with tracer.start_as_current_span("query") as child:
+                assert root.is_recording()
+                assert child.is_recording()
+                assert not child.get_span_context().trace_flags.sampled
+
+    def test_fast_successful_unsampled_trace_dropped(self):
+        """Unsampled traces without errors or latency are not exported."""
+        tracer, exporter, _ = _tail_sampled_tracer(ratio=0.0)
+
+        with tracer.start_as_current_span("request"):
+            with tracer.start_as_current_span("query"):
+                pass
+
+        assert exporter.get_finished_spans() == ()
+
+    def test_errored_trace_exported_in_full(self):
+        """An error on any span keeps the whole trace, marked as sampled."""
+        tracer, exporter, _ = _tail_sampled_tracer(ratio=0.0)
+
+        with tracer.start_as_current_span("request"):
+            with tracer.start_as_current_span("query") as child:
+                child.set_status(Status(StatusCode.ERROR))
+
+        spans = exporter.get_finished_spans()
+        assert [s.name for s in spans] == ["query", "request"]
+        assert all(s.context.trace_flags.sampled for s in spans)
+
+    def test_slow_trace_exported(self):
+        """Root spans at or above the latency threshold keep the trace."""
+        tracer, exporter, _ = _tail_sampled_tracer(ratio=0.0, threshold_ms=5)
+
+        with tracer.start_as_current_span("request"):
+            time.sleep(0.01)
+
+        assert [s.name for s in exporter.get_finished_spans()] == ["request"]
+
+    def test_sampled_traces_bypass_buffering(self):
+        """Traces that won the ratio draw are exported span by span."""
+        tracer, exporter, _ = _tail_sampled_tracer(ratio=1.0)
+
+        with tracer.start_as_current_span("request"):
+            with tracer.start_as_current_span("query"):
+                pass
+            assert [s.name for s in exporter.get_finished_spans()] == ["query"]
+
+        assert len(exporter.get_finished_spans()) == 2
+
+    def test_buffered_traces_are_bounded(self):
+        """The oldest buffered trace is evicted when the limit is reached."""
+        tracer, _, processor = _tail_sampled_tracer(ratio=0.0, max_traces=1)
+
+        first = tracer.start_span("first-request")
+        second = tracer.start_span("second-request")
+        with use_span(first, end_on_exit=False):
+            tracer.start_span("first-query").end()
+        with use_span(second, end_on_exit=False):
+            tracer.start_span("second-query").end()
+
+        assert list(processor._traces) == [second.get_span_context().trace_id]
+        first.end()
+        second.end()
+        assert processor._traces == {}
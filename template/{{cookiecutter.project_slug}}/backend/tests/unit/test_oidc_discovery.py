@@ -0,0 +1,161 @@
+"""
+Unit tests for the OIDC discovery cache.
+
+Tests cover:
+- Process-local caching and coalescing of concurrent lookups
+- Sharing documents between pods through Redis
+- Expiry and background refresh ahead of expiry
+- Serving the cached document while the identity provider is down
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import replace
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from app.services.oidc_discovery import OIDCDiscoveryCache
+
+ISSUER = "http://idp.test/realms/unit"
+
+
+def _http_client(*documents):
+    """HTTP client mock serving the documents in turn."""
+    responses = []
+    for document in documents:
+        response = MagicMock()
+        response.json.return_value = document
+        response.raise_for_status = MagicMock()
+        responses.append(response)
+
+    async def get(url):
+        await asyncio.sleep(0)
+        return responses.pop(0)
+
+    client = MagicMock()
+    client.get = AsyncMock(side_effect=get)
+    return client
+
+
+def _expire(cache: OIDCDiscoveryCache, refresh_only: bool = False) -> None:
+    """Move the cached document past its refresh point (and expiry)."""
+    cached = cache._documents[ISSUER]
+    now = time.time()
+    cache._documents[ISSUER] = replace(
+        cached,
+        refresh_at=now - 1,
+        expires_at=now + 60 if refresh_only else now - 1,
+    )
+
+
+class TestLocalCache:
+    """Tests for the process-local tier."""
+
+    async def test_fetches_once(self):
+        """Later lookups are served without a request."""
+        http_client = _http_client({"jwks_uri": "v1"})
+        cache = OIDCDiscoveryCache(http_client)
+
+        assert await cache.get(ISSUER) == {"jwks_uri": "v1"}
+        assert await cache.get(ISSUER) == {"jwks_uri": "v1"}
+        http_client.get.assert_called_once_with(f"{ISSUER}/.well-known/openid-configuration")
+
+    async def test_concurrent_lookups_share_one_fetch(self):
+        """A burst of lookups on a cold cache makes one request."""
+        http_client = _http_client({"jwks_uri": "v1"})
+        cache = OIDCDiscoveryCache(http_client)
+
+        documents = await asyncio.gather(*(cache.get(ISSUER) for _ in range(5)))
+
+        assert documents == [{"jwks_uri": "v1"}] * 5
+        assert http_client.get.call_count == 1
+
+    async def test_expired_document_is_refetched(self):
+        """Changes at the identity provider are picked up after the TTL."""
+        http_client = _http_client({"jwks_uri": "v1"}, {"jwks_uri": "v2"})
+        cache = OIDCDiscoveryCache(http_client)
+        await cache.get(ISSUER)
+
+        _expire(cache)
+
+        assert await cache.get(ISSUER) == {"jwks_uri": "v2"}
+
+    async def test_refreshes_in_background(self):
+        """Ahead of expiry, the cached document is served while refreshing."""
+        http_client = _http_client({"jwks_uri": "v1"}, {"jwks_uri": "v2"})
+        cache = OIDCDiscoveryCache(http_client)
+        await cache.get(ISSUER)
+
+        _expire(cache, refresh_only=True)
+
+        assert await cache.get(ISSUER) == {"jwks_uri": "v1"}
+        await asyncio.gather(*cache._loading.values())
+        assert await cache.get(ISSUER) == {"jwks_uri": "v2"}
+
+
+class TestSharedCache:
+    """Tests for the Redis tier shared by pods."""
+
+    async def test_document_shared_between_pods(self, fake_redis):
+        """A second pod reads the document stored by the first."""
+        redis_client = fake_redis
+        first = OIDCDiscoveryCache(_http_client({"jwks_uri": "v1"}), redis_client)
+        second_http = _http_client()
+        second = OIDCDiscoveryCache(second_http, redis_client)
+
+        await first.get(ISSUER)
+
+        assert await second.get(ISSUER) == {"jwks_uri": "v1"}
+        second_http.get.assert_not_called()
+        assert json.loads(redis_client.data[f"oidc_discovery:{ISSUER}"])["document"] == {
+            "jwks_uri": "v1"
+        }
+
+    async def test_refresh_adopts_newer_shared_document(self, fake_redis):
+        """A pod refreshing after another one uses the document in Redis."""
+        redis_client = fake_redis
+        first = OIDCDiscoveryCache(
+            _http_client({"jwks_uri": "v1"}, {"jwks_uri": "v2"}), redis_client
+        )
+        second_http = _http_client()
+        second = OIDCDiscoveryCache(second_http, redis_client)
+        await first.get(ISSUER)
+        await second.get(ISSUER)
+
+        _expire(first)
+        await first.get(ISSUER)
+        _expire(second)
+
+        assert await second.get(ISSUER) == {"jwks_uri": "v2"}
+        second_http.get.assert_not_called()
+
+
+class TestFailures:
+    """Tests for identity provider failures."""
+
+    async def test_serves_stale_document_when_refresh_fails(self):
+        """An outage does not fail lookups that were cached before."""
+        http_client = _http_client({"jwks_uri": "v1"})
+        cache = OIDCDiscoveryCache(http_client)
+        await cache.get(ISSUER)
+        http_client.get.side_effect = httpx.ConnectError("refused")
+
+        _expire(cache)
+
+        assert await cache.get(ISSUER) == {"jwks_uri": "v1"}
+        # Not retried on every lookup during the outage
+        assert await cache.get(ISSUER) == {"jwks_uri": "v1"}
+        assert http_client.get.call_count == 2
+
+    async def test_raises_without_cached_document(self):
+        """A failed first fetch is raised to the caller."""
+        http_client = _http_client()
+        http_client.get.side_effect = httpx.ConnectError("refused")
+        cache = OIDCDiscoveryCache(http_client)
+
+        with pytest.raises(httpx.ConnectError):
+            await cache.get(ISSUER)
+        assert cache._loading == {}
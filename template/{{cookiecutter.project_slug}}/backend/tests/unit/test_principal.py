@@ -0,0 +1,138 @@
+"""
+Unit tests for the slots-based Principal.
+
+Tests cover:
+- Building a principal from decoded claims, with scopes and realm roles
+- Rejecting missing or mistyped claims
+- Immutability, replace() and equality
+- Conversion to the AuthenticatedUser schema
+"""
+
+import pytest
+
+from app.schemas.auth import (
+    SCOPE_STATEMENTS_READ,
+    AuthenticatedUser,
+    InvalidClaimsError,
+    Principal,
+    scopes_to_mask,
+)
+
+CLAIMS = {
+    "sub": "user-123",
+    "iss": "http://keycloak.test/realms/unit",
+    "aud": ["backend", "account"],
+    "exp": 9999999999,
+    "iat": 1700000000,
+    "jti": "jwt-id-123",
+    "tenant_id": "550e8400-e29b-41d4-a716-446655440000",
+    "scope": "openid statements/read",
+    "realm_access": {"roles": ["user"]},
+    "email": "user@example.com",
+    "name": "Test User",
+}
+
+
+class TestFromClaims:
+    """Tests for building principals from claims."""
+
+    def test_maps_claims(self):
+        """Claims map to the AuthenticatedUser attributes."""
+        principal = Principal.from_claims(CLAIMS)
+
+        assert principal.user_id == "user-123"
+        assert principal.tenant_id == CLAIMS["tenant_id"]
+        assert principal.jti == "jwt-id-123"
+        assert principal.exp == 9999999999
+        assert principal.issuer == CLAIMS["iss"]
+        assert principal.email == "user@example.com"
+        assert principal.scopes == ("openid", SCOPE_STATEMENTS_READ, "user")
+        assert principal.scope_mask == scopes_to_mask([SCOPE_STATEMENTS_READ])
+        assert principal.has_scope("user")
+
+    def test_optional_claims(self):
+        """Only sub, iss, aud, exp, iat and jti are required."""
+        claims = {name: CLAIMS[name] for name in ("sub", "iss", "aud", "exp", "iat", "jti")}
+
+        principal = Principal.from_claims(claims)
+
+        assert principal.tenant_id is None
+        assert principal.email is None
+        assert principal.scopes == ()
+
+    @pytest.mark.parametrize("claim", ["sub", "iss", "aud", "exp", "iat", "jti"])
+    def test_missing_required_claim(self, claim):
+        """Tokens without a required claim are rejected."""
+        claims = {name: value for name, value in CLAIMS.items() if name != claim}
+
+        with pytest.raises(InvalidClaimsError):
+            Principal.from_claims(claims)
+
+    @pytest.mark.parametrize(
+        "claim,value",
+        [
+            ("exp", "9999999999"),
+            ("exp", True),
+            ("jti", 123),
+            ("tenant_id", 42),
+            ("scope", ["statements/read"]),
+            ("realm_access", ["admin"]),
+            ("realm_access", {"roles": "admin"}),
+        ],
+    )
+    def test_wrong_claim_type(self, claim, value):
+        """Claims of the wrong type are rejected rather than coerced."""
+        with pytest.raises(InvalidClaimsError):
+            Principal.from_claims({**CLAIMS, claim: value})
+
+    def test_integral_float_timestamp(self):
+        """Integral float timestamps are accepted as integers."""
+        assert Principal.from_claims({**CLAIMS, "exp": 9999999999.0}).exp == 9999999999
+
+
+class TestPrincipal:
+    """Tests for the principal object."""
+
+    def test_immutable(self):
+        """Attributes cannot be set, deleted or added."""
+        principal = Principal.from_claims(CLAIMS)
+
+        with pytest.raises(AttributeError):
+            principal.tenant_id = "other-tenant"
+        with pytest.raises(AttributeError):
+            del principal.scopes
+        assert not hasattr(principal, "__dict__")
+
+    def test_replace(self):
+        """replace() returns an updated copy with recompiled scopes."""
+        principal = Principal.from_claims(CLAIMS)
+
+        updated = principal.replace(scopes=["admin"])
+
+        assert updated.scope_set == frozenset(["admin"])
+        assert updated.user_id == principal.user_id
+        assert principal.scopes == ("openid", SCOPE_STATEMENTS_READ, "user")
+        assert updated != principal
+
+    def test_equality(self):
+        """Principals from the same claims are equal and hash alike."""
+        first, second = Principal.from_claims(CLAIMS), Principal.from_claims(CLAIMS)
+
+        assert first == second
+        assert hash(first) == hash(second)
+
+    def test_to_schema(self):
+        """to_schema() converts to the AuthenticatedUser model."""
+        user = Principal.from_claims(CLAIMS).to_schema()
+
+        assert isinstance(user, AuthenticatedUser)
+        assert user.model_dump() == {
+            "user_id": "user-123",
+            "tenant_id": CLAIMS["tenant_id"],
+            "jti": "jwt-id-123",
+            "exp": 9999999999,
+            "email": "user@example.com",
+            "name": "Test User",
+            "scopes": ["openid", SCOPE_STATEMENTS_READ, "user"],
+            "issuer": CLAIMS["iss"],
+        }
@@ -0,0 +1,151 @@
+"""
+Unit tests for the sampling profiler and its admin endpoint.
+
+Tests cover:
+- Stack sampling in wall and cpu modes
+- Route attribution through ProfilerMiddleware
+- Single profile at a time
+- Admin endpoint gating and collapsed-stack output
+"""
+
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.dependencies.auth import get_current_user
+from app.core.config import settings
+from app.middleware.profiling import ProfilerMiddleware
+from app.services.profiler import ProfilerBusyError, SamplingProfiler
+
+
+def _spin_until(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class TestSamplingProfiler:
+    """Tests for stack sampling."""
+
+    def test_samples_busy_thread(self):
+        """A spinning thread shows up with its function in the stack."""
+        stop = threading.Event()
+        worker = threading.Thread(target=_spin_until, args=(stop,), name="spinner")
+        worker.start()
+        try:
+            samples = SamplingProfiler().profile(seconds=0.2, interval=0.005)
+        finally:
+            stop.set()
+            worker.join()
+
+        spinner = [s for s in samples if s.startswith("thread:spinner;")]
+        assert spinner
+        assert all("_spin_until" in s for s in spinner)
+
+    def test_cpu_mode_drops_idle_threads(self):
+        """Threads waiting on an event are not sampled in cpu mode."""
+        stop = threading.Event()
+        waiter = threading.Thread(target=stop.wait, name="waiter")
+        waiter.start()
+        try:
+            profiler = SamplingProfiler()
+            wall = profiler.profile(seconds=0.05, interval=0.005, mode="wall")
+            cpu = profiler.profile(seconds=0.05, interval=0.005, mode="cpu")
+        finally:
+            stop.set()
+            waiter.join()
+
+        assert any(s.startswith("thread:waiter;") for s in wall)
+        assert not any(s.startswith("thread:waiter;") for s in cpu)
+
+    def test_one_profile_at_a_time(self):
+        """A second profile is rejected while one is running."""
+        profiler = SamplingProfiler()
+        thread = threading.Thread(target=profiler.profile, args=(0.3,))
+        thread.start()
+        while not profiler.running:
+            time.sleep(0.001)
+        try:
+            with pytest.raises(ProfilerBusyError):
+                profiler.profile(0.01)
+        finally:
+            thread.join()
+
+    def test_collapse_format(self):
+        """Collapsed output has one "stack count" line per stack."""
+        samples = SamplingProfiler().profile(seconds=0.02, interval=0.005)
+        output = SamplingProfiler.collapse(samples)
+
+        for line in output.splitlines():
+            stack, count = line.rsplit(" ", 1)
+            assert stack and int(count) > 0
+
+    def test_middleware_attributes_samples_to_route(self):
+        """Samples inside a request are rooted at its route template."""
+        profiler = SamplingProfiler()
+        app = FastAPI()
+        app.add_middleware(ProfilerMiddleware, profiler=profiler)
+
+        @app.get("/unit-profile/items/{item_id}")
+        async def busy(item_id: str):
+            deadline = time.monotonic() + 0.2
+            while time.monotonic() < deadline:
+                sum(range(1000))
+            return {}
+
+        result = {}
+        thread = threading.Thread(
+            target=lambda: result.update(profiler.profile(seconds=0.4, interval=0.005))
+        )
+        thread.start()
+        while not profiler.running:
+            time.sleep(0.001)
+        TestClient(app).get("/unit-profile/items/1")
+        thread.join()
+
+        routed = [s for s in result if s.startswith("GET /unit-profile/items/{item_id};")]
+        assert routed
+        assert any("busy" in s for s in routed)
+        assert profiler._requests == {}
+
+
+class TestProfileEndpoint:
+    """Tests for the admin profile endpoint."""
+
+    def test_disabled_by_default(self, admin_client, monkeypatch):
+        """The endpoint is hidden unless PROFILER_ENABLED is set."""
+        monkeypatch.setattr(settings, "PROFILER_ENABLED", False)
+        test_client, _ = admin_client
+
+        assert test_client.get("/admin/profile").status_code == 404
+
+    def test_requires_admin_scope(self, admin_client, make_principal, monkeypatch):
+        """Non-admin users are rejected."""
+        monkeypatch.setattr(settings, "PROFILER_ENABLED", True)
+        test_client, app = admin_client
+        app.dependency_overrides[get_current_user] = lambda: make_principal()
+
+        assert test_client.get("/admin/profile").status_code == 403
+
+    def test_duration_is_capped(self, admin_client, monkeypatch):
+        """Profiles longer than PROFILER_MAX_SECONDS are rejected."""
+        monkeypatch.setattr(settings, "PROFILER_ENABLED", True)
+        monkeypatch.setattr(settings, "PROFILER_MAX_SECONDS", 1)
+        test_client, _ = admin_client
+
+        assert test_client.get("/admin/profile", params={"seconds": 5}).status_code == 422
+
+    def test_returns_collapsed_stacks(self, admin_client, monkeypatch):
+        """An admin gets collapsed-stack text."""
+        monkeypatch.setattr(settings, "PROFILER_ENABLED", True)
+        test_client, _ = admin_client
+
+        response = test_client.get(
+            "/admin/profile", params={"seconds": 0.05, "interval_ms": 5}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert response.text.splitlines()
@@ -0,0 +1,75 @@
+"""
+Unit tests for read-your-writes markers.
+
+Tests marker creation with TTL and the fail-to-primary behavior when Redis
+is unavailable.
+"""
+
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+import redis.asyncio as redis
+
+from app.core.config import settings
+from app.services.read_your_writes import has_recent_write, mark_recent_write
+
+
+@pytest.mark.asyncio
+async def test_mark_recent_write_sets_marker_with_ttl():
+    """Test that a write stores a per-user marker that expires on its own."""
+    tenant_id = uuid4()
+    redis_client = AsyncMock()
+
+    with patch(
+        "app.services.read_your_writes.get_redis_client", return_value=redis_client
+    ):
+        await mark_recent_write(tenant_id, "user-123")
+
+    redis_client.set.assert_called_once_with(
+        f"recent_write:{tenant_id}:user-123",
+        "1",
+        ex=settings.DATABASE_READ_YOUR_WRITES_SECONDS,
+    )
+
+
+@pytest.mark.asyncio
+async def test_mark_recent_write_ignores_redis_errors():
+    """Test that marker failures do not fail the already-committed request."""
+    redis_client = AsyncMock()
+    redis_client.set.side_effect = redis.RedisError("down")
+
+    with patch(
+        "app.services.read_your_writes.get_redis_client", return_value=redis_client
+    ):
+        await mark_recent_write(uuid4(), "user-123")
+
+
+@pytest.mark.asyncio
+async def test_has_recent_write_reads_marker():
+    """Test that the marker decides between replica and primary."""
+    redis_client = AsyncMock()
+    redis_client.exists.return_value = 0
+
+    with patch(
+        "app.services.read_your_writes.get_redis_client", return_value=redis_client
+    ):
+        assert await has_recent_write(uuid4(), "user-123") is False
+
+        redis_client.exists.return_value = 1
+        assert await has_recent_write(uuid4(), "user-123") is True
+
+
+@pytest.mark.asyncio
+async def test_has_recent_write_fails_toward_primary():
+    """Test that reads go to the primary when the marker cannot be checked."""
+    redis_client = AsyncMock()
+    redis_client.exists.side_effect = redis.RedisError("down")
+
+    with patch(
+        "app.services.read_your_writes.get_redis_client", return_value=redis_client
+    ):
+        assert await has_recent_write(uuid4(), "user-123") is True
+
+    with patch("app.services.read_your_writes.get_redis_client", return_value=None):
+        assert await has_recent_write(uuid4(), "user-123") is True
@@ -10,6 +10,8 @@ from app.api.dependencies.scopes import (
     has_all_scopes,
 )
 from app.schemas.auth import (
+    ALL_SCOPES,
+    SCOPE_BITS,
     AuthenticatedUser,
     SCOPE_STATEMENTS_READ,
     SCOPE_STATEMENTS_WRITE,
@@ -18,6 +20,7 @@ from app.schemas.auth import (
     SCOPE_STATE_WRITE,
     SCOPE_ADMIN,
     SCOPE_TENANT_ADMIN,
+    scopes_to_mask,
 )
 
 
@@ -427,3 +430,45 @@ def test_has_all_scopes_empty_check(user_with_read_scope):
     """Test has_all_scopes with no scopes to check."""
     # Edge case: no scopes to check should return True (vacuous truth)
     assert has_all_scopes(user_with_read_scope) is True
+
+
+# Tests for compiled scopes
+
+
+def test_scopes_compiled(user_with_multiple_scopes):
+    """Test that scopes compile to a frozenset and a bitmask."""
+    assert user_with_multiple_scopes.scope_set == frozenset(
+        [SCOPE_STATEMENTS_READ, SCOPE_STATEMENTS_WRITE, SCOPE_STATE_READ]
+    )
+    assert user_with_multiple_scopes.scope_mask == scopes_to_mask(
+        [SCOPE_STATEMENTS_READ, SCOPE_STATEMENTS_WRITE, SCOPE_STATE_READ]
+    )
+
+
+def test_scope_bits_distinct():
+    """Test that every defined scope has its own bit."""
+    assert len(SCOPE_BITS) == len(ALL_SCOPES)
+    assert scopes_to_mask(ALL_SCOPES) == (1 << len(ALL_SCOPES)) - 1
+    assert scopes_to_mask(["openid", "user"]) == 0
+
+
+@pytest.mark.asyncio
+async def test_require_scopes_undefined_scope():
+    """Test that scopes outside ALL_SCOPES (e.g. realm roles) are enforced by set."""
+    user = AuthenticatedUser(
+        user_id="test-user-222",
+        tenant_id="550e8400-e29b-41d4-a716-446655440000",
+        jti="jwt-id-222",
+        exp=9999999999,
+        scopes=[SCOPE_STATEMENTS_READ, "user"],
+        issuer="http://keycloak.test/realms/unit",
+    )
+
+    await require_scopes(SCOPE_STATEMENTS_READ, "user")(user)
+    await require_any_scope("auditor", "user")(user)
+    with pytest.raises(HTTPException) as exc_info:
+        await require_scopes(SCOPE_STATEMENTS_READ, "auditor")(user)
+
+    assert exc_info.value.detail["missing_scopes"] == ["auditor"]
+    assert has_all_scopes(user, SCOPE_STATEMENTS_READ, "user")
+    assert not has_any_scope(user, "auditor")
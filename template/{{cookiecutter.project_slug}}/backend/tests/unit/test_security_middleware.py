@@ -10,8 +10,7 @@ from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from unittest.mock import Mock
 
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.responses import Response, StreamingResponse
 
 from app.middleware.security import SecurityHeadersConfig, SecurityHeadersMiddleware
 
@@ -434,56 +433,48 @@ class TestHTTPSDetection:
     def test_detects_https_from_url_scheme(self):
         """Should detect HTTPS from URL scheme."""
         middleware = SecurityHeadersMiddleware(app=Mock())
-        request = Mock(spec=Request)
-        request.url.scheme = "https"
-        request.headers = {}
+        scope = {"type": "http", "scheme": "https", "headers": []}
 
-        assert middleware._is_https_request(request) is True
+        assert middleware._is_https_request(scope) is True
 
     def test_detects_https_from_x_forwarded_proto(self):
         """Should detect HTTPS from X-Forwarded-Proto header."""
         middleware = SecurityHeadersMiddleware(app=Mock())
-        request = Mock(spec=Request)
-        request.url.scheme = "http"
-        request.headers = {"X-Forwarded-Proto": "https"}
+        scope = {"type": "http", "scheme": "http", "headers": [(b"x-forwarded-proto", b"https")]}
 
-        assert middleware._is_https_request(request) is True
+        assert middleware._is_https_request(scope) is True
 
     def test_detects_https_from_x_forwarded_proto_case_insensitive(self):
         """X-Forwarded-Proto detection should be case insensitive."""
         middleware = SecurityHeadersMiddleware(app=Mock())
-        request = Mock(spec=Request)
-        request.url.scheme = "http"
-        request.headers = {"X-Forwarded-Proto": "HTTPS"}
+        scope = {"type": "http", "scheme": "http", "headers": [(b"x-forwarded-proto", b"HTTPS")]}
 
-        assert middleware._is_https_request(request) is True
+        assert middleware._is_https_request(scope) is True
 
     def test_detects_https_from_forwarded_header(self):
         """Should detect HTTPS from standard Forwarded header."""
         middleware = SecurityHeadersMiddleware(app=Mock())
-        request = Mock(spec=Request)
-        request.url.scheme = "http"
-        request.headers = {"Forwarded": "for=192.0.2.60;proto=https;by=203.0.113.43"}
+        scope = {
+            "type": "http",
+            "scheme": "http",
+            "headers": [(b"forwarded", b"for=192.0.2.60;proto=https;by=203.0.113.43")],
+        }
 
-        assert middleware._is_https_request(request) is True
+        assert middleware._is_https_request(scope) is True
 
     def test_detects_http_correctly(self):
         """Should correctly identify HTTP requests."""
         middleware = SecurityHeadersMiddleware(app=Mock())
-        request = Mock(spec=Request)
-        request.url.scheme = "http"
-        request.headers = {}
+        scope = {"type": "http", "scheme": "http", "headers": []}
 
-        assert middleware._is_https_request(request) is False
+        assert middleware._is_https_request(scope) is False
 
     def test_detects_http_with_explicit_proto(self):
         """Should detect HTTP when X-Forwarded-Proto is http."""
         middleware = SecurityHeadersMiddleware(app=Mock())
-        request = Mock(spec=Request)
-        request.url.scheme = "http"
-        request.headers = {"X-Forwarded-Proto": "http"}
+        scope = {"type": "http", "scheme": "http", "headers": [(b"x-forwarded-proto", b"http")]}
 
-        assert middleware._is_https_request(request) is False
+        assert middleware._is_https_request(scope) is False
 
 
 class TestMiddlewareIntegration:
@@ -562,6 +553,55 @@ class TestMiddlewareIntegration:
             assert "Content-Security-Policy" in response.headers
 
 
+    def test_headers_added_to_streaming_responses(self):
+        """Streaming responses should get headers without being buffered."""
+        app = FastAPI()
+        app.add_middleware(SecurityHeadersMiddleware)
+
+        @app.get("/stream")
+        async def stream_endpoint():
+            async def chunks():
+                yield b"first,"
+                yield b"second"
+
+            return StreamingResponse(chunks(), media_type="text/plain")
+
+        response = TestClient(app).get("/stream")
+
+        assert response.text == "first,second"
+        assert response.headers["X-Frame-Options"] == "DENY"
+
+    def test_handler_headers_replaced_not_duplicated(self):
+        """A security header set by the handler should appear only once."""
+        app = FastAPI()
+        app.add_middleware(SecurityHeadersMiddleware)
+
+        @app.get("/framed")
+        async def framed_endpoint():
+            return Response(headers={"X-Frame-Options": "SAMEORIGIN"})
+
+        response = TestClient(app).get("/framed")
+
+        assert response.headers.get_list("X-Frame-Options") == ["DENY"]
+
+    def test_handler_hsts_kept_on_http(self):
+        """A handler's own HSTS header is left alone on plain HTTP responses."""
+        app = FastAPI()
+        app.add_middleware(SecurityHeadersMiddleware)
+
+        @app.get("/hsts")
+        async def hsts_endpoint():
+            return Response(headers={"Strict-Transport-Security": "max-age=60"})
+
+        client = TestClient(app)
+        http_response = client.get("/hsts")
+        https_response = client.get("/hsts", headers={"X-Forwarded-Proto": "https"})
+
+        assert http_response.headers.get_list("Strict-Transport-Security") == ["max-age=60"]
+        assert https_response.headers.get_list("Strict-Transport-Security") != ["max-age=60"]
+        assert len(https_response.headers.get_list("Strict-Transport-Security")) == 1
+
+
 class TestLitComponentsCompatibility:
     """Tests ensuring CSP is compatible with Lit web components."""
 
@@ -628,6 +668,24 @@ class TestHeaderPrecomputation:
         assert middleware._hsts_header is None
 
 
+    def test_header_pairs_preencoded(self):
+        """ASGI header pairs should be encoded once at initialization."""
+        middleware = SecurityHeadersMiddleware(app=Mock())
+
+        assert (b"x-frame-options", b"DENY") in middleware._http_headers
+        assert all(
+            isinstance(name, bytes) and isinstance(value, bytes)
+            for name, value in middleware._https_headers
+        )
+        assert not any(
+            name == b"strict-transport-security" for name, _ in middleware._http_headers
+        )
+        assert (
+            b"strict-transport-security",
+            middleware._hsts_header.encode(),
+        ) in middleware._https_headers
+
+
 class TestAllHeadersDisabled:
     """Tests for fully disabled security headers."""
 
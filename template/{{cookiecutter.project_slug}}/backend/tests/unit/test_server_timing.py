@@ -0,0 +1,161 @@
+"""
+Unit tests for request phase timings and the Server-Timing middleware.
+
+Tests cover:
+- Recording phases inside and outside a timed request
+- Database statement and pool checkout timings
+- Server-Timing header on JSON and streaming responses
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.database import TimedQueuePool
+from app.core.timing import (
+    RequestTimings,
+    add_timing,
+    end_request_timings,
+    get_request_timings,
+    record_timing,
+    start_request_timings,
+    timed,
+)
+from app.middleware.server_timing import ServerTimingMiddleware
+
+
+@timed("lookup")
+async def _lookup() -> str:
+    await asyncio.sleep(0.01)
+    return "found"
+
+
+def _phases(header: str) -> dict:
+    """Parse a Server-Timing header into {name: duration_ms}."""
+    phases = {}
+    for entry in header.split(", "):
+        name, duration = entry.split(";dur=")
+        phases[name] = float(duration)
+    return phases
+
+
+class TestRequestTimings:
+    """Tests for the timing context."""
+
+    def test_header_format(self):
+        """Phases are reported in milliseconds in first-seen order."""
+        timings = RequestTimings()
+        timings.add("auth", 0.004)
+        timings.add("db", 0.001)
+        timings.add("auth", 0.002)
+
+        assert timings.server_timing(total=0.01) == "auth;dur=6.0, db;dur=1.0, total;dur=10.0"
+
+    async def test_records_within_request(self):
+        """Phases recorded while a request is timed are accumulated."""
+        token = start_request_timings()
+        try:
+            assert await _lookup() == "found"
+            with record_timing("auth"):
+                await asyncio.sleep(0.01)
+            add_timing("auth", 1.0)
+            phases = get_request_timings().phases
+        finally:
+            end_request_timings(token)
+
+        assert phases["lookup"] >= 0.01
+        assert phases["auth"] >= 1.01
+
+    async def test_no_op_outside_request(self):
+        """Recording without a timed request does nothing."""
+        assert await _lookup() == "found"
+        with record_timing("auth"):
+            pass
+        add_timing("db", 1.0)
+
+        assert get_request_timings() is None
+
+    async def test_exceptions_are_timed_and_propagated(self):
+        """A failing phase still records its duration."""
+        token = start_request_timings()
+        try:
+            with pytest.raises(ValueError):
+                with record_timing("auth"):
+                    raise ValueError("bad token")
+            phases = get_request_timings().phases
+        finally:
+            end_request_timings(token)
+
+        assert "auth" in phases
+
+
+class TestDatabaseTimings:
+    """Tests for database phases recorded by app.core.database."""
+
+    async def test_statements_and_checkout_are_timed(self, tmp_path):
+        """SQL statements add to db, pool checkouts add to db_pool."""
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path}/timing.db", poolclass=TimedQueuePool
+        )
+        token = start_request_timings()
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                await conn.execute(text("SELECT 2"))
+            phases = get_request_timings().phases
+        finally:
+            end_request_timings(token)
+            await engine.dispose()
+
+        assert phases["db"] > 0
+        assert "db_pool" in phases
+
+
+def _timed_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware)
+
+    @app.get("/unit-timing/items")
+    async def items():
+        await _lookup()
+        return {"items": []}
+
+    @app.get("/unit-timing/stream")
+    async def stream():
+        async def chunks():
+            yield b"a"
+            yield b"b"
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return app
+
+
+class TestServerTimingMiddleware:
+    """Tests for the Server-Timing header."""
+
+    def test_header_lists_phases_and_total(self):
+        """Phases recorded by the handler appear in the header."""
+        response = TestClient(_timed_app()).get("/unit-timing/items")
+
+        phases = _phases(response.headers["server-timing"])
+        assert phases["lookup"] >= 10
+        assert phases["total"] >= phases["lookup"]
+
+    def test_streaming_response(self):
+        """Streaming responses get the header and an intact body."""
+        response = TestClient(_timed_app()).get("/unit-timing/stream")
+
+        assert response.text == "ab"
+        assert list(_phases(response.headers["server-timing"])) == ["total"]
+
+    def test_context_cleared_after_request(self):
+        """The timing context does not leak out of the request."""
+        TestClient(_timed_app()).get("/unit-timing/items")
+
+        assert get_request_timings() is None
@@ -0,0 +1,137 @@
+"""
+Unit tests for graceful shutdown.
+
+Tests cover:
+- Draining in-flight requests with a deadline
+- Refusing new requests while draining
+- Closing every client pool past failures
+"""
+
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.middleware.drain import RequestDrainMiddleware
+from app.services import shutdown
+from app.services.shutdown import RequestTracker, close_clients
+
+
+def _app(tracker: RequestTracker) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestDrainMiddleware, tracker=tracker)
+
+    @app.get("/unit-drain/items")
+    async def items():
+        return {"items": []}
+
+    return app
+
+
+class TestRequestTracker:
+    """Tests for draining in-flight requests."""
+
+    async def test_drain_waits_for_in_flight_requests(self):
+        """Drain returns once the last request finishes."""
+        tracker = RequestTracker()
+        tracker.request_started()
+
+        async def finish_later() -> None:
+            await asyncio.sleep(0.05)
+            tracker.request_finished()
+
+        finisher = asyncio.create_task(finish_later())
+        abandoned = await tracker.drain(timeout=5)
+        await finisher
+
+        assert abandoned == 0
+        assert tracker.draining
+
+    async def test_drain_deadline(self):
+        """Requests outliving the deadline are reported as abandoned."""
+        tracker = RequestTracker()
+        tracker.request_started()
+
+        assert await tracker.drain(timeout=0.01) == 1
+
+    async def test_idle_drain_is_immediate(self):
+        """Without in-flight requests, drain does not wait."""
+        tracker = RequestTracker()
+
+        assert await asyncio.wait_for(tracker.drain(timeout=5), timeout=1) == 0
+
+
+class TestRequestDrainMiddleware:
+    """Tests for counting and refusing requests."""
+
+    def test_counts_requests(self):
+        """Completed requests are no longer in flight."""
+        tracker = RequestTracker()
+        response = TestClient(_app(tracker)).get("/unit-drain/items")
+
+        assert response.status_code == 200
+        assert tracker.in_flight == 0
+
+    def test_refuses_requests_while_draining(self):
+        """New requests get 503 and a closed connection during shutdown."""
+        tracker = RequestTracker()
+        tracker.draining = True
+
+        response = TestClient(_app(tracker)).get("/unit-drain/items")
+
+        assert response.status_code == 503
+        assert response.headers["connection"] == "close"
+        assert response.json()["error"]["type"] == "shutting_down"
+
+    def test_accepts_requests_again(self):
+        """A restarted application accepts requests again."""
+        tracker = RequestTracker()
+        tracker.draining = True
+        tracker.accept_requests()
+
+        assert TestClient(_app(tracker)).get("/unit-drain/items").status_code == 200
+
+
+class TestCloseClients:
+    """Tests for closing client pools."""
+
+    async def test_closes_all_despite_failures(self, monkeypatch):
+        """A failing close does not prevent the others."""
+        closed = []
+
+        def closer(name):
+            async def close() -> None:
+                closed.append(name)
+                if name == "redis_client":
+                    raise ConnectionError("already closed")
+
+            return close
+
+        for name in (
+            "close_oauth_client_registry",
+            "close_oauth_client",
+            "close_jwks_client",
+            "close_oidc_discovery_cache",
+            "close_refresh_coalescer",
+            "close_http_clients",
+            "close_rate_limiter",
+            "close_token_revocation_service",
+            "close_redis_client",
+            "close_db",
+        ):
+            monkeypatch.setattr(shutdown, name, closer(name.removeprefix("close_")))
+
+        await close_clients()
+
+        assert closed == [
+            "oauth_client_registry",
+            "oauth_client",
+            "jwks_client",
+            "oidc_discovery_cache",
+            "refresh_coalescer",
+            "http_clients",
+            "rate_limiter",
+            "token_revocation_service",
+            "redis_client",
+            "db",
+        ]
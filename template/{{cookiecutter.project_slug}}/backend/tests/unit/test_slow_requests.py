@@ -0,0 +1,171 @@
+"""
+Unit tests for slow request capture.
+
+Tests cover:
+- Ring buffer bounds and ordering
+- Middleware recording of slow requests (timings, SQL, stack snapshot)
+- Admin slow request endpoints
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.api.dependencies.auth import get_current_user
+from app.core.config import settings
+from app.core.database import TimedQueuePool
+from app.core.timing import get_request_timings, record_timing
+from app.middleware.server_timing import ServerTimingMiddleware
+from app.middleware.slow_requests import SlowRequestMiddleware
+from app.services import slow_requests
+from app.services.slow_requests import SlowRequest, SlowRequestLog
+
+
+def _record(route: str) -> SlowRequest:
+    return SlowRequest(
+        timestamp=datetime.now(timezone.utc),
+        method="GET",
+        route=route,
+        path=route,
+        status_code=200,
+        duration_ms=1500.0,
+    )
+
+
+async def _waiting_in_redis() -> None:
+    with record_timing("redis"):
+        await asyncio.sleep(0.1)
+
+
+def _slow_app(log: SlowRequestLog, tmp_path, server_timing: bool = False) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(SlowRequestMiddleware, threshold_ms=50, log=log)
+    if server_timing:
+        app.add_middleware(ServerTimingMiddleware)
+
+    @app.get("/unit-slow/items/{item_id}")
+    async def slow(item_id: str):
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path}/slow.db", poolclass=TimedQueuePool
+        )
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        finally:
+            await engine.dispose()
+        await _waiting_in_redis()
+        return {}
+
+    @app.get("/unit-slow/fast")
+    async def fast():
+        return {}
+
+    return app
+
+
+class TestSlowRequestLog:
+    """Tests for the ring buffer."""
+
+    def test_bounded_newest_first(self):
+        """The oldest records are dropped and entries are newest first."""
+        log = SlowRequestLog(capacity=2)
+        for route in ("/a", "/b", "/c"):
+            log.add(_record(route))
+
+        assert [record.route for record in log.entries()] == ["/c", "/b"]
+
+    def test_clear(self):
+        """Cleared logs are empty."""
+        log = SlowRequestLog(capacity=2)
+        log.add(_record("/a"))
+        log.clear()
+
+        assert log.entries() == []
+
+
+class TestSlowRequestMiddleware:
+    """Tests for recording slow requests."""
+
+    def test_records_slow_request(self, tmp_path):
+        """A slow request is recorded with its diagnostics."""
+        log = SlowRequestLog(capacity=10)
+        TestClient(_slow_app(log, tmp_path)).get("/unit-slow/items/1")
+
+        [record] = log.entries()
+        assert record.route == "/unit-slow/items/{item_id}"
+        assert record.path == "/unit-slow/items/1"
+        assert record.status_code == 200
+        assert record.duration_ms >= 50
+        assert record.redis_calls == 1
+        assert record.timings_ms["redis"] >= 100
+        assert "db" in record.timings_ms
+        assert [statement for statement, _ in record.statements] == ["SELECT 1"]
+        assert any("_waiting_in_redis" in frame for frame in record.stack)
+
+    def test_fast_request_not_recorded(self, tmp_path):
+        """Requests under the threshold are not recorded."""
+        log = SlowRequestLog(capacity=10)
+        TestClient(_slow_app(log, tmp_path)).get("/unit-slow/fast")
+
+        assert log.entries() == []
+
+    def test_shares_server_timing_context(self, tmp_path):
+        """With ServerTimingMiddleware outside, both see the same phases."""
+        log = SlowRequestLog(capacity=10)
+        response = TestClient(_slow_app(log, tmp_path, server_timing=True)).get(
+            "/unit-slow/items/1"
+        )
+
+        [record] = log.entries()
+        assert "redis;dur=" in response.headers["server-timing"]
+        assert record.redis_calls == 1
+        assert get_request_timings() is None
+
+
+class TestSlowRequestEndpoint:
+    """Tests for the admin slow request endpoints."""
+
+    @pytest.fixture
+    def client(self, admin_client, monkeypatch):
+        log = SlowRequestLog(capacity=10)
+        log.add(_record("/a"))
+        log.add(_record("/b"))
+        monkeypatch.setattr(slow_requests, "_slow_request_log", log)
+        return admin_client
+
+    def test_disabled_with_zero_threshold(self, client, monkeypatch):
+        """The endpoint is hidden when capture is disabled."""
+        monkeypatch.setattr(settings, "SLOW_REQUEST_THRESHOLD_MS", 0)
+        test_client, _ = client
+
+        assert test_client.get("/admin/slow-requests").status_code == 404
+
+    def test_requires_admin_scope(self, client, make_principal):
+        """Non-admin users are rejected."""
+        test_client, app = client
+        app.dependency_overrides[get_current_user] = lambda: make_principal()
+
+        assert test_client.get("/admin/slow-requests").status_code == 403
+
+    def test_lists_and_filters(self, client):
+        """Records are listed newest first and can be filtered by route."""
+        test_client, _ = client
+
+        response = test_client.get("/admin/slow-requests")
+        filtered = test_client.get("/admin/slow-requests", params={"route": "/a"})
+
+        assert response.status_code == 200
+        assert [record["route"] for record in response.json()] == ["/b", "/a"]
+        assert [record["route"] for record in filtered.json()] == ["/a"]
+
+    def test_clear(self, client):
+        """DELETE empties the log."""
+        test_client, _ = client
+
+        assert test_client.delete("/admin/slow-requests").status_code == 204
+        assert test_client.get("/admin/slow-requests").json() == []
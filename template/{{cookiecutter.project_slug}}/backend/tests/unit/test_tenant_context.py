@@ -6,12 +6,13 @@ Tests tenant context setting, clearing, validation, and RLS bypass.
 
 import pytest
 from uuid import uuid4
-from sqlalchemy import text, select
+from sqlalchemy import event, text, select
 from sqlalchemy.ext.asyncio import AsyncSession
 import asyncio
 
 from app.services.tenant_context import (
     set_tenant_context,
+    defer_tenant_context,
     clear_tenant_context,
     bypass_rls,
     validate_tenant_active,
@@ -140,6 +141,129 @@ class TestSetTenantContext:
                 await conn.run_sync(Base.metadata.drop_all)
 
 
+class TestDeferTenantContext:
+    """Test suite for defer_tenant_context function."""
+
+    @pytest.mark.asyncio
+    async def test_defer_tenant_context_applies_on_first_query(self):
+        """Test deferred tenant context is set before the first statement runs."""
+        # Create tables
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        try:
+            async with AsyncSessionLocal() as session:
+                tenant = Tenant(slug="test-tenant", name="Test Tenant", is_active=True)
+                session.add(tenant)
+                await session.commit()
+                await session.refresh(tenant)
+                tenant_id = tenant.id
+
+            async with AsyncSessionLocal() as session:
+                clear_current_tenant()
+
+                defer_tenant_context(session, tenant_id, validate=True)
+
+                # Nothing executed yet, so the tenant is not validated or set
+                assert session.in_transaction() is False
+                assert get_current_tenant() is None
+
+                result = await session.execute(
+                    text("SELECT current_setting('app.current_tenant_id', TRUE)")
+                )
+                assert result.scalar() == str(tenant_id)
+                assert get_current_tenant() == tenant_id
+
+        finally:
+            # Clean up
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.drop_all)
+
+    @pytest.mark.asyncio
+    async def test_defer_tenant_context_required_rejects_inactive_tenant(self):
+        """Test deferred validation raises on the first query for unknown tenants."""
+        # Create tables
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        try:
+            async with AsyncSessionLocal() as session:
+                defer_tenant_context(session, uuid4(), validate=True)
+
+                with pytest.raises(TenantContextError, match="does not exist"):
+                    await session.execute(text("SELECT 1"))
+
+        finally:
+            # Clean up
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.drop_all)
+
+    @pytest.mark.asyncio
+    async def test_defer_tenant_context_optional_continues_without_tenant(self):
+        """Test optional deferred context skips the setting when validation fails."""
+        # Create tables
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        try:
+            async with AsyncSessionLocal() as session:
+                defer_tenant_context(session, uuid4(), validate=True, required=False)
+
+                result = await session.execute(
+                    text("SELECT current_setting('app.current_tenant_id', TRUE)")
+                )
+                assert not result.scalar()
+                assert get_current_tenant() is None
+
+        finally:
+            # Clean up
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.drop_all)
+
+    @pytest.mark.asyncio
+    async def test_defer_tenant_context_validates_once_per_session(self):
+        """Test transactions after a commit re-apply the setting without revalidating."""
+        # Create tables
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            async with AsyncSessionLocal() as session:
+                tenant = Tenant(slug="test-tenant", name="Test Tenant", is_active=True)
+                session.add(tenant)
+                await session.commit()
+                await session.refresh(tenant)
+                tenant_id = tenant.id
+
+            statements.clear()
+            async with AsyncSessionLocal() as session:
+                defer_tenant_context(session, tenant_id, validate=True)
+
+                await session.execute(text("SELECT 1"))
+                await session.commit()
+                result = await session.execute(
+                    text("SELECT current_setting('app.current_tenant_id', TRUE)")
+                )
+                assert result.scalar() == str(tenant_id)
+
+            validations = [s for s in statements if "FROM tenants" in s]
+            settings = [s for s in statements if "set_config" in s]
+            assert len(validations) == 1
+            assert len(settings) == 2
+
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+            # Clean up
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.drop_all)
+
+
 class TestClearTenantContext:
     """Test suite for clear_tenant_context function."""
 
@@ -4,6 +4,7 @@ Unit tests for tenant-aware database dependencies.
 Tests the FastAPI dependencies that provide tenant-aware database sessions:
 - get_tenant_db() - Requires tenant context
 - get_optional_tenant_db() - Optional tenant context
+- get_tenant_read_db() - Read replica routing with tenant context
 - get_superuser_db() - Bypasses RLS for admin operations
 """
 
@@ -20,7 +21,9 @@ from app.api.dependencies.tenant import (
     get_optional_tenant_db,
     get_superuser_db,
     get_tenant_db,
+    get_tenant_read_db,
 )
+from app.core.database import read_only_engine
 from app.services.tenant_context import TenantContextError
 
 
@@ -37,7 +40,7 @@ class TestGetTenantDb:
         mock_request.url.path = "/api/v1/statements"
         mock_request.method = "GET"
 
-        # Mock the session and set_tenant_context
+        # Mock the session and defer_tenant_context
         with patch(
             "app.api.dependencies.tenant.AsyncSessionLocal"
         ) as mock_session_factory:
@@ -46,15 +49,15 @@ class TestGetTenantDb:
             mock_session_factory.return_value.__aexit__.return_value = None
 
             with patch(
-                "app.api.dependencies.tenant.set_tenant_context"
-            ) as mock_set_context:
+                "app.api.dependencies.tenant.defer_tenant_context"
+            ) as mock_defer_context:
                 # Act
                 async for session in get_tenant_db(mock_request):
                     # Assert - session is returned
                     assert session == mock_session
 
-                    # Assert - set_tenant_context was called with correct params
-                    mock_set_context.assert_called_once_with(
+                    # Assert - defer_tenant_context was called with correct params
+                    mock_defer_context.assert_called_once_with(
                         mock_session, tenant_id, validate=True
                     )
 
@@ -85,13 +88,13 @@ class TestGetTenantDb:
                 mock_session_factory.return_value.__aexit__.return_value = None
 
                 with patch(
-                    "app.api.dependencies.tenant.set_tenant_context"
-                ) as mock_set_context:
+                    "app.api.dependencies.tenant.defer_tenant_context"
+                ) as mock_defer_context:
                     # Act
                     async for session in get_tenant_db(mock_request):
                         # Assert
                         assert session == mock_session
-                        mock_set_context.assert_called_once_with(
+                        mock_defer_context.assert_called_once_with(
                             mock_session, tenant_id, validate=True
                         )
 
@@ -133,15 +136,14 @@ class TestGetTenantDb:
             mock_session_factory.return_value.__aenter__.return_value = mock_session
             mock_session_factory.return_value.__aexit__.return_value = None
 
-            # Mock set_tenant_context to raise TenantContextError
-            with patch(
-                "app.api.dependencies.tenant.set_tenant_context",
-                side_effect=TenantContextError("Tenant is not active"),
-            ):
+            # Deferred validation fails on the handler's first query
+            with patch("app.api.dependencies.tenant.defer_tenant_context"):
+                gen = get_tenant_db(mock_request)
+                await gen.__anext__()
+
                 # Act & Assert
                 with pytest.raises(HTTPException) as exc_info:
-                    async for _ in get_tenant_db(mock_request):
-                        pass
+                    await gen.athrow(TenantContextError("Tenant is not active"))
 
                 # Assert error details
                 assert exc_info.value.status_code == 403
@@ -167,7 +169,7 @@ class TestGetTenantDb:
             mock_session_factory.return_value.__aenter__.return_value = mock_session
             mock_session_factory.return_value.__aexit__.return_value = None
 
-            with patch("app.api.dependencies.tenant.set_tenant_context"):
+            with patch("app.api.dependencies.tenant.defer_tenant_context"):
                 # Act & Assert - exception should be propagated
                 with pytest.raises(RuntimeError, match="Database error"):
                     async for session in get_tenant_db(mock_request):
@@ -175,8 +177,8 @@ class TestGetTenantDb:
                         raise RuntimeError("Database error")
 
     @pytest.mark.asyncio
-    async def test_get_tenant_db_logs_tenant_context_set(self, caplog):
-        """Test that get_tenant_db() logs when tenant context is set."""
+    async def test_get_tenant_db_logs_tenant_context_registered(self, caplog):
+        """Test that get_tenant_db() logs when tenant context is registered."""
         # Arrange
         tenant_id = uuid4()
         mock_request = MagicMock(spec=Request)
@@ -191,19 +193,158 @@ class TestGetTenantDb:
             mock_session_factory.return_value.__aenter__.return_value = mock_session
             mock_session_factory.return_value.__aexit__.return_value = None
 
-            with patch("app.api.dependencies.tenant.set_tenant_context"):
-                with caplog.at_level(logging.INFO):
+            with patch("app.api.dependencies.tenant.defer_tenant_context"):
+                with caplog.at_level(logging.DEBUG):
                     # Act
                     async for _ in get_tenant_db(mock_request):
                         pass
 
                     # Assert logging
                     assert any(
-                        "Tenant context set for database session" in record.message
+                        "Tenant context registered for database session" in record.message
                         for record in caplog.records
                     )
 
 
+class TestGetTenantReadDb:
+    """Tests for get_tenant_read_db() dependency."""
+
+    @staticmethod
+    def _make_request(tenant_id: UUID, user_id: str = "user-123") -> MagicMock:
+        mock_request = MagicMock(spec=Request)
+        mock_request.state.tenant_id = tenant_id
+        mock_request.state.user.user_id = user_id
+        mock_request.url.path = "/api/v1/reports"
+        mock_request.method = "GET"
+        return mock_request
+
+    @pytest.mark.asyncio
+    async def test_get_tenant_read_db_uses_primary_without_replicas(self):
+        """Test that reads go to the read-only primary when no replicas are configured."""
+        tenant_id = uuid4()
+        mock_request = self._make_request(tenant_id)
+
+        with patch("app.api.dependencies.tenant.replica_engines", []), patch(
+            "app.api.dependencies.tenant.AsyncSessionLocal"
+        ) as mock_session_factory, patch(
+            "app.api.dependencies.tenant.defer_tenant_context"
+        ) as mock_defer_context:
+            mock_session = AsyncMock(spec=AsyncSession)
+            mock_session_factory.return_value.__aenter__.return_value = mock_session
+
+            async for session in get_tenant_read_db(mock_request):
+                assert session == mock_session
+
+            mock_session_factory.assert_called_once_with(bind=read_only_engine)
+            mock_defer_context.assert_called_once_with(
+                mock_session, tenant_id, validate=True
+            )
+
+    @pytest.mark.asyncio
+    async def test_get_tenant_read_db_routes_to_replica(self):
+        """Test that reads are bound to the replica chosen by the router."""
+        tenant_id = uuid4()
+        mock_request = self._make_request(tenant_id)
+        replica = MagicMock()
+
+        with patch("app.api.dependencies.tenant.replica_engines", [replica]), patch(
+            "app.api.dependencies.tenant.replica_router"
+        ) as mock_router, patch(
+            "app.api.dependencies.tenant.has_recent_write", return_value=False
+        ), patch(
+            "app.api.dependencies.tenant.AsyncSessionLocal"
+        ) as mock_session_factory, patch(
+            "app.api.dependencies.tenant.defer_tenant_context"
+        ):
+            mock_router.choose.return_value = replica
+            mock_session_factory.return_value.__aenter__.return_value = AsyncMock(
+                spec=AsyncSession
+            )
+
+            async for _ in get_tenant_read_db(mock_request):
+                pass
+
+            mock_session_factory.assert_called_once_with(bind=replica)
+
+    @pytest.mark.asyncio
+    async def test_get_tenant_read_db_recent_write_reads_from_primary(self):
+        """Test read-your-writes: a user who just wrote reads from the primary."""
+        tenant_id = uuid4()
+        mock_request = self._make_request(tenant_id, user_id="writer")
+
+        with patch("app.api.dependencies.tenant.replica_engines", [MagicMock()]), patch(
+            "app.api.dependencies.tenant.replica_router"
+        ) as mock_router, patch(
+            "app.api.dependencies.tenant.has_recent_write", return_value=True
+        ) as mock_has_recent_write, patch(
+            "app.api.dependencies.tenant.AsyncSessionLocal"
+        ) as mock_session_factory, patch(
+            "app.api.dependencies.tenant.defer_tenant_context"
+        ):
+            mock_session_factory.return_value.__aenter__.return_value = AsyncMock(
+                spec=AsyncSession
+            )
+
+            async for _ in get_tenant_read_db(mock_request):
+                pass
+
+            mock_has_recent_write.assert_called_once_with(tenant_id, "writer")
+            mock_router.choose.assert_not_called()
+            mock_session_factory.assert_called_once_with(bind=read_only_engine)
+
+    @pytest.mark.asyncio
+    async def test_get_tenant_read_db_reports_replica_errors(self):
+        """Test that handler errors on a replica session are reported to the router."""
+        tenant_id = uuid4()
+        mock_request = self._make_request(tenant_id)
+        replica = MagicMock()
+        error = ConnectionRefusedError("replica down")
+
+        with patch("app.api.dependencies.tenant.replica_engines", [replica]), patch(
+            "app.api.dependencies.tenant.replica_router"
+        ) as mock_router, patch(
+            "app.api.dependencies.tenant.has_recent_write", return_value=False
+        ), patch(
+            "app.api.dependencies.tenant.AsyncSessionLocal"
+        ) as mock_session_factory, patch(
+            "app.api.dependencies.tenant.defer_tenant_context"
+        ):
+            mock_router.choose.return_value = replica
+            mock_session = AsyncMock(spec=AsyncSession)
+            mock_session_factory.return_value.__aenter__.return_value = mock_session
+
+            gen = get_tenant_read_db(mock_request)
+            await gen.__anext__()
+            with pytest.raises(ConnectionRefusedError):
+                await gen.athrow(error)
+
+            mock_router.report_error.assert_called_once_with(replica, error)
+            mock_session.rollback.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_get_tenant_db_marks_recent_write_for_unsafe_methods(self):
+        """Test that a committed POST sets the user's read-your-writes marker."""
+        tenant_id = uuid4()
+        mock_request = self._make_request(tenant_id, user_id="writer")
+        mock_request.method = "POST"
+
+        with patch("app.api.dependencies.tenant.replica_engines", [MagicMock()]), patch(
+            "app.api.dependencies.tenant.mark_recent_write"
+        ) as mock_mark_recent_write, patch(
+            "app.api.dependencies.tenant.AsyncSessionLocal"
+        ) as mock_session_factory, patch(
+            "app.api.dependencies.tenant.defer_tenant_context"
+        ):
+            mock_session_factory.return_value.__aenter__.return_value = AsyncMock(
+                spec=AsyncSession
+            )
+
+            async for _ in get_tenant_db(mock_request):
+                pass
+
+            mock_mark_recent_write.assert_called_once_with(tenant_id, "writer")
+
+
 class TestGetOptionalTenantDb:
     """Tests for get_optional_tenant_db() dependency."""
 
@@ -225,14 +366,14 @@ class TestGetOptionalTenantDb:
             mock_session_factory.return_value.__aexit__.return_value = None
 
             with patch(
-                "app.api.dependencies.tenant.set_tenant_context"
-            ) as mock_set_context:
+                "app.api.dependencies.tenant.defer_tenant_context"
+            ) as mock_defer_context:
                 # Act
                 async for session in get_optional_tenant_db(mock_request):
                     # Assert
                     assert session == mock_session
-                    mock_set_context.assert_called_once_with(
-                        mock_session, tenant_id, validate=True
+                    mock_defer_context.assert_called_once_with(
+                        mock_session, tenant_id, validate=True, required=False
                     )
 
     @pytest.mark.asyncio
@@ -254,13 +395,13 @@ class TestGetOptionalTenantDb:
                 mock_session_factory.return_value.__aexit__.return_value = None
 
                 with patch(
-                    "app.api.dependencies.tenant.set_tenant_context"
-                ) as mock_set_context:
+                    "app.api.dependencies.tenant.defer_tenant_context"
+                ) as mock_defer_context:
                     # Act
                     async for session in get_optional_tenant_db(mock_request):
                         # Assert - session is returned without tenant context
                         assert session == mock_session
-                        mock_set_context.assert_not_called()
+                        mock_defer_context.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_get_optional_tenant_db_continues_on_validation_failure(self):
@@ -279,15 +420,16 @@ class TestGetOptionalTenantDb:
             mock_session_factory.return_value.__aenter__.return_value = mock_session
             mock_session_factory.return_value.__aexit__.return_value = None
 
-            # Mock set_tenant_context to raise TenantContextError
             with patch(
-                "app.api.dependencies.tenant.set_tenant_context",
-                side_effect=TenantContextError("Tenant is not active"),
-            ):
+                "app.api.dependencies.tenant.defer_tenant_context"
+            ) as mock_defer_context:
                 # Act - should not raise exception
                 async for session in get_optional_tenant_db(mock_request):
-                    # Assert - session is returned without tenant context
+                    # Assert - validation failure is tolerated, not raised
                     assert session == mock_session
+                    mock_defer_context.assert_called_once_with(
+                        mock_session, tenant_id, validate=True, required=False
+                    )
 
                 # Assert - session was committed (not rolled back)
                 mock_session.commit.assert_called_once()
@@ -5,35 +5,81 @@ Tests the TenantResolutionMiddleware class to ensure correct tenant extraction,
 public endpoint handling, error handling, and context cleanup.
 """
 
+import asyncio
+import json
+
 import pytest
-from unittest.mock import AsyncMock, Mock
+from unittest.mock import AsyncMock
 from uuid import uuid4, UUID
 
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.responses import Response, StreamingResponse
 
 from app.middleware.tenant import TenantResolutionMiddleware
 from app.schemas.auth import AuthenticatedUser
 
 
+def make_scope(path: str = "/api/v1/statements", method: str = "GET") -> dict:
+    """Build a minimal ASGI HTTP scope."""
+    return {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "root_path": "",
+        "scheme": "http",
+        "server": ("testserver", 80),
+        "query_string": b"",
+        "headers": [],
+        "state": {},
+    }
+
+
+async def ok_app(scope, receive, send):
+    """Downstream ASGI app returning an empty 200 response."""
+    await Response(status_code=200)(scope, receive, send)
+
+
+async def run(middleware, scope):
+    """Drive the middleware with a scope and return the sent messages."""
+    messages = []
+    request_body_sent = False
+
+    async def receive():
+        nonlocal request_body_sent
+        if request_body_sent:
+            # Client stays connected until the response completes
+            await asyncio.Event().wait()
+        request_body_sent = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware(scope, receive, send)
+    return messages
+
+
+def status_of(messages) -> int:
+    """Status code from the http.response.start message."""
+    return messages[0]["status"]
+
+
+@pytest.fixture
+def downstream():
+    """Downstream ASGI app that records its calls."""
+    return AsyncMock(side_effect=ok_app)
+
+
 @pytest.fixture
-def middleware():
+def middleware(downstream):
     """Create middleware instance for testing."""
-    app = Mock()
-    return TenantResolutionMiddleware(app=app)
+    return TenantResolutionMiddleware(app=downstream)
 
 
 @pytest.fixture
 def mock_request():
-    """Create mock request for testing."""
-    from types import SimpleNamespace
-
-    request = Mock(spec=Request)
-    request.url.path = "/api/v1/statements"
-    request.method = "GET"
-    # Use SimpleNamespace instead of Mock to avoid automatic attribute creation
-    request.state = SimpleNamespace()
-    return request
+    """Create ASGI scope for a protected endpoint."""
+    return make_scope()
 
 
 @pytest.fixture
@@ -55,32 +101,28 @@ class TestPublicEndpointSkipping:
     """Test that public endpoints skip tenant resolution."""
 
     @pytest.mark.asyncio
-    async def test_health_endpoint_skipped(self, middleware, mock_request):
+    async def test_health_endpoint_skipped(self, middleware, downstream, mock_request):
         """Test that /health endpoint skips tenant resolution."""
-        mock_request.url.path = "/health"
-        call_next = AsyncMock(return_value=Response(status_code=200))
-
-        response = await middleware.dispatch(mock_request, call_next)
+        mock_request["path"] = "/health"
+        messages = await run(middleware, mock_request)
 
-        assert response.status_code == 200
-        call_next.assert_called_once()
+        assert status_of(messages) == 200
+        downstream.assert_called_once()
         # tenant_id should not be set
-        assert not hasattr(mock_request.state, "tenant_id")
+        assert "tenant_id" not in mock_request["state"]
 
     @pytest.mark.asyncio
-    async def test_docs_endpoint_skipped(self, middleware, mock_request):
+    async def test_docs_endpoint_skipped(self, middleware, downstream, mock_request):
         """Test that /docs endpoint skips tenant resolution."""
-        mock_request.url.path = "/docs"
-        call_next = AsyncMock(return_value=Response(status_code=200))
+        mock_request["path"] = "/docs"
+        messages = await run(middleware, mock_request)
 
-        response = await middleware.dispatch(mock_request, call_next)
-
-        assert response.status_code == 200
-        call_next.assert_called_once()
-        assert not hasattr(mock_request.state, "tenant_id")
+        assert status_of(messages) == 200
+        downstream.assert_called_once()
+        assert "tenant_id" not in mock_request["state"]
 
     @pytest.mark.asyncio
-    async def test_oauth_endpoints_skipped(self, middleware, mock_request):
+    async def test_oauth_endpoints_skipped(self, middleware, downstream, mock_request):
         """Test that OAuth endpoints skip tenant resolution."""
         oauth_endpoints = [
             "/api/v1/oauth/login",
@@ -90,27 +132,23 @@ class TestPublicEndpointSkipping:
         ]
 
         for endpoint in oauth_endpoints:
-            mock_request.url.path = endpoint
-            call_next = AsyncMock(return_value=Response(status_code=200))
-
-            response = await middleware.dispatch(mock_request, call_next)
+            mock_request["path"] = endpoint
+            messages = await run(middleware, mock_request)
 
-            assert response.status_code == 200, f"Failed for endpoint: {endpoint}"
-            call_next.assert_called_once()
+            assert status_of(messages) == 200, f"Failed for endpoint: {endpoint}"
+            downstream.assert_called_once()
             # Reset for next iteration
-            call_next.reset_mock()
+            downstream.reset_mock()
 
     @pytest.mark.asyncio
-    async def test_static_files_skipped(self, middleware, mock_request):
+    async def test_static_files_skipped(self, middleware, downstream, mock_request):
         """Test that static file paths skip tenant resolution."""
-        mock_request.url.path = "/static/css/main.css"
-        call_next = AsyncMock(return_value=Response(status_code=200))
+        mock_request["path"] = "/static/css/main.css"
+        messages = await run(middleware, mock_request)
 
-        response = await middleware.dispatch(mock_request, call_next)
-
-        assert response.status_code == 200
-        call_next.assert_called_once()
-        assert not hasattr(mock_request.state, "tenant_id")
+        assert status_of(messages) == 200
+        downstream.assert_called_once()
+        assert "tenant_id" not in mock_request["state"]
 
 
 class TestTenantExtraction:
@@ -118,22 +156,20 @@ class TestTenantExtraction:
 
     @pytest.mark.asyncio
     async def test_tenant_id_extracted_from_token(
-        self, middleware, mock_request, authenticated_user
+        self, middleware, downstream, mock_request, authenticated_user
     ):
         """Test tenant_id successfully extracted from authenticated user."""
         # Simulate OAuth token validation setting user in request.state
-        mock_request.state.user = authenticated_user
-
-        call_next = AsyncMock(return_value=Response(status_code=200))
+        mock_request["state"]["user"] = authenticated_user
 
-        response = await middleware.dispatch(mock_request, call_next)
+        messages = await run(middleware, mock_request)
 
-        assert response.status_code == 200
+        assert status_of(messages) == 200
         # Verify tenant_id was set in request.state
-        assert hasattr(mock_request.state, "tenant_id")
-        assert isinstance(mock_request.state.tenant_id, UUID)
-        assert str(mock_request.state.tenant_id) == authenticated_user.tenant_id
-        call_next.assert_called_once()
+        assert "tenant_id" in mock_request["state"]
+        assert isinstance(mock_request["state"]["tenant_id"], UUID)
+        assert str(mock_request["state"]["tenant_id"]) == authenticated_user.tenant_id
+        downstream.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_tenant_id_set_in_contextvars(
@@ -142,13 +178,12 @@ class TestTenantExtraction:
         """Test tenant_id is set in contextvars for application tracking."""
         from app.core.context import get_current_tenant
 
-        mock_request.state.user = authenticated_user
-        call_next = AsyncMock(return_value=Response(status_code=200))
+        mock_request["state"]["user"] = authenticated_user
 
         # Before request, context should be None
         assert get_current_tenant() is None
 
-        await middleware.dispatch(mock_request, call_next)
+        await run(middleware, mock_request)
 
         # After request (in finally block), context should be cleared
         assert get_current_tenant() is None
@@ -162,22 +197,20 @@ class TestTenantExtraction:
         tenant_uuid = uuid4()
         authenticated_user.tenant_id = str(tenant_uuid)
 
-        mock_request.state.user = authenticated_user
-        call_next = AsyncMock(return_value=Response(status_code=200))
+        mock_request["state"]["user"] = authenticated_user
+        messages = await run(middleware, mock_request)
 
-        response = await middleware.dispatch(mock_request, call_next)
-
-        assert response.status_code == 200
+        assert status_of(messages) == 200
         # Verify conversion to UUID
-        assert isinstance(mock_request.state.tenant_id, UUID)
-        assert mock_request.state.tenant_id == tenant_uuid
+        assert isinstance(mock_request["state"]["tenant_id"], UUID)
+        assert mock_request["state"]["tenant_id"] == tenant_uuid
 
 
 class TestMissingTenantHandling:
     """Test handling of missing or invalid tenant_id."""
 
     @pytest.mark.asyncio
-    async def test_no_authenticated_user_continues(self, middleware, mock_request):
+    async def test_no_authenticated_user_continues(self, middleware, downstream, mock_request):
         """Test that missing authenticated user allows request to continue.
 
         The OAuth dependency will handle authentication for protected endpoints.
@@ -187,19 +220,17 @@ class TestMissingTenantHandling:
         # No user in request.state (OAuth validation hasn't run or failed)
         # This is not an attribute error - request.state exists but has no user
 
-        call_next = AsyncMock(return_value=Response(status_code=200))
-
-        response = await middleware.dispatch(mock_request, call_next)
+        messages = await run(middleware, mock_request)
 
         # Request should continue (OAuth dependency will handle auth if needed)
-        assert response.status_code == 200
-        call_next.assert_called_once()
+        assert status_of(messages) == 200
+        downstream.assert_called_once()
         # tenant_id should not be set
-        assert not hasattr(mock_request.state, "tenant_id")
+        assert "tenant_id" not in mock_request["state"]
 
     @pytest.mark.asyncio
     async def test_missing_tenant_id_in_token_continues(
-        self, middleware, mock_request, authenticated_user
+        self, middleware, downstream, mock_request, authenticated_user
     ):
         """Test that missing tenant_id in token allows request to continue.
 
@@ -208,20 +239,18 @@ class TestMissingTenantHandling:
         """
         # User authenticated but no tenant_id claim
         authenticated_user.tenant_id = None
-        mock_request.state.user = authenticated_user
-
-        call_next = AsyncMock(return_value=Response(status_code=200))
+        mock_request["state"]["user"] = authenticated_user
 
-        response = await middleware.dispatch(mock_request, call_next)
+        messages = await run(middleware, mock_request)
 
         # Request continues (downstream will handle missing tenant)
-        assert response.status_code == 200
-        call_next.assert_called_once()
-        assert not hasattr(mock_request.state, "tenant_id")
+        assert status_of(messages) == 200
+        downstream.assert_called_once()
+        assert "tenant_id" not in mock_request["state"]
 
     @pytest.mark.asyncio
     async def test_invalid_tenant_id_format_continues(
-        self, middleware, mock_request, authenticated_user
+        self, middleware, downstream, mock_request, authenticated_user
     ):
         """Test that invalid tenant_id format allows request to continue.
 
@@ -229,16 +258,14 @@ class TestMissingTenantHandling:
         """
         # Invalid UUID format
         authenticated_user.tenant_id = "not-a-valid-uuid"
-        mock_request.state.user = authenticated_user
-
-        call_next = AsyncMock(return_value=Response(status_code=200))
+        mock_request["state"]["user"] = authenticated_user
 
-        response = await middleware.dispatch(mock_request, call_next)
+        messages = await run(middleware, mock_request)
 
         # Request continues (downstream will handle invalid tenant)
-        assert response.status_code == 200
-        call_next.assert_called_once()
-        assert not hasattr(mock_request.state, "tenant_id")
+        assert status_of(messages) == 200
+        downstream.assert_called_once()
+        assert "tenant_id" not in mock_request["state"]
 
 
 class TestContextCleanup:
@@ -251,30 +278,28 @@ class TestContextCleanup:
         """Test tenant context is cleared after successful request."""
         from app.core.context import get_current_tenant
 
-        mock_request.state.user = authenticated_user
-        call_next = AsyncMock(return_value=Response(status_code=200))
-
-        await middleware.dispatch(mock_request, call_next)
+        mock_request["state"]["user"] = authenticated_user
+        await run(middleware, mock_request)
 
         # Context should be cleared in finally block
         assert get_current_tenant() is None
 
     @pytest.mark.asyncio
     async def test_context_cleared_after_error(
-        self, middleware, mock_request, authenticated_user
+        self, middleware, downstream, mock_request, authenticated_user
     ):
         """Test tenant context is cleared even if downstream handler raises error."""
         from app.core.context import get_current_tenant
 
-        mock_request.state.user = authenticated_user
+        mock_request["state"]["user"] = authenticated_user
         # Simulate downstream error
-        call_next = AsyncMock(side_effect=Exception("Downstream error"))
+        downstream.side_effect = Exception("Downstream error")
 
         # The middleware catches the exception and returns a 500 response
-        response = await middleware.dispatch(mock_request, call_next)
+        messages = await run(middleware, mock_request)
 
         # Should return 500 error response
-        assert response.status_code == 500
+        assert status_of(messages) == 500
 
         # Context should still be cleared in finally block
         assert get_current_tenant() is None
@@ -284,10 +309,8 @@ class TestContextCleanup:
         """Test context is cleared even for public endpoints."""
         from app.core.context import get_current_tenant
 
-        mock_request.url.path = "/health"
-        call_next = AsyncMock(return_value=Response(status_code=200))
-
-        await middleware.dispatch(mock_request, call_next)
+        mock_request["path"] = "/health"
+        await run(middleware, mock_request)
 
         assert get_current_tenant() is None
 
@@ -297,38 +320,37 @@ class TestErrorHandling:
 
     @pytest.mark.asyncio
     async def test_unexpected_error_returns_500(
-        self, middleware, mock_request, authenticated_user
+        self, middleware, downstream, mock_request, authenticated_user
     ):
         """Test that unexpected errors return 500 Internal Server Error."""
-        mock_request.state.user = authenticated_user
+        mock_request["state"]["user"] = authenticated_user
 
-        # Simulate unexpected error in call_next
-        call_next = AsyncMock(side_effect=RuntimeError("Unexpected error"))
+        # Simulate unexpected error in downstream app
+        downstream.side_effect = RuntimeError("Unexpected error")
 
         # The middleware catches the error and returns 500
-        response = await middleware.dispatch(mock_request, call_next)
+        messages = await run(middleware, mock_request)
 
-        assert response.status_code == 500
+        assert status_of(messages) == 500
         # Verify error response format
-        import json
-        content = json.loads(response.body)
+        content = json.loads(messages[1]["body"])
         assert content["error"]["code"] == 500
         assert "Failed to resolve tenant context" in content["error"]["message"]
 
     @pytest.mark.asyncio
     async def test_context_cleared_on_error(
-        self, middleware, mock_request, authenticated_user
+        self, middleware, downstream, mock_request, authenticated_user
     ):
         """Test that context is cleared even when errors occur."""
         from app.core.context import get_current_tenant
 
-        mock_request.state.user = authenticated_user
-        call_next = AsyncMock(side_effect=ValueError("Test error"))
+        mock_request["state"]["user"] = authenticated_user
+        downstream.side_effect = ValueError("Test error")
 
         # The middleware catches the error and returns 500
-        response = await middleware.dispatch(mock_request, call_next)
+        messages = await run(middleware, mock_request)
 
-        assert response.status_code == 500
+        assert status_of(messages) == 500
 
         # Context should be cleared in finally block
         assert get_current_tenant() is None
@@ -342,9 +364,9 @@ class TestTenantIdExtraction:
         self, middleware, mock_request, authenticated_user
     ):
         """Test extracting valid tenant_id."""
-        mock_request.state.user = authenticated_user
+        mock_request["state"]["user"] = authenticated_user
 
-        tenant_id = await middleware._extract_tenant_id(mock_request)
+        tenant_id = await middleware._extract_tenant_id(Request(mock_request))
 
         assert tenant_id is not None
         assert isinstance(tenant_id, UUID)
@@ -354,10 +376,8 @@ class TestTenantIdExtraction:
     async def test_extract_tenant_id_no_user(self, middleware, mock_request):
         """Test extracting tenant_id when no user is authenticated."""
         # No user attribute in request.state
-        # Ensure request.state has no user attribute
-        # (SimpleNamespace doesn't auto-create attributes like Mock does)
 
-        tenant_id = await middleware._extract_tenant_id(mock_request)
+        tenant_id = await middleware._extract_tenant_id(Request(mock_request))
 
         assert tenant_id is None
 
@@ -367,9 +387,9 @@ class TestTenantIdExtraction:
     ):
         """Test extracting tenant_id when it's missing from user."""
         authenticated_user.tenant_id = None
-        mock_request.state.user = authenticated_user
+        mock_request["state"]["user"] = authenticated_user
 
-        tenant_id = await middleware._extract_tenant_id(mock_request)
+        tenant_id = await middleware._extract_tenant_id(Request(mock_request))
 
         assert tenant_id is None
 
@@ -379,9 +399,9 @@ class TestTenantIdExtraction:
     ):
         """Test extracting tenant_id with invalid UUID format."""
         authenticated_user.tenant_id = "invalid-uuid-format"
-        mock_request.state.user = authenticated_user
+        mock_request["state"]["user"] = authenticated_user
 
-        tenant_id = await middleware._extract_tenant_id(mock_request)
+        tenant_id = await middleware._extract_tenant_id(Request(mock_request))
 
         assert tenant_id is None
 
@@ -392,9 +412,9 @@ class TestTenantIdExtraction:
         """Test that string tenant_id is converted to UUID."""
         tenant_uuid = uuid4()
         authenticated_user.tenant_id = str(tenant_uuid)
-        mock_request.state.user = authenticated_user
+        mock_request["state"]["user"] = authenticated_user
 
-        tenant_id = await middleware._extract_tenant_id(mock_request)
+        tenant_id = await middleware._extract_tenant_id(Request(mock_request))
 
         assert tenant_id is not None
         assert isinstance(tenant_id, UUID)
@@ -405,24 +425,17 @@ class TestConcurrentRequests:
     """Test that context isolation works for concurrent requests."""
 
     @pytest.mark.asyncio
-    async def test_context_isolated_between_requests(
-        self, middleware, authenticated_user
-    ):
+    async def test_context_isolated_between_requests(self, authenticated_user):
         """Test that context is isolated between concurrent requests."""
-        import asyncio
-        from types import SimpleNamespace
         from app.core.context import get_current_tenant
 
         # Create two different tenants
         tenant_1 = uuid4()
         tenant_2 = uuid4()
 
-        # Create mock requests with different tenant IDs
-        request_1 = Mock(spec=Request)
-        request_1.url.path = "/api/v1/statements"
-        request_1.method = "GET"
-        request_1.state = SimpleNamespace()
-        user_1 = AuthenticatedUser(
+        # Create scopes with different tenant IDs
+        scope_1 = make_scope()
+        scope_1["state"]["user"] = AuthenticatedUser(
             user_id="user-1",
             tenant_id=str(tenant_1),
             jti="jti-1",
@@ -430,13 +443,9 @@ class TestConcurrentRequests:
             scopes=[],
             issuer="http://keycloak:{{ cookiecutter.keycloak_port }}/realms/{{ cookiecutter.keycloak_realm_name }}",
         )
-        request_1.state.user = user_1
 
-        request_2 = Mock(spec=Request)
-        request_2.url.path = "/api/v1/statements"
-        request_2.method = "GET"
-        request_2.state = SimpleNamespace()
-        user_2 = AuthenticatedUser(
+        scope_2 = make_scope()
+        scope_2["state"]["user"] = AuthenticatedUser(
             user_id="user-2",
             tenant_id=str(tenant_2),
             jti="jti-2",
@@ -444,23 +453,23 @@ class TestConcurrentRequests:
             scopes=[],
             issuer="http://keycloak:{{ cookiecutter.keycloak_port }}/realms/{{ cookiecutter.keycloak_realm_name }}",
         )
-        request_2.state.user = user_2
 
         # Track which tenant was seen during request processing
         seen_tenants = []
 
-        async def slow_handler(request):
+        async def slow_handler(scope, receive, send):
             """Handler that checks current tenant and sleeps."""
             # Record the tenant_id set in request.state
-            tenant = getattr(request.state, "tenant_id", None)
-            seen_tenants.append(tenant)
+            seen_tenants.append(Request(scope).state.tenant_id)
             await asyncio.sleep(0.01)  # Simulate slow processing
-            return Response(status_code=200)
+            await ok_app(scope, receive, send)
+
+        middleware = TenantResolutionMiddleware(app=slow_handler)
 
         # Process both requests concurrently
         await asyncio.gather(
-            middleware.dispatch(request_1, slow_handler),
-            middleware.dispatch(request_2, slow_handler),
+            run(middleware, scope_1),
+            run(middleware, scope_2),
         )
 
         # Both tenants should have been seen
@@ -498,3 +507,55 @@ class TestPublicPathsConfiguration:
     def test_public_paths_includes_root(self, middleware):
         """Test that root endpoint is in public paths."""
         assert "/" in middleware.PUBLIC_PATHS
+
+
+class TestASGIBehaviour:
+    """Test pure-ASGI specific behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_non_http_scopes_passed_through(self, middleware, downstream):
+        """Lifespan and websocket scopes bypass tenant resolution."""
+        scope = {"type": "lifespan"}
+
+        await middleware(scope, AsyncMock(), AsyncMock())
+
+        downstream.assert_called_once()
+        assert "state" not in scope
+
+    @pytest.mark.asyncio
+    async def test_streaming_response_passes_through(
+        self, mock_request, authenticated_user
+    ):
+        """Streaming bodies are forwarded chunk by chunk, not buffered."""
+
+        async def chunks():
+            yield b"first,"
+            yield b"second"
+
+        async def streaming_app(scope, receive, send):
+            await StreamingResponse(chunks())(scope, receive, send)
+
+        mock_request["state"]["user"] = authenticated_user
+        messages = await run(TenantResolutionMiddleware(app=streaming_app), mock_request)
+
+        bodies = [m["body"] for m in messages if m["type"] == "http.response.body"]
+        assert b"first," in bodies
+        assert b"second" in bodies
+
+    @pytest.mark.asyncio
+    async def test_error_after_response_started_propagates(
+        self, mock_request, authenticated_user
+    ):
+        """Errors after headers were sent cannot become a 500 and are re-raised."""
+        from app.core.context import get_current_tenant
+
+        async def failing_app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            raise RuntimeError("Failed mid-stream")
+
+        mock_request["state"]["user"] = authenticated_user
+
+        with pytest.raises(RuntimeError):
+            await run(TenantResolutionMiddleware(app=failing_app), mock_request)
+
+        assert get_current_tenant() is None
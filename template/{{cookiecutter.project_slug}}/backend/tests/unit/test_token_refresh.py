@@ -0,0 +1,160 @@
+"""
+Unit tests for refresh token exchange coalescing.
+
+Tests cover:
+- One exchange per refresh token for concurrent callers in a process
+- Sharing the exchange between workers through a Redis lock and result
+- Encryption of the shared result
+- Falling back to a direct exchange when Redis fails
+"""
+
+import asyncio
+from typing import Optional
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+import redis.asyncio as redis
+
+from app.schemas.oauth import TokenResponse
+from app.services.token_refresh import RefreshCoalescer, refresh_token_digest
+
+
+def _token() -> TokenResponse:
+    return TokenResponse(access_token="new-access", expires_in=300, refresh_token="rotated")
+
+
+def _exchange(release: Optional[asyncio.Event] = None) -> AsyncMock:
+    """Exchange mock returning a token, after the event is set if given."""
+
+    async def exchange():
+        if release is not None:
+            await release.wait()
+        await asyncio.sleep(0)
+        return _token()
+
+    return AsyncMock(side_effect=exchange)
+
+
+class TestInProcess:
+    """Tests for coalescing within one process."""
+
+    async def test_concurrent_refreshes_share_one_exchange(self):
+        """Parallel refreshes of one token make one exchange."""
+        coalescer = RefreshCoalescer()
+        exchange = _exchange()
+
+        results = await asyncio.gather(
+            *(coalescer.refresh("refresh-1", exchange) for _ in range(5))
+        )
+
+        assert exchange.call_count == 1
+        assert all(result.access_token == "new-access" for result in results)
+        assert coalescer._in_flight == {}
+
+    async def test_different_tokens_not_coalesced(self):
+        """Each refresh token gets its own exchange."""
+        coalescer = RefreshCoalescer()
+        exchange = _exchange()
+
+        await asyncio.gather(
+            coalescer.refresh("refresh-1", exchange), coalescer.refresh("refresh-2", exchange)
+        )
+
+        assert exchange.call_count == 2
+
+    async def test_failure_raised_to_every_caller(self):
+        """A failed exchange fails all concurrent callers, once."""
+        coalescer = RefreshCoalescer()
+        exchange = AsyncMock(side_effect=httpx.HTTPError("invalid_grant"))
+
+        results = await asyncio.gather(
+            *(coalescer.refresh("refresh-1", exchange) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+        assert exchange.call_count == 1
+        assert all(isinstance(result, httpx.HTTPError) for result in results)
+
+
+class TestAcrossWorkers:
+    """Tests for coalescing through Redis."""
+
+    async def test_second_worker_uses_first_workers_result(self, fake_redis):
+        """A worker finding the lock taken waits for the holder's response."""
+        redis_client = fake_redis
+        release = asyncio.Event()
+        first_exchange = _exchange(release)
+        second_exchange = _exchange()
+        first = RefreshCoalescer(redis_client)
+        second = RefreshCoalescer(redis_client)
+
+        first_refresh = asyncio.create_task(first.refresh("refresh-1", first_exchange))
+        await asyncio.sleep(0.01)
+        second_refresh = asyncio.create_task(second.refresh("refresh-1", second_exchange))
+        await asyncio.sleep(0.01)
+        release.set()
+
+        assert (await first_refresh).access_token == "new-access"
+        assert (await second_refresh).access_token == "new-access"
+        second_exchange.assert_not_called()
+
+    async def test_late_caller_uses_stored_result(self, fake_redis):
+        """A refresh shortly after the exchange gets the same tokens."""
+        redis_client = fake_redis
+        await RefreshCoalescer(redis_client).refresh("refresh-1", _exchange())
+        late_exchange = _exchange()
+
+        result = await RefreshCoalescer(redis_client).refresh("refresh-1", late_exchange)
+
+        assert result.refresh_token == "rotated"
+        late_exchange.assert_not_called()
+
+    async def test_stored_result_is_encrypted(self, fake_redis):
+        """Redis holds neither the refresh token nor the new tokens in clear."""
+        redis_client = fake_redis
+        await RefreshCoalescer(redis_client).refresh("refresh-1", _exchange())
+
+        stored = redis_client.data[f"token_refresh:result:{refresh_token_digest('refresh-1')}"]
+        assert b"new-access" not in stored
+        assert not any("refresh-1" in key for key in redis_client.data)
+
+    async def test_released_lock_without_result(self, fake_redis):
+        """When the holder's exchange fails, waiting workers exchange themselves."""
+        redis_client = fake_redis
+        lock_key = f"token_refresh:lock:{refresh_token_digest('refresh-1')}"
+        redis_client.data[lock_key] = "locked"
+        exchange = _exchange()
+
+        async def fail_holder():
+            await asyncio.sleep(0.01)
+            redis_client.data.pop(lock_key)
+
+        holder = asyncio.create_task(fail_holder())
+        result = await RefreshCoalescer(redis_client, lock_seconds=5).refresh("refresh-1", exchange)
+        await holder
+
+        assert result.access_token == "new-access"
+        exchange.assert_called_once()
+
+    async def test_redis_failure_exchanges_directly(self, fake_redis):
+        """Redis errors do not fail the refresh."""
+        redis_client = fake_redis
+        redis_client.get = AsyncMock(side_effect=redis.RedisError("connection refused"))
+        exchange = _exchange()
+
+        result = await RefreshCoalescer(redis_client).refresh("refresh-1", exchange)
+
+        assert result.access_token == "new-access"
+        exchange.assert_called_once()
+
+
+@pytest.mark.parametrize("other", ["refresh-2", ""])
+async def test_result_unreadable_with_other_token(fake_redis, other):
+    """A stored result can only be decrypted with the token it was exchanged for."""
+    redis_client = fake_redis
+    coalescer = RefreshCoalescer(redis_client)
+    await coalescer.refresh("refresh-1", _exchange())
+    key = f"token_refresh:result:{refresh_token_digest('refresh-1')}"
+
+    assert await coalescer._read_result(key, other) is None
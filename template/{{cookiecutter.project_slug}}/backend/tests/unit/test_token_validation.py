@@ -7,7 +7,7 @@ from jwt.exceptions import ExpiredSignatureError, InvalidSignatureError
 
 from fastapi import HTTPException
 from app.api.dependencies.auth import get_current_user
-from app.schemas.auth import AuthenticatedUser
+from app.schemas.auth import Principal
 from app.core.config import settings
 
 
@@ -132,10 +132,10 @@ async def test_valid_token_success(mock_request, mock_jwks_client, mock_credenti
             user = await get_current_user(mock_request, mock_credentials, mock_jwks_client, mock_rate_limiter, mock_token_revocation_service)
 
         # Assertions
-        assert isinstance(user, AuthenticatedUser)
+        assert isinstance(user, Principal)
         assert user.user_id == "test-user-123"
         assert user.tenant_id == "550e8400-e29b-41d4-a716-446655440000"
-        assert user.scopes == ["statements/read", "statements/write"]
+        assert user.scopes == ("statements/read", "statements/write")
         assert user.email == "test@example.com"
         assert user.name == "Test User"
         assert user.issuer == settings.OAUTH_ISSUER_URL
@@ -402,7 +402,7 @@ async def test_scopes_parsing(mock_request, mock_jwks_client, mock_credentials,
 
             user = await get_current_user(mock_request, mock_credentials, mock_jwks_client, mock_rate_limiter, mock_token_revocation_service)
 
-            assert user.scopes == ["read", "write", "admin"]
+            assert user.scopes == ("read", "write", "admin")
             assert user.has_scope("read")
             assert user.has_scope("write")
             assert user.has_scope("admin")
@@ -435,7 +435,7 @@ async def test_empty_scopes(mock_request, mock_jwks_client, mock_credentials, mo
 
             user = await get_current_user(mock_request, mock_credentials, mock_jwks_client, mock_rate_limiter, mock_token_revocation_service)
 
-            assert user.scopes == []
+            assert user.scopes == ()
             assert not user.has_scope("read")
 
 
@@ -465,7 +465,7 @@ async def test_no_scopes_claim(mock_request, mock_jwks_client, mock_credentials,
 
             user = await get_current_user(mock_request, mock_credentials, mock_jwks_client, mock_rate_limiter, mock_token_revocation_service)
 
-            assert user.scopes == []
+            assert user.scopes == ()
 
 
 @pytest.mark.asyncio
@@ -9,7 +9,7 @@ from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
 
 from fastapi import HTTPException
 from app.api.dependencies.auth import get_current_user
-from app.schemas.auth import AuthenticatedUser
+from app.schemas.auth import Principal
 from app.core.config import settings
 
 
@@ -408,10 +408,10 @@ async def test_valid_token_with_all_security_checks(
             user = await get_current_user(mock_request, mock_credentials, mock_jwks_client, mock_rate_limiter, mock_token_revocation_service)
 
             # All validations passed
-            assert isinstance(user, AuthenticatedUser)
+            assert isinstance(user, Principal)
             assert user.user_id == "test-user-123"
             assert user.tenant_id == valid_tenant_id
-            assert user.scopes == ["read", "write"]
+            assert user.scopes == ("read", "write")
             assert user.email == "test@example.com"
             assert user.name == "Test User"
 
@@ -748,7 +748,7 @@ async def test_jti_claim_required(
                 # jti is MISSING
             }
             
-            # Should raise validation error (Pydantic will catch missing jti)
+            # Should raise validation error (Principal.from_claims rejects missing jti)
             with pytest.raises(HTTPException) as exc_info:
                 await get_current_user(mock_request, mock_credentials, mock_jwks_client, mock_rate_limiter, mock_token_revocation_service)
             
@@ -955,7 +955,7 @@ async def test_token_revocation_valid_token_not_revoked(
             user = await get_current_user(mock_request, mock_credentials, mock_jwks_client, mock_rate_limiter, mock_token_revocation_service)
             
             # Verify user was authenticated
-            assert isinstance(user, AuthenticatedUser)
+            assert isinstance(user, Principal)
             assert user.user_id == "test-user-123"
             assert user.tenant_id == valid_tenant_id
             assert user.jti == "valid-jti-12345"
@@ -0,0 +1,157 @@
+"""
+Unit tests for userinfo lookups without identity provider round trips.
+
+Tests cover:
+- Building UserInfo from validated token claims
+- Caching responses per access token, bounded by token expiry
+- OAuthClient.get_user_info using claims and cache before the endpoint
+"""
+
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import jwt
+import pytest
+
+from app.schemas.oauth import UserInfo
+from app.services.oauth_client import OAuthClient
+from app.services.userinfo_cache import UserInfoCache, user_info_from_claims
+
+USER = UserInfo(sub="user-123", email="user@example.com", name="Test User")
+
+
+class TestClaims:
+    """Tests for the claims-first path."""
+
+    def test_builds_from_complete_claims(self):
+        """Profile and tenant claims are mapped to UserInfo."""
+        claims = {
+            "sub": "user-123",
+            "email": "user@example.com",
+            "name": "Test User",
+            "tenant_id": "tenant-1",
+            "exp": 1762903147,
+        }
+
+        user_info = user_info_from_claims(claims)
+
+        assert user_info == UserInfo(
+            sub="user-123", email="user@example.com", name="Test User", tenant_id="tenant-1"
+        )
+
+    @pytest.mark.parametrize(
+        "claims",
+        [
+            {"sub": "user-123", "name": "Test User"},
+            {"email": "user@example.com", "name": "Test User"},
+        ],
+    )
+    def test_incomplete_claims(self, claims):
+        """Without sub or a required claim, the endpoint must be asked."""
+        assert user_info_from_claims(claims) is None
+
+    def test_custom_required_claims(self):
+        """Callers needing fewer claims can use leaner tokens."""
+        assert user_info_from_claims({"sub": "user-123"}, required_claims=()) is not None
+
+
+class TestUserInfoCache:
+    """Tests for the per access token cache."""
+
+    def test_round_trip(self):
+        """A cached response is returned for the same token only."""
+        cache = UserInfoCache(ttl=60)
+        cache.set("token-1", USER)
+
+        assert cache.get("token-1") == USER
+        assert cache.get("token-2") is None
+        assert "token-1" not in str(cache._entries)
+
+    def test_bounded_by_token_expiry(self):
+        """Responses are not kept past the token's exp."""
+        cache = UserInfoCache(ttl=60)
+
+        cache.set("expired", USER, token_exp=time.time() - 1)
+        cache.set("expiring", USER, token_exp=time.time() + 5)
+
+        assert cache.get("expired") is None
+        expires_at, _ = cache._entries[cache._key("expiring")]
+        assert expires_at <= time.time() + 5
+
+    def test_expiry_read_from_jwt(self):
+        """Without claims, a JWT access token's exp bounds the TTL."""
+        cache = UserInfoCache(ttl=60)
+        token = jwt.encode({"sub": "user-123", "exp": int(time.time()) - 1}, "secret")
+
+        cache.set(token, USER)
+
+        assert cache.get(token) is None
+
+    def test_evicts_least_recently_used(self):
+        """The cache holds at most max_entries responses."""
+        cache = UserInfoCache(ttl=60, max_entries=2)
+        cache.set("token-1", USER)
+        cache.set("token-2", USER)
+        cache.get("token-1")
+        cache.set("token-3", USER)
+
+        assert cache.get("token-1") == USER
+        assert cache.get("token-2") is None
+
+
+@pytest.mark.asyncio
+class TestGetUserInfo:
+    """Tests for OAuthClient.get_user_info avoiding the endpoint."""
+
+    @pytest.fixture
+    def oauth_client(self, mock_oidc_discovery):
+        client = OAuthClient(
+            client_id="test-client",
+            client_secret="test-secret",
+            redirect_uri="http://localhost:8000/callback",
+            issuer_url="http://idp.test/realms/unit",
+        )
+        discovery = MagicMock()
+        discovery.json.return_value = mock_oidc_discovery
+        userinfo = MagicMock()
+        userinfo.json.return_value = USER.model_dump()
+
+        def get(url, **kwargs):
+            return discovery if "openid-configuration" in url else userinfo
+
+        client._http_client.get = AsyncMock(side_effect=get)
+        return client
+
+    @pytest.fixture
+    def mock_oidc_discovery(self):
+        return {
+            "issuer": "http://idp.test/realms/unit",
+            "authorization_endpoint": "http://idp.test/auth",
+            "token_endpoint": "http://idp.test/token",
+            "jwks_uri": "http://idp.test/certs",
+            "userinfo_endpoint": "http://idp.test/userinfo",
+        }
+
+    def _userinfo_calls(self, oauth_client):
+        return [
+            call
+            for call in oauth_client._http_client.get.call_args_list
+            if "userinfo" in call.args[0]
+        ]
+
+    async def test_claims_first(self, oauth_client):
+        """Complete claims are served without any request."""
+        claims = {"sub": "user-123", "email": "user@example.com", "name": "Test User"}
+
+        user_info = await oauth_client.get_user_info("token-1", claims=claims)
+
+        assert user_info.email == "user@example.com"
+        oauth_client._http_client.get.assert_not_called()
+
+    async def test_cached_after_first_fetch(self, oauth_client):
+        """Repeated lookups with one token make one userinfo request."""
+        first = await oauth_client.get_user_info("token-1")
+        second = await oauth_client.get_user_info("token-1", claims={"sub": "user-123"})
+
+        assert first == second == USER
+        assert len(self._userinfo_calls(oauth_client)) == 1
@@ -0,0 +1,82 @@
+"""
+Unit tests for the startup warm-up.
+
+Tests cover:
+- Readiness held at "warming_up" until every step finished
+- Failed and timed out steps not blocking startup
+- Database pool pre-connection
+"""
+
+import asyncio
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.database import TimedQueuePool
+from app.services import warmup
+from app.services.health_monitor import HealthMonitor
+from app.services.warmup import warm_database, warm_up
+
+
+class TestWarmUp:
+    """Tests for running warm-up steps."""
+
+    async def test_holds_readiness_until_finished(self):
+        """/ready reports warming_up while steps run."""
+        monitor = HealthMonitor({})
+        release = asyncio.Event()
+
+        async def slow_step() -> None:
+            await release.wait()
+
+        task = asyncio.create_task(warm_up(monitor, {"slow": slow_step}, timeout=1))
+        await asyncio.sleep(0)
+        assert monitor.readiness().status == "warming_up"
+        assert not monitor.readiness().ready
+
+        release.set()
+        assert await task == {"slow": True}
+        assert monitor.readiness().ready
+
+    async def test_failures_do_not_block(self, check_stubs, caplog):
+        """Failed and timed out steps are logged and reported."""
+        monitor = HealthMonitor({})
+
+        steps = {"db": check_stubs.ok, "redis": check_stubs.fail, "jwks": check_stubs.hang}
+
+        results = await warm_up(monitor, steps, timeout=0.01)
+
+        assert results == {"db": True, "redis": False, "jwks": False}
+        assert not monitor.warming_up
+        failures = {r.step: r.error for r in caplog.records if r.msg == "Warm-up step failed"}
+        assert failures == {
+            "redis": "ConnectionError: connection refused",
+            "jwks": "timed out after 0.01s",
+        }
+
+    async def test_cancelled_warm_up_releases_readiness(self, check_stubs):
+        """Cancelling the warm-up (shutdown) clears the warming_up state."""
+        monitor = HealthMonitor({})
+        task = asyncio.create_task(warm_up(monitor, {"jwks": check_stubs.hang}, timeout=10))
+        await asyncio.sleep(0)
+
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        assert not monitor.warming_up
+
+
+class TestWarmDatabase:
+    """Tests for database pool pre-connection."""
+
+    async def test_opens_pool_connections(self, check_stubs, tmp_path, monkeypatch):
+        """The requested number of connections are left idle in the pool."""
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path}/warmup.db", poolclass=TimedQueuePool
+        )
+        monkeypatch.setattr(warmup, "engine", engine)
+        monkeypatch.setattr(warmup, "ping_database", check_stubs.ok)
+        try:
+            await warm_database(3)
+            assert engine.pool.checkedin() == 3
+        finally:
+            await engine.dispose()